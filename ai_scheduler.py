@@ -0,0 +1,52 @@
+class AIScheduler:
+    """Spreads expensive AI decisions ("think") across ticks.
+
+    Each agent has `think_every` (think once per N ticks) and `think_cost`
+    (budget units per think). Agents are bucketed round-robin by their slot,
+    so with think_every=3 a third of them think on any given tick instead of
+    all of them lining up on the same frame.
+
+    The per-tick budget caps the think cost. Agents that are due but don't
+    fit get `think_pending` set and go first on the next tick; until then
+    they keep integrating along their last decision.
+
+    The budget is counted in cost units, not wall-clock time, so the schedule
+    is the same on every machine and replays stay deterministic.
+    """
+
+    def __init__(self, max_cost_per_tick: int = 96):
+        self.max_cost_per_tick = max_cost_per_tick
+
+        # Stats for the last tick
+        self.thinks_last_tick = 0
+        self.cost_last_tick = 0
+        self.deferred_last_tick = 0
+
+    def is_due(self, tick: int, slot: int, agent) -> bool:
+        every = max(1, agent.think_every)
+        return agent.think_pending or (tick + slot) % every == 0
+
+    def run(self, tick: int, slotted_agents, think):
+        """slotted_agents: iterable of (slot, agent); think(agent) does the work."""
+        due = [agent for slot, agent in slotted_agents if self.is_due(tick, slot, agent)]
+        # Agents deferred last tick go first so nobody starves
+        due.sort(key=lambda agent: not agent.think_pending)
+
+        budget = self.max_cost_per_tick
+        spent = 0
+        thinks = 0
+        deferred = 0
+        for agent in due:
+            cost = agent.think_cost
+            # Always let at least one agent through, even an oversized one
+            if thinks and spent + cost > budget:
+                agent.think_pending = True
+                deferred += 1
+                continue
+            think(agent)
+            spent += cost
+            thinks += 1
+
+        self.thinks_last_tick = thinks
+        self.cost_last_tick = spent
+        self.deferred_last_tick = deferred
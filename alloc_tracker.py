@@ -0,0 +1,366 @@
+"""Per-frame allocation and GC pause tracking for the game loop.
+
+Off by default; main.py --alloc-report turns it on. Mark the loop:
+
+    alloc_tracker.begin_frame()
+    with alloc_tracker.phase("update"):
+        game.update(now_ms)            # may call alloc_tracker.mark("enemies") ...
+    with alloc_tracker.phase("draw"):
+        ...
+    alloc_tracker.end_frame()
+
+Per phase it records, via tracemalloc, the bytes allocated on top of the
+phase's starting point (peak, i.e. temporaries included) and the net blocks
+and bytes it left behind, plus the Surfaces it created. mark(name) inside a
+phase starts a sub-phase ("update/enemies") without indenting the code.
+
+Surfaces are allocated by SDL, out of tracemalloc's sight, so enable() swaps
+in counting shims for pygame.Surface, Font/SysFont (render), pygame.transform
+and Surface.copy()/convert*() on counted surfaces. Fonts and surfaces made
+before enable() are not counted.
+
+Every `sample_every` frames a tracemalloc snapshot is compared with the one
+taken when that frame began: the top sites are the lines whose live
+allocations grew across a frame (caches, leaks, state kept per frame).
+GC pauses are timed with gc.callbacks, per generation and per phase.
+When disabled, phase() and mark() cost one flag check; they are also no-ops
+on other threads (the --pipeline simulation thread), though tracemalloc's
+totals still include whatever those threads allocate meanwhile.
+"""
+import contextlib
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+
+import pygame
+
+enabled = False
+
+_TRACE_DEPTH = 1
+_TRANSFORMS = ("scale", "scale_by", "smoothscale", "smoothscale_by", "rotate", "rotozoom",
+               "flip", "chop", "laplacian", "grayscale")
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class _PhaseStats:
+    __slots__ = ("calls", "peak_bytes", "max_peak_bytes", "net_bytes", "net_blocks",
+                 "surfaces", "gc_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.peak_bytes = 0       # summed over calls
+        self.max_peak_bytes = 0
+        self.net_bytes = 0
+        self.net_blocks = 0
+        self.surfaces = 0
+        self.gc_ms = 0.0
+
+
+class _Open:
+    """A running phase: where the counters were when it started."""
+    __slots__ = ("name", "is_mark", "bytes", "blocks", "surfaces", "peak")
+
+    def __init__(self, name, is_mark=False):
+        self.name = name
+        self.is_mark = is_mark
+        self.bytes = tracemalloc.get_traced_memory()[0]
+        self.blocks = sys.getallocatedblocks()
+        self.surfaces = _surfaces
+        self.peak = self.bytes
+
+
+_sample_every = 60
+_top = 10
+_phases = {}              # name -> _PhaseStats
+_stack = []               # open phases, outermost first (main thread)
+_frames = 0
+_frame_open = None        # _Open for the whole frame
+_frame_gc_ms = 0.0
+_frame_history = []       # (peak bytes, net blocks, surfaces, gc ms) per frame
+_surfaces = 0
+_gc_start = None
+_gc_phase = None
+_gc_by_gen = {}           # generation -> [collections, total ms, max ms, objects collected]
+_frame_snapshot = None
+_sites = {}               # site -> [sampled frames seen, size diff, count diff]
+_sampled = 0
+_originals = {}
+_thread = None            # phases are only tracked on the thread that enabled us
+
+
+# -------------------- SURFACE SHIMS --------------------
+def _count_surface(surface):
+    global _surfaces
+    _surfaces += 1
+    return surface
+
+
+class _CountedSurface(pygame.Surface):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _count_surface(self)
+
+    def copy(self):
+        return _count_surface(super().copy())
+
+    def convert(self, *args):
+        return _count_surface(super().convert(*args))
+
+    def convert_alpha(self, *args):
+        return _count_surface(super().convert_alpha(*args))
+
+
+class _CountedFont(pygame.font.Font):
+    def render(self, *args, **kwargs):
+        return _count_surface(super().render(*args, **kwargs))
+
+
+def _counted(fn):
+    def wrapper(*args, **kwargs):
+        return _count_surface(fn(*args, **kwargs))
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+def _install_shims():
+    import pygame.sysfont
+
+    _originals[(pygame, "Surface")] = pygame.Surface
+    _originals[(pygame.font, "Font")] = pygame.font.Font
+    _originals[(pygame.sysfont, "Font")] = pygame.sysfont.Font  # SysFont's constructor
+    pygame.Surface = _CountedSurface
+    pygame.font.Font = _CountedFont
+    pygame.sysfont.Font = _CountedFont
+    for name in _TRANSFORMS:
+        fn = getattr(pygame.transform, name, None)
+        if fn is not None:
+            _originals[(pygame.transform, name)] = fn
+            setattr(pygame.transform, name, _counted(fn))
+
+
+def _remove_shims():
+    for (module, name), value in _originals.items():
+        setattr(module, name, value)
+    _originals.clear()
+
+
+# -------------------- GC --------------------
+def _on_gc(stage, info):
+    global _gc_start, _gc_phase, _frame_gc_ms
+    if stage == "start":
+        _gc_start = time.perf_counter()
+        _gc_phase = _stack[-1].name if _stack else None
+        return
+    if _gc_start is None:
+        return
+    ms = (time.perf_counter() - _gc_start) * 1000
+    _gc_start = None
+    stats = _gc_by_gen.setdefault(info["generation"], [0, 0.0, 0.0, 0])
+    stats[0] += 1
+    stats[1] += ms
+    stats[2] = max(stats[2], ms)
+    stats[3] += info["collected"]
+    _frame_gc_ms += ms
+    if _gc_phase is not None:
+        _phases.setdefault(_gc_phase, _PhaseStats()).gc_ms += ms
+
+
+# -------------------- CONTROL --------------------
+def enable(sample_every: int = 60, top: int = 10):
+    """Start tracemalloc, GC timing and the Surface shims."""
+    global enabled, _sample_every, _top, _thread
+    if enabled:
+        return
+    _sample_every = max(1, sample_every)
+    _top = top
+    _thread = threading.get_ident()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(_TRACE_DEPTH)
+    gc.callbacks.append(_on_gc)
+    _install_shims()
+    enabled = True
+
+
+def disable():
+    global enabled
+    if not enabled:
+        return
+    enabled = False
+    _remove_shims()
+    if _on_gc in gc.callbacks:
+        gc.callbacks.remove(_on_gc)
+    tracemalloc.stop()
+
+
+def _take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+
+
+def begin_frame():
+    global _frame_open, _frame_gc_ms, _frame_snapshot
+    if not enabled:
+        return
+    _frame_gc_ms = 0.0
+    _frame_snapshot = _take_snapshot() if _frames % _sample_every == 0 else None
+    # Opened after the snapshot so taking it doesn't count as frame work
+    _frame_open = _Open("frame")
+    tracemalloc.reset_peak()
+
+
+def end_frame():
+    global _frames, _frame_open, _frame_snapshot, _sampled
+    if not enabled or _frame_open is None:
+        return
+    while _stack:
+        _close(_stack.pop())
+    start = _frame_open
+    peak = tracemalloc.get_traced_memory()[1]
+    _frame_history.append((max(peak, start.peak) - start.bytes,
+                           sys.getallocatedblocks() - start.blocks,
+                           _surfaces - start.surfaces, _frame_gc_ms))
+    _frame_open = None
+
+    if _frame_snapshot is not None:
+        diff = _take_snapshot().compare_to(_frame_snapshot, "lineno")
+        _frame_snapshot = None
+        _sampled += 1
+        for stat in diff:
+            if stat.size_diff <= 0 and stat.count_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            site = _sites.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0, 0])
+            site[0] += 1
+            site[1] += stat.size_diff
+            site[2] += stat.count_diff
+    _frames += 1
+
+
+# -------------------- PHASES --------------------
+def _note_peak():
+    """Fold the tracemalloc peak since the last reset into the open phases."""
+    peak = tracemalloc.get_traced_memory()[1]
+    for open_phase in _stack:
+        open_phase.peak = max(open_phase.peak, peak)
+    if _frame_open is not None:
+        _frame_open.peak = max(_frame_open.peak, peak)
+
+
+def _close(open_phase):
+    """Record a phase that was just popped off the stack."""
+    _note_peak()
+    open_phase.peak = max(open_phase.peak, tracemalloc.get_traced_memory()[1])
+    stats = _phases.setdefault(open_phase.name, _PhaseStats())
+    peak = open_phase.peak - open_phase.bytes
+    stats.calls += 1
+    stats.peak_bytes += peak
+    stats.max_peak_bytes = max(stats.max_peak_bytes, peak)
+    stats.net_bytes += tracemalloc.get_traced_memory()[0] - open_phase.bytes
+    stats.net_blocks += sys.getallocatedblocks() - open_phase.blocks
+    stats.surfaces += _surfaces - open_phase.surfaces
+    # The reset drops the peak back to current; the new baseline for the
+    # phases still open is what is allocated right now
+    tracemalloc.reset_peak()
+
+
+def _open(name, is_mark=False):
+    _note_peak()
+    _stack.append(_Open(name, is_mark))
+    tracemalloc.reset_peak()
+
+
+@contextlib.contextmanager
+def _phase(name):
+    depth = len(_stack)
+    _open(name)
+    try:
+        yield
+    finally:
+        while len(_stack) > depth:
+            _close(_stack.pop())
+
+
+def phase(name: str):
+    """Context manager attributing allocations inside it to `name`."""
+    if not enabled or _frame_open is None or threading.get_ident() != _thread:
+        return _NULL_PHASE
+    return _phase(f"{_stack[-1].name}/{name}" if _stack else name)
+
+
+def mark(name: str):
+    """Start sub-phase `name` of the current phase (ends the previous one)."""
+    if not enabled or not _stack or threading.get_ident() != _thread:
+        return
+    if _stack[-1].is_mark:
+        _close(_stack.pop())
+    _open(f"{_stack[-1].name}/{name}", is_mark=True)
+
+
+# -------------------- REPORT --------------------
+def _kb(nbytes) -> str:
+    return f"{nbytes / 1024:.1f} KB"
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def report() -> str:
+    frames = max(1, len(_frame_history))
+    lines = ["----- ALLOCATIONS -----", f"{len(_frame_history)} frames"]
+    if _frame_history:
+        peaks = [f[0] for f in _frame_history]
+        surfaces = [f[2] for f in _frame_history]
+        lines.append(f"allocated per frame (peak over start): avg {_kb(sum(peaks) / frames)}, "
+                     f"p95 {_kb(_percentile(peaks, 95))}, max {_kb(max(peaks))}")
+        lines.append(f"net blocks per frame: avg {sum(f[1] for f in _frame_history) / frames:+.1f}")
+        lines.append(f"surfaces per frame: avg {sum(surfaces) / frames:.2f}, max {max(surfaces)}")
+
+    lines += ["", "by phase (per call):",
+              f"  {'phase':<28} {'calls':>7} {'alloc':>10} {'max':>10} {'net':>10} "
+              f"{'blocks':>8} {'surfs':>7} {'gc ms':>8}"]
+    for name in sorted(_phases):
+        s = _phases[name]
+        calls = max(1, s.calls)
+        lines.append(f"  {name:<28} {s.calls:>7} {_kb(s.peak_bytes / calls):>10} "
+                     f"{_kb(s.max_peak_bytes):>10} {_kb(s.net_bytes / calls):>10} "
+                     f"{s.net_blocks / calls:>+8.1f} {s.surfaces / calls:>7.2f} {s.gc_ms:>8.2f}")
+
+    lines += ["", "gc pauses:"]
+    if not _gc_by_gen:
+        lines.append("  none")
+    for gen in sorted(_gc_by_gen):
+        count, total, worst, collected = _gc_by_gen[gen]
+        lines.append(f"  gen {gen}: {count} collections, {total:.1f} ms total, "
+                     f"max {worst:.2f} ms, {collected} objects collected")
+    if _frame_history:
+        gc_frames = [f[3] for f in _frame_history if f[3] > 0]
+        lines.append(f"  frames with a pause: {len(gc_frames)}, "
+                     f"worst frame {max(f[3] for f in _frame_history):.2f} ms")
+
+    lines += ["", f"top sites growing across a frame ({_sampled} sampled frames):"]
+    ranked = sorted(_sites.items(), key=lambda kv: kv[1][1], reverse=True)[:_top]
+    if not ranked:
+        lines.append("  none")
+    for site, (seen, size, count) in ranked:
+        per = max(1, _sampled)
+        lines.append(f"  {_kb(size / per):>10} {count / per:>8.1f} blocks  in {seen:>4} frames  {site}")
+    return "\n".join(lines)
+
+
+def dump_report(path: str = "-"):
+    """Write report() to `path` ("-" for stdout)."""
+    text = report()
+    if path == "-":
+        print(text)
+        return
+    with open(path, "w") as f:
+        f.write(text + "\n")
@@ -0,0 +1,186 @@
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+
+# -------------------- PACK FORMAT --------------------
+# [magic 8 bytes][index offset u64][index length u64][blobs ...][json index]
+#
+# Every PNG is stored as raw, pre-decoded RGBA pixels so the runtime can hand
+# a slice of the memory-mapped file straight to pygame.image.frombuffer
+# (no PNG decoding, one memcpy). Audio is stored as the original file bytes.
+PACK_MAGIC = b"ROBOPAK1"
+PACK_HEADER = struct.Struct("<8sQQ")
+PACK_ALIGN = 16
+PACK_NAME = "assets.pack"
+
+IMAGE_EXTS = (".png",)
+SOUND_EXTS = (".mp3", ".wav", ".ogg")
+SKIP_DIRS = {".git", "build", "dist", "__pycache__"}
+
+
+def _key(path: str) -> str:
+    """Normalize a relative asset path into a pack index key."""
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def build_pack(src_root: str = ".", out_path: str = PACK_NAME) -> int:
+    """Decode every image/audio asset under src_root into one pack file.
+
+    Returns the number of assets written.
+    """
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(src_root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            ext = os.path.splitext(name)[1].lower()
+            if name.startswith(".") or ext not in IMAGE_EXTS + SOUND_EXTS:
+                continue
+            full = os.path.join(dirpath, name)
+            entries.append((_key(os.path.relpath(full, src_root)), full, ext))
+
+    index = {}
+    with open(out_path, "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, 0, 0))
+        for key, full, ext in entries:
+            if ext in IMAGE_EXTS:
+                img = pygame.image.load(full)
+                data = pygame.image.tobytes(img, "RGBA")
+                meta = {"kind": "image", "w": img.get_width(), "h": img.get_height()}
+            else:
+                with open(full, "rb") as src:
+                    data = src.read()
+                meta = {"kind": "sound", "ext": ext}
+
+            pad = -f.tell() % PACK_ALIGN
+            f.write(b"\0" * pad)
+            meta["offset"] = f.tell()
+            meta["length"] = len(data)
+            f.write(data)
+            index[key] = meta
+
+        index_offset = f.tell()
+        index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        f.write(index_bytes)
+        f.seek(0)
+        f.write(PACK_HEADER.pack(PACK_MAGIC, index_offset, len(index_bytes)))
+
+    return len(index)
+
+
+class AssetPack:
+    """Read-only, memory-mapped view of a pack built by build_pack()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, index_offset, index_length = PACK_HEADER.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"Not an asset pack: {path}")
+        raw_index = self._map[index_offset:index_offset + index_length]
+        self.index = json.loads(raw_index.decode("utf-8"))
+
+        # Folder keys too, so os.path.exists-style checks on folders still work
+        self.dirs = set()
+        for key in self.index:
+            parent = os.path.dirname(key)
+            while parent and parent not in self.dirs:
+                self.dirs.add(parent)
+                parent = os.path.dirname(parent)
+
+    def __contains__(self, path: str) -> bool:
+        key = _key(path)
+        return key in self.index or key in self.dirs
+
+    def _slice(self, meta) -> memoryview:
+        start = meta["offset"]
+        return self._view[start:start + meta["length"]]
+
+    def load_image(self, path: str) -> pygame.Surface:
+        """Zero-copy surface over the mapped pixels; see the module-level load_image()."""
+        meta = self.index[_key(path)]
+        return pygame.image.frombuffer(self._slice(meta), (meta["w"], meta["h"]), "RGBA")
+
+    def open_bytes(self, path: str) -> io.BytesIO:
+        return io.BytesIO(self._slice(self.index[_key(path)]))
+
+
+# -------------------- RUNTIME LOADER --------------------
+# Packaged builds ship assets.pack next to the executable (or inside the
+# PyInstaller bundle); development runs fall back to the loose files.
+_pack = None
+_pack_checked = False
+
+
+def _base_dir() -> str:
+    return getattr(sys, "_MEIPASS", ".")
+
+
+def get_pack():
+    global _pack, _pack_checked
+    if not _pack_checked:
+        _pack_checked = True
+        path = os.path.join(_base_dir(), PACK_NAME)
+        if os.path.exists(path):
+            try:
+                _pack = AssetPack(path)
+            except (OSError, ValueError) as e:
+                print(f"Error opening {path}: {e}")
+                _pack = None
+    return _pack
+
+
+def exists(path: str) -> bool:
+    pack = get_pack()
+    if pack is not None and path in pack:
+        return True
+    return os.path.exists(path)
+
+
+def load_image(path: str) -> pygame.Surface:
+    """Like pygame.image.load; call convert()/convert_alpha() on the result.
+
+    A packed image comes back as a read-only view of the mapped pack (which
+    stays open for the process): writing to it crashes, so only convert,
+    copy or blit from it and keep the converted surface.
+    """
+    pack = get_pack()
+    if pack is not None and _key(path) in pack.index:
+        return pack.load_image(path)
+    return pygame.image.load(path)
+
+
+def load_sound(path: str) -> pygame.mixer.Sound:
+    pack = get_pack()
+    if pack is not None and _key(path) in pack.index:
+        return pygame.mixer.Sound(pack.open_bytes(path))
+    return pygame.mixer.Sound(path)
+
+
+def load_music(path: str):
+    pack = get_pack()
+    if pack is not None and _key(path) in pack.index:
+        ext = pack.index[_key(path)]["ext"].lstrip(".")
+        pygame.mixer.music.load(pack.open_bytes(path), ext)
+        return
+    pygame.mixer.music.load(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the single-file asset pack.")
+    parser.add_argument("--src", default=".", help="asset root directory")
+    parser.add_argument("--out", default=PACK_NAME, help="output pack path")
+    args = parser.parse_args()
+
+    count = build_pack(args.src, args.out)
+    print(f"Packed {count} assets into {args.out} ({os.path.getsize(args.out)} bytes)")
@@ -0,0 +1,215 @@
+"""Headless batch simulator for loadout / difficulty balancing.
+
+Runs many seeded games across a process pool with a simple built-in bot and
+writes per-game rows plus a per-loadout summary to CSV:
+
+    python batch_sim.py --games 500 --workers 8 --out balance.csv
+"""
+import argparse
+import contextlib
+import csv
+import io
+import multiprocessing
+import os
+import random
+
+import pygame
+
+from input_source import BotInput, InputAction
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 1040, 672
+FPS = 60
+
+RESULT_FIELDS = [
+    "loadout", "seed", "enemy_ramp", "survival_s", "level", "kills",
+    "item0", "mission_type", "mission_success", "game_over", "ticks",
+]
+SUMMARY_FIELDS = [
+    "loadout", "enemy_ramp", "games", "mean_survival_s", "mean_level",
+    "max_level", "mean_kills", "mission_success_rate", "death_rate",
+]
+
+
+# -------------------- BOT --------------------
+def chase_bot(game, now_ms) -> InputAction:
+    """Line up vertically with the nearest enemy so horizontal shots land,
+    approach from a distance, back off when it gets too close."""
+    action = InputAction()
+    px = game.player.rect.centerx - game.map_x
+    py = game.player.rect.centery - game.map_y
+
+    target = None
+    best = None
+    for enemy in game.enemy_list:
+        if not enemy.alive:
+            continue
+        dx = enemy.rect.centerx - px
+        dy = enemy.rect.centery - py
+        d2 = dx * dx + dy * dy
+        if best is None or d2 < best:
+            best, target = d2, (dx, dy)
+    if target is None:
+        return action
+
+    dx, dy = target
+    action.facing = "right" if dx >= 0 else "left"
+    if best < 60 * 60:
+        # Too close: step away vertically, keep facing the enemy
+        action.move_y = -1 if dy > 0 else 1
+        return action
+
+    if abs(dy) > 8:
+        action.move_y = 1 if dy > 0 else -1
+    if abs(dx) > 160:
+        action.move_x = 1 if dx > 0 else -1
+    return action
+
+
+# -------------------- WORKER --------------------
+_screen = None
+
+
+def init_headless() -> pygame.Surface:
+    """Window-less pygame setup for simulation processes."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    # Otherwise SDL swallows SIGTERM and Pool.terminate() can't stop workers
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+    pygame.init()
+    # Game converts surfaces, which needs a display mode even headless
+    screen = pygame.display.get_surface()
+    if screen is None:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return screen
+
+
+def _init_worker():
+    global _screen
+    _screen = init_headless()
+
+
+def run_game(job) -> dict:
+    """Play one game to game over, mission success or the time limit."""
+    from game import Game
+    from menu import LOADOUTS
+
+    loadout_name, seed, enemy_ramp, max_seconds = job
+    random.seed(seed)
+    loadout = LOADOUTS[loadout_name]
+
+    clock = {"now": 0}
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(
+            _screen,
+            SCREEN_WIDTH,
+            SCREEN_HEIGHT,
+            player_class=loadout["class"],
+            player_speed=loadout["player_speed"],
+            player_hp=loadout["player_hp"],
+            enemy_count=loadout["enemy_count"],
+            damage_to_enemy=loadout["damage_to_enemy"],
+            get_ticks=lambda: clock["now"],
+            input_source=BotInput(chase_bot),
+        )
+        game.level_manager.enemy_ramp = enemy_ramp
+        game.enemy_die_sfx = None
+        game.fireball_shoot_sfx = None
+
+        max_ticks = int(max_seconds * FPS)
+        tick = 0
+        while tick < max_ticks and not game.GAME_OVER and not game.mission_completed:
+            tick += 1
+            clock["now"] = tick * 1000 // FPS
+            game.update(clock["now"])
+
+    return {
+        "loadout": loadout_name,
+        "seed": seed,
+        "enemy_ramp": enemy_ramp,
+        "survival_s": round(game.survival_time_ms / 1000, 2),
+        "level": game.level,
+        "kills": game.kills,
+        "item0": game.item0_count,
+        "mission_type": game.mission_type,
+        "mission_success": int(game.mission_completed),
+        "game_over": int(game.GAME_OVER),
+        "ticks": tick,
+    }
+
+
+# -------------------- AGGREGATION --------------------
+def summarize(rows):
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["loadout"], row["enemy_ramp"]), []).append(row)
+
+    summary = []
+    for (loadout, ramp), items in sorted(groups.items()):
+        n = len(items)
+        summary.append({
+            "loadout": loadout,
+            "enemy_ramp": ramp,
+            "games": n,
+            "mean_survival_s": round(sum(r["survival_s"] for r in items) / n, 2),
+            "mean_level": round(sum(r["level"] for r in items) / n, 3),
+            "max_level": max(r["level"] for r in items),
+            "mean_kills": round(sum(r["kills"] for r in items) / n, 2),
+            "mission_success_rate": round(sum(r["mission_success"] for r in items) / n, 3),
+            "death_rate": round(sum(r["game_over"] for r in items) / n, 3),
+        })
+    return summary
+
+
+def write_csv(path, rows, fields):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    from menu import LOADOUTS
+
+    parser = argparse.ArgumentParser(description="Headless loadout balancing runs.")
+    parser.add_argument("--games", type=int, default=100, help="games per loadout per ramp")
+    parser.add_argument("--loadouts", nargs="+", default=list(LOADOUTS), choices=list(LOADOUTS))
+    parser.add_argument("--ramps", nargs="+", type=int, default=[3], help="enemies added per level")
+    parser.add_argument("--seed", type=int, default=0, help="first seed of the sweep")
+    parser.add_argument("--max-seconds", type=float, default=600, help="simulated time limit per game")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default="balance.csv", help="per-game results")
+    parser.add_argument("--summary", default="balance_summary.csv", help="per-loadout aggregates")
+    args = parser.parse_args(argv)
+
+    jobs = [
+        (loadout, args.seed + i, ramp, args.max_seconds)
+        for loadout in args.loadouts
+        for ramp in args.ramps
+        for i in range(args.games)
+    ]
+
+    rows = []
+    pool = multiprocessing.Pool(args.workers, initializer=_init_worker)
+    try:
+        for done, row in enumerate(pool.imap_unordered(run_game, jobs, chunksize=4), 1):
+            rows.append(row)
+            if done % 50 == 0 or done == len(jobs):
+                print(f"{done}/{len(jobs)} games", flush=True)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    rows.sort(key=lambda r: (r["loadout"], r["enemy_ramp"], r["seed"]))
+    write_csv(args.out, rows, RESULT_FIELDS)
+
+    summary = summarize(rows)
+    write_csv(args.summary, summary, SUMMARY_FIELDS)
+    for s in summary:
+        print(s)
+
+
+if __name__ == "__main__":
+    main()
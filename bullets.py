@@ -0,0 +1,152 @@
+"""Array-backed enemy projectiles for boss bullet patterns.
+
+Bullets never become sprites: position, velocity, lifetime and style live
+in preallocated NumPy arrays with a hard cap (extra bullets are dropped).
+Movement, expiry, wall hits and the player hit test are vectorized, and
+drawing is one Surface.blits() over a sprite per style.
+
+Patterns (radial, spiral, aimed) are deterministic functions of their
+arguments, so boss fights replay tick for tick.
+"""
+import numpy as np
+import pygame
+
+import surface_memory
+
+# style -> (color, radius, life in ticks)
+STYLES = {
+    "orb": ((255, 80, 200), 5, 240),
+    "needle": ((255, 220, 80), 3, 180),
+}
+STYLE_NAMES = list(STYLES)
+
+
+class BulletSystem:
+    def __init__(self, capacity: int = 4096, tiles=None):
+        """tiles: optional TileMap; bullets then die on solid tiles."""
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.int32)   # ticks left; <= 0 is free
+        self.style = np.zeros(capacity, np.uint8)
+        self.dropped = 0
+
+        self._radius = np.array([STYLES[s][1] for s in STYLE_NAMES], np.float32)
+        self._solid = None
+        if tiles is not None:
+            self._tile_size = tiles.tile_size
+            self._solid = np.array(tiles.solid_cells, bool).reshape(tiles.rows, tiles.cols)
+        self._sprites = None
+
+    @property
+    def live_count(self) -> int:
+        return int(np.count_nonzero(self.life > 0))
+
+    def clear(self):
+        self.life[:] = 0
+
+    def emit(self, style: str, x, y, vx, vy):
+        """Spawn one bullet per entry of the velocity arrays at WORLD (x, y)."""
+        vx = np.atleast_1d(vx)
+        vy = np.atleast_1d(vy)
+        free = np.flatnonzero(self.life <= 0)[:len(vx)]
+        self.dropped += len(vx) - len(free)
+        n = len(free)
+        if n == 0:
+            return
+        self.pos[free, 0] = x
+        self.pos[free, 1] = y
+        self.vel[free, 0] = vx[:n]
+        self.vel[free, 1] = vy[:n]
+        self.life[free] = STYLES[style][2]
+        self.style[free] = STYLE_NAMES.index(style)
+
+    # -------------------- PATTERNS --------------------
+    def radial(self, x, y, count: int, speed: float, offset_deg: float = 0.0, style: str = "orb"):
+        """Evenly spaced ring of `count` bullets."""
+        angle = np.radians(offset_deg) + np.arange(count) * (2 * np.pi / count)
+        self.emit(style, x, y, np.cos(angle) * speed, np.sin(angle) * speed)
+
+    def spiral(self, x, y, arms: int, angle_deg: float, speed: float, style: str = "needle"):
+        """One step of a spiral: `arms` bullets rotated to `angle_deg`; advance the angle per call."""
+        self.radial(x, y, arms, speed, angle_deg, style)
+
+    def aimed(self, x, y, target_x, target_y, count: int, spread_deg: float, speed: float,
+              style: str = "needle"):
+        """Fan of `count` bullets centred on the target."""
+        base = np.arctan2(target_y - y, target_x - x)
+        if count > 1:
+            offsets = np.linspace(-0.5, 0.5, count) * np.radians(spread_deg)
+        else:
+            offsets = np.zeros(1)
+        angle = base + offsets
+        self.emit(style, x, y, np.cos(angle) * speed, np.sin(angle) * speed)
+
+    # -------------------- SIMULATION --------------------
+    def update(self, walls: bool = False):
+        live = np.flatnonzero(self.life > 0)
+        if len(live) == 0:
+            return
+        self.pos[live] += self.vel[live]
+        self.life[live] -= 1
+        if walls and self._solid is not None:
+            ts = self._tile_size
+            rows, cols = self._solid.shape
+            tx = (self.pos[live, 0] // ts).astype(np.intp)
+            ty = (self.pos[live, 1] // ts).astype(np.intp)
+            inside = (tx >= 0) & (tx < cols) & (ty >= 0) & (ty < rows)
+            hit = ~inside
+            hit[inside] = self._solid[ty[inside], tx[inside]]
+            self.life[live[hit]] = 0
+
+    def hit_rect(self, rect: pygame.Rect) -> int:
+        """Remove bullets touching WORLD `rect`; returns how many did."""
+        live = np.flatnonzero(self.life > 0)
+        if len(live) == 0:
+            return 0
+        pos = self.pos[live]
+        r = self._radius[self.style[live]]
+        # Circle vs rect: distance from the centre to the clamped point
+        cx = np.clip(pos[:, 0], rect.left, rect.right)
+        cy = np.clip(pos[:, 1], rect.top, rect.bottom)
+        hit = (pos[:, 0] - cx) ** 2 + (pos[:, 1] - cy) ** 2 <= r * r
+        self.life[live[hit]] = 0
+        return int(np.count_nonzero(hit))
+
+    # -------------------- DRAWING --------------------
+    def _build_sprites(self):
+        self._sprites = []
+        for name in STYLE_NAMES:
+            color, radius = STYLES[name][0], STYLES[name][1]
+            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, color, (radius, radius), radius)
+            pygame.draw.circle(surf, (255, 255, 255), (radius, radius), max(1, radius // 2))
+            self._sprites.append(surface_memory.track(surf, "Bullets", name))
+
+    def blit_list(self, size, map_x: int, map_y: int):
+        """(sprite, screen pos) for every live bullet on a `size` screen."""
+        live = np.flatnonzero(self.life > 0)
+        if len(live) == 0:
+            return []
+        return self.blits_at(self.pos[live], self.style[live], size, map_x, map_y)
+
+    def blits_at(self, pos, style, size, map_x: int, map_y: int):
+        """blit_list() for bullets given as WORLD (n, 2) `pos` and (n,) `style` arrays.
+
+        Co-op clients draw the bullets of a snapshot through this.
+        """
+        if self._sprites is None:
+            self._build_sprites()
+        r = self._radius[style].astype(np.int32)
+        x = pos[:, 0].astype(np.int32) + map_x - r
+        y = pos[:, 1].astype(np.int32) + map_y - r
+        w, h = size
+        on_screen = (x > -16) & (x < w) & (y > -16) & (y < h)
+        sprites = self._sprites
+        return [(sprites[s], (px, py)) for s, px, py in
+                zip(style[on_screen].tolist(), x[on_screen].tolist(), y[on_screen].tolist())]
+
+    def draw(self, screen: pygame.Surface, map_x: int, map_y: int):
+        blits = self.blit_list(screen.get_size(), map_x, map_y)
+        if blits:
+            screen.blits(blits, doreturn=False)
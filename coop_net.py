@@ -0,0 +1,847 @@
+"""Local co-op over UDP.
+
+An authoritative server runs the simulation headless; clients send inputs
+and receive quantized, delta-compressed world snapshots. Clients predict
+their own movement and interpolate everything else.
+
+    python coop_net.py server --port 47000
+    python coop_net.py client --host 127.0.0.1 --port 47000 --loadout guard
+    python coop_net.py client --bot          # headless test client
+
+Delta compression follows the usual ack/baseline scheme: each input packet
+acks the newest snapshot tick the client has, and the server encodes the
+next snapshot against that tick, so only entities whose quantized state
+changed (plus removals) go on the wire.
+
+The server never rescans the world for a snapshot: enemies report their
+own changes, the fireball/item groups report adds and removals, and each
+snapshot logs the keys it changed or removed. A client's delta is the
+union of the logs since its acked tick, so encoding cost follows what
+changed, not how many entities exist.
+
+Boss bullets are the exception: they live in the BulletSystem arrays and
+all move every tick, so each snapshot carries them whole as one quantized
+array block, and clients extrapolate them along their velocity.
+"""
+import argparse
+import math
+import socket
+import struct
+import time
+
+import numpy as np
+import pygame
+
+from batch_sim import FPS, SCREEN_HEIGHT, SCREEN_WIDTH, init_headless
+from drop_item import DropItem
+from event_bus import ITEM_COLLECTED, PLAYER_DAMAGED
+from fireball import AIM_STEPS, Fireball
+from input_source import BotInput, InputAction, InputSource, KeyboardMouseInput
+
+DEFAULT_PORT = 47000
+SNAPSHOT_EVERY = 3       # ticks between snapshots (60 Hz sim -> 20 Hz snapshots)
+HISTORY = 64             # snapshot ticks kept on both sides for baselines
+INTERP_DELAY = 2 * SNAPSHOT_EVERY
+MAX_PACKET = 65507
+
+# -------------------- WIRE FORMAT --------------------
+HELLO = struct.Struct("<c16s")            # 'H', loadout name
+WELCOME = struct.Struct("<cBH")           # 'W', client id, player net id
+INPUT = struct.Struct("<cBIIbbBhh")       # 'I', client id, seq, acked tick, move x/y, flags,
+                                          # WORLD aim x/y (valid with F_AIM)
+SNAP_HEADER = struct.Struct("<cIIIBHBHHH")  # 'S', tick, baseline, acked seq, level, kills,
+                                           # game over, changed, removed and bullet counts
+ENTITY = struct.Struct("<BHhhBB")         # kind, id, x, y, a, b
+REMOVED = struct.Struct("<BH")            # kind, id
+# Boss bullets follow as arrays, absolute every snapshot (they all move):
+# int16 x/y pairs, int8 vx/vy pairs in 1/BULLET_VEL_SCALE px per tick, uint8 styles
+MAX_SNAPSHOT_BULLETS = 2048
+BULLET_VEL_SCALE = 16
+NO_BULLETS = (np.zeros((0, 2), np.float32), np.zeros((0, 2), np.float32), np.zeros(0, np.uint8))
+
+KIND_PLAYER, KIND_ENEMY, KIND_FIRE, KIND_ITEM = range(4)
+
+F_FACE_LEFT, F_FACE_RIGHT, F_BLOOD, F_CLONE, F_AIM = 1, 2, 4, 8, 16
+
+ANIM_IDLE, ANIM_WALK, ANIM_DEATH = range(3)
+
+
+def encode_action(action: InputAction) -> tuple:
+    flags = 0
+    if action.facing == "left":
+        flags |= F_FACE_LEFT
+    elif action.facing == "right":
+        flags |= F_FACE_RIGHT
+    if action.blood_shot:
+        flags |= F_BLOOD
+    if action.clone:
+        flags |= F_CLONE
+    aim_x = aim_y = 0
+    if action.aim_x is not None and action.aim_y is not None:
+        flags |= F_AIM
+        aim_x, aim_y = _q16(action.aim_x), _q16(action.aim_y)
+    return action.move_x, action.move_y, flags, aim_x, aim_y
+
+
+def decode_action(move_x, move_y, flags, aim_x=0, aim_y=0) -> InputAction:
+    facing = "left" if flags & F_FACE_LEFT else "right" if flags & F_FACE_RIGHT else None
+    aimed = bool(flags & F_AIM)
+    return InputAction(move_x=move_x, move_y=move_y, facing=facing,
+                       blood_shot=bool(flags & F_BLOOD), clone=bool(flags & F_CLONE),
+                       aim_x=aim_x if aimed else None, aim_y=aim_y if aimed else None)
+
+
+def _q16(v) -> int:
+    return max(-32768, min(32767, int(v)))
+
+
+def _q8(v) -> int:
+    return max(0, min(255, int(v)))
+
+
+def encode_bullets(bullets) -> tuple:
+    """(count, wire block) for the live bullets of a BulletSystem."""
+    live = np.flatnonzero(bullets.life > 0)[:MAX_SNAPSHOT_BULLETS]
+    pos = np.clip(bullets.pos[live], -32768, 32767).astype("<i2")
+    vel = np.clip(np.rint(bullets.vel[live] * BULLET_VEL_SCALE), -128, 127).astype(np.int8)
+    return len(live), pos.tobytes() + vel.tobytes() + bullets.style[live].tobytes()
+
+
+def decode_bullets(data: bytes, offset: int, count: int) -> tuple:
+    """(pos, vel, style) arrays from an encode_bullets() block."""
+    pos = np.frombuffer(data, "<i2", count * 2, offset).reshape(count, 2).astype(np.float32)
+    offset += count * 4
+    vel = np.frombuffer(data, np.int8, count * 2, offset).reshape(count, 2) / np.float32(BULLET_VEL_SCALE)
+    offset += count * 2
+    return pos, vel, np.frombuffer(data, np.uint8, count, offset)
+
+
+def encode_snapshot(tick, baseline_tick, ack_seq, hud, changed, removed, bullets=(0, b"")) -> bytes:
+    """changed: [((kind, id), (x, y, a, b))]; removed: [(kind, id)]; bullets: encode_bullets().
+
+    baseline_tick 0 = full snapshot (changed holds every entity).
+    """
+    level, kills, game_over = hud
+    parts = [SNAP_HEADER.pack(b"S", tick, baseline_tick, ack_seq, _q8(level), min(kills, 65535),
+                              int(game_over), len(changed), len(removed), bullets[0])]
+    parts.extend(ENTITY.pack(kind, eid, x, y, a, b) for (kind, eid), (x, y, a, b) in changed)
+    parts.extend(REMOVED.pack(kind, eid) for kind, eid in removed)
+    parts.append(bullets[1])
+    return b"".join(parts)
+
+
+def decode_snapshot(data: bytes, baselines: dict):
+    """Returns (tick, ack_seq, hud, state, bullets) or None when the baseline is gone."""
+    _, tick, baseline_tick, ack_seq, level, kills, game_over, n_changed, n_removed, n_bullets = \
+        SNAP_HEADER.unpack_from(data, 0)
+    if baseline_tick:
+        base = baselines.get(baseline_tick)
+        if base is None:
+            return None
+        state = dict(base)
+    else:
+        state = {}
+
+    offset = SNAP_HEADER.size
+    for _ in range(n_changed):
+        kind, eid, x, y, a, b = ENTITY.unpack_from(data, offset)
+        state[(kind, eid)] = (x, y, a, b)
+        offset += ENTITY.size
+    for _ in range(n_removed):
+        state.pop(REMOVED.unpack_from(data, offset), None)
+        offset += REMOVED.size
+    bullets = decode_bullets(data, offset, n_bullets) if n_bullets else NO_BULLETS
+    return tick, ack_seq, (level, kills, bool(game_over)), state, bullets
+
+
+# -------------------- SERVER --------------------
+class NetInput(InputSource):
+    """Latest action received from a client (edge flags are held until used)."""
+
+    def __init__(self):
+        self.action = InputAction()
+        self.last_seq = 0
+
+    def feed(self, seq, action: InputAction):
+        if seq <= self.last_seq:
+            return  # late or duplicate datagram
+        # Keep one-shot buttons pressed until the simulation consumes them
+        action.blood_shot = action.blood_shot or self.action.blood_shot
+        action.clone = action.clone or self.action.clone
+        self.action = action
+        self.last_seq = seq
+
+    def poll(self, game, now_ms: int) -> InputAction:
+        action = self.action
+        self.action = InputAction(move_x=action.move_x, move_y=action.move_y)
+        return action
+
+
+class GuestPlayer:
+    """Additional co-op player, simulated in WORLD coordinates on the server."""
+
+    def __init__(self, world_x, world_y, size, loadout):
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.rect.center = (world_x, world_y)
+        self.speed = loadout["player_speed"]
+        self.max_hp = loadout["player_hp"]
+        self.hp = self.max_hp
+        self.damage_to_enemy = loadout["damage_to_enemy"]
+        self.facing = "right"
+        self.aim_world = None  # last WORLD aim point from the guest's input
+        self.moving = False
+        self.input = NetInput()
+        self.next_fire_time = 0
+        self.next_touch_damage_time = 0
+        self.next_bullet_damage_time = 0
+
+
+class _NetGroup(pygame.sprite.Group):
+    """Sprite group that reports adds and removals for snapshot tracking."""
+
+    def __init__(self, game, sprites=()):
+        self.game = game
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.game.net_dirty.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.game.net_removed.add(sprite)
+
+
+def _make_coop_game():
+    from game import Game
+
+    class CoopGame(Game):
+        """Game plus guest players; enemies chase whoever is closest."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.guests = []
+
+            # Snapshot tracking: entities whose wire state may have changed
+            # and entities that left the world since the last snapshot
+            self.net_dirty = set()
+            self.net_removed = set()
+            self.fire_group = _NetGroup(self, self.fire_group)
+            self.item_group = _NetGroup(self, self.item_group)
+            self._tracked_enemies = set()
+            self._enemy_list_seen = (None, 0)
+            self.watch_enemies()
+
+        def watch_enemies(self):
+            """Hook enemies added since the last call (level start, boss spawn, reset)."""
+            seen = (id(self.enemy_list), len(self.enemy_list))
+            if seen == self._enemy_list_seen:
+                return
+            self._enemy_list_seen = seen
+            current = set(self.enemy_list)
+            for enemy in current - self._tracked_enemies:
+                enemy.net_dirty = self.net_dirty
+                self.net_dirty.add(enemy)
+            for enemy in self._tracked_enemies - current:
+                enemy.net_dirty = None
+                self.net_removed.add(enemy)
+            self._tracked_enemies = current
+
+        def player_world_center(self):
+            return (self.player.rect.centerx - self.map_x, self.player.rect.centery - self.map_y)
+
+        def update(self, now_ms, action=None):
+            super().update(now_ms, action)
+            if self.GAME_OVER or self.PAUSED:
+                return
+            for guest in self.guests:
+                if guest.hp > 0:
+                    self._update_guest(guest, now_ms)
+
+        def _update_guest(self, guest, now_ms):
+            action = guest.input.poll(self, now_ms)
+            if action.facing is not None:
+                guest.facing = action.facing
+            if action.aim_x is not None and action.aim_y is not None:
+                guest.aim_world = (action.aim_x, action.aim_y)
+            dx = action.move_x * guest.speed
+            dy = action.move_y * guest.speed
+            if dx:
+                guest.facing = "left" if dx < 0 else "right"
+            # Same swept-rect rule the client predicts with
+            guest.rect, _, _ = self.tiles.move_and_collide(guest.rect, dx, dy)
+            guest.moving = dx != 0 or dy != 0
+
+            if now_ms >= guest.next_fire_time:
+                fx = guest.rect.right - self.MUZZLE_X_PAD if guest.facing == "right" \
+                    else guest.rect.left + self.MUZZLE_X_PAD
+                fy = guest.rect.centery + self.MUZZLE_Y
+                fire = Fireball(fx, fy, guest.facing, aim=self.aim_towards(fx, fy, guest.aim_world))
+                fire.damage += max(0, guest.damage_to_enemy - self.damage_to_enemy)
+                self.fire_group.add(fire)
+                guest.next_fire_time = now_ms + self.auto_fire_interval_ms
+
+            if any(e.alive and e.rect.colliderect(guest.rect) for e in self.enemy_list):
+                if now_ms >= guest.next_touch_damage_time:
+                    guest.hp = max(0, guest.hp - 1)
+                    guest.next_touch_damage_time = now_ms + self.DAMAGE_COOLDOWN_MS
+                    self.events.emit(PLAYER_DAMAGED, player=guest, amount=1, hp=guest.hp, now_ms=now_ms)
+
+            # Same shared cooldown as Game.apply_bullet_damage
+            if self.bullets.hit_rect(guest.rect) and now_ms >= guest.next_bullet_damage_time:
+                guest.hp = max(0, guest.hp - 1)
+                guest.next_bullet_damage_time = now_ms + self.DAMAGE_COOLDOWN_MS
+                self.events.emit(PLAYER_DAMAGED, player=guest, amount=1, hp=guest.hp, now_ms=now_ms)
+
+            for item in list(self.item_group):
+                if item.rect.colliderect(guest.rect):
+                    if item.kind == "item1":
+                        guest.hp = min(guest.max_hp, guest.hp + 1)
+                    item.kill()
+                    self.events.emit(ITEM_COLLECTED, kind=item.kind, pos=item.rect.center, by=guest, now_ms=now_ms)
+
+        def enemy_target(self, enemy):
+            # Guests are already in world space, so they chase with map offset 0
+            ex, ey = enemy.rect.center
+            px, py = self.player_world_center()
+            best = (self.player.rect, self.map_x, self.map_y)
+            best_d = (px - ex) ** 2 + (py - ey) ** 2
+            for guest in self.guests:
+                if guest.hp > 0:
+                    gx, gy = guest.rect.center
+                    d = (gx - ex) ** 2 + (gy - ey) ** 2
+                    if d < best_d:
+                        best, best_d = (guest.rect, 0, 0), d
+            return best
+
+        def enemy_lod(self, enemy, view, px, py):
+            # Full fidelity near any player: each guest gets a host-sized view
+            lod = super().enemy_lod(enemy, view, px, py)
+            if lod == self.LOD_NEAR:
+                return lod
+            for guest in self.guests:
+                if guest.hp > 0:
+                    guest_view = view.copy()
+                    guest_view.center = guest.rect.center
+                    lod = min(lod, super().enemy_lod(enemy, guest_view, *guest.rect.center))
+            return lod
+
+    return CoopGame
+
+
+class CoopServer:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, tick_rate=FPS):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.tick_rate = tick_rate
+
+        self.screen = init_headless()
+        self.game = None
+        self.tick = 0
+        self.start = time.monotonic()
+
+        # addr -> {"id", "net_id", "input", "acked", "guest"}
+        self.clients = {}
+        self.state = {}          # (kind, id) -> quantized (x, y, a, b), kept up to date
+        self.changes = {}        # snapshot tick -> (changed keys, removed keys)
+        self._next_net_id = 1
+        self._ids_in_use = set()
+
+    def _now_ms(self) -> int:
+        return int((time.monotonic() - self.start) * 1000)
+
+    def net_id(self, obj) -> int:
+        nid = getattr(obj, "net_id", None)
+        if nid is None:
+            # Ids wrap at 65535; long-lived entities keep theirs, so skip them
+            nid = self._next_net_id
+            for _ in range(65535):
+                if nid not in self._ids_in_use:
+                    break
+                nid = nid % 65535 + 1
+            else:
+                raise RuntimeError("out of net ids")
+            self._next_net_id = nid % 65535 + 1
+            self._ids_in_use.add(nid)
+            obj.net_id = nid
+        return nid
+
+    # -------------------- PACKETS --------------------
+    def _on_hello(self, addr, data):
+        from menu import LOADOUTS
+
+        if addr not in self.clients:
+            name = HELLO.unpack(data)[1].rstrip(b"\0").decode("ascii", "ignore")
+            loadout = LOADOUTS.get(name, LOADOUTS["speed"])
+            if self.game is None:
+                CoopGame = _make_coop_game()
+                net_input = NetInput()
+                self.game = CoopGame(
+                    self.screen, SCREEN_WIDTH, SCREEN_HEIGHT,
+                    player_class=loadout["class"],
+                    player_speed=loadout["player_speed"],
+                    player_hp=loadout["player_hp"],
+                    enemy_count=loadout["enemy_count"],
+                    damage_to_enemy=loadout["damage_to_enemy"],
+                    get_ticks=self._now_ms,
+                    input_source=net_input,
+                )
+                self.game.enemy_die_sfx = None
+                self.game.fireball_shoot_sfx = None
+                client = {"input": net_input, "guest": None, "target": self.game.player}
+            else:
+                wx, wy = self.game.player_world_center()
+                guest = GuestPlayer(wx, wy, self.game.PLAYER_SIZE, loadout)
+                guest.player_class = loadout["class"]
+                self.game.guests.append(guest)
+                client = {"input": guest.input, "guest": guest, "target": guest}
+            client.update(id=len(self.clients), acked=0)
+            client["net_id"] = self.net_id(client["target"])
+            self.clients[addr] = client
+
+        client = self.clients[addr]
+        self.sock.sendto(WELCOME.pack(b"W", client["id"], client["net_id"]), addr)
+
+    def _on_input(self, addr, data):
+        client = self.clients.get(addr)
+        if client is None:
+            return
+        _, _, seq, acked, move_x, move_y, flags, aim_x, aim_y = INPUT.unpack(data)
+        if acked > client["acked"]:
+            client["acked"] = acked
+        client["input"].feed(seq, decode_action(move_x, move_y, flags, aim_x, aim_y))
+
+    def poll_network(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(MAX_PACKET)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue
+            if data[:1] == b"H" and len(data) == HELLO.size:
+                self._on_hello(addr, data)
+            elif data[:1] == b"I" and len(data) == INPUT.size:
+                self._on_input(addr, data)
+
+    # -------------------- SNAPSHOTS --------------------
+    def _entity(self, obj):
+        """((kind, id), quantized wire value) for an enemy, fireball or item."""
+        g = self.game
+        if isinstance(obj, Fireball):
+            return (KIND_FIRE, self.net_id(obj)), (
+                _q16(obj.rect.centerx), _q16(obj.rect.centery),
+                (obj.direction == "left") | ((obj.variant == "blood") << 1) | (obj.aim_step << 2),
+                obj.frame)
+        if isinstance(obj, DropItem):
+            return (KIND_ITEM, self.net_id(obj)), (
+                _q16(obj.rect.centerx), _q16(obj.rect.centery), int(obj.kind == "item1"), 0)
+        anim = obj.current_animation
+        kind = ANIM_DEATH if anim.startswith("death") else ANIM_WALK if anim.startswith("walk") else ANIM_IDLE
+        flags = (obj.alive | ((obj is g.boss) << 1) | (anim.endswith("right") << 2)
+                 | (kind << 3) | (min(obj.frame_index, 7) << 5))
+        return (KIND_ENEMY, self.net_id(obj)), (
+            _q16(obj.rect.centerx), _q16(obj.rect.centery), _q8(obj.hp), flags)
+
+    @staticmethod
+    def _kind(obj) -> int:
+        return KIND_FIRE if isinstance(obj, Fireball) else KIND_ITEM if isinstance(obj, DropItem) else KIND_ENEMY
+
+    def update_state(self):
+        """Re-encode players and changed entities into self.state.
+
+        Returns the (changed, removed) key sets for this snapshot. It drains
+        the dirty sets, so the result must go into self.changes (as
+        send_snapshots() does) or delta clients miss those changes; read
+        self.state for the current world instead.
+        """
+        g = self.game
+        g.watch_enemies()
+        changed, removed = set(), set()
+
+        def put(key, value):
+            if self.state.get(key) != value:
+                self.state[key] = value
+                changed.add(key)
+
+        wx, wy = g.player_world_center()
+        put((KIND_PLAYER, self.net_id(g.player)), (
+            _q16(wx), _q16(wy), _q8(g.player.hp),
+            (g.player.facing == "left") | (g.player.current_animation.startswith("walk") << 1)))
+        for guest in g.guests:
+            put((KIND_PLAYER, self.net_id(guest)), (
+                _q16(guest.rect.centerx), _q16(guest.rect.centery), _q8(guest.hp),
+                (guest.facing == "left") | (guest.moving << 1)))
+
+        # Fireballs move every tick, so every live one is dirty anyway
+        g.net_dirty.update(g.fire_group)
+        for obj in g.net_dirty:
+            put(*self._entity(obj))
+        g.net_dirty.clear()
+
+        for obj in g.net_removed:
+            nid = getattr(obj, "net_id", None)
+            if nid is None:
+                continue  # never sent
+            key = (self._kind(obj), nid)
+            if self.state.pop(key, None) is not None:
+                removed.add(key)
+                self._ids_in_use.discard(nid)
+        g.net_removed.clear()
+        return changed - removed, removed
+
+    def _delta_since(self, acked):
+        """(changed items, removed keys) a client at snapshot `acked` is missing,
+        or None when that baseline has left the log."""
+        if not acked or acked not in self.changes:
+            return None
+        changed, removed = set(), set()
+        for tick in range(acked + 1, self.tick + 1):
+            entry = self.changes.get(tick)
+            if entry is not None:
+                changed |= entry[0]
+                removed |= entry[1]
+        state = self.state
+        return ([(key, state[key]) for key in changed if key in state],
+                [key for key in removed if key not in state])
+
+    def send_snapshots(self):
+        self.changes[self.tick] = self.update_state()
+        self.changes.pop(self.tick - HISTORY * SNAPSHOT_EVERY, None)
+
+        hud = (self.game.level, self.game.kills, self.game.GAME_OVER)
+        bullets = encode_bullets(self.game.bullets)
+        full = None
+        for addr, client in self.clients.items():
+            delta = self._delta_since(client["acked"])
+            if delta is None:
+                if full is None:
+                    full = list(self.state.items())
+                packet = encode_snapshot(self.tick, 0, client["input"].last_seq, hud, full, [], bullets)
+            else:
+                packet = encode_snapshot(self.tick, client["acked"], client["input"].last_seq,
+                                         hud, *delta, bullets)
+            try:
+                self.sock.sendto(packet, addr)
+            except OSError:
+                pass
+
+    def step(self):
+        self.tick += 1
+        if self.game is not None:
+            self.game.update(self._now_ms())
+            if self.tick % SNAPSHOT_EVERY == 0:
+                self.send_snapshots()
+
+    def serve_forever(self):
+        period = 1.0 / self.tick_rate
+        next_tick = time.monotonic()
+        while True:
+            self.poll_network()
+            now = time.monotonic()
+            if now >= next_tick:
+                self.step()
+                next_tick += period
+                if now - next_tick > 0.25:
+                    next_tick = now  # fell far behind; don't spiral
+            else:
+                time.sleep(min(period, next_tick - now))
+
+
+# -------------------- CLIENT --------------------
+class CoopClient:
+    """Sends inputs, predicts its own player, interpolates the rest."""
+
+    def __init__(self, server=("127.0.0.1", DEFAULT_PORT), loadout="speed", input_source=None, screen=None):
+        from game import Game
+        from menu import LOADOUTS
+
+        self.server = server
+        self.loadout_name = loadout
+        self.loadout = LOADOUTS[loadout]
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.input_source = input_source or KeyboardMouseInput()
+
+        # Local Game only supplies assets, HUD and the walkability test
+        self.screen = screen if screen is not None else init_headless()
+        self.view = Game(self.screen, SCREEN_WIDTH, SCREEN_HEIGHT, player_class=self.loadout["class"])
+
+        self.client_id = None
+        self.net_id = None
+        self.seq = 0
+        self.pending = []        # (seq, InputAction) not yet acked by the server
+        self.states = {}         # tick -> decoded state (baselines + interpolation)
+        self.bullets = {}        # tick -> decoded (pos, vel, style) bullet arrays
+        self.latest_tick = 0
+        self.hud = (1, 0, False)
+        self.pos = None          # predicted own WORLD center
+        self.facing = "right"
+        self.render_tick = 0.0
+        self.bytes_received = 0
+        self._fire_images = {}
+        self._item_images = {}
+
+    def connect(self, timeout=5.0) -> bool:
+        hello = HELLO.pack(b"H", self.loadout_name.encode("ascii")[:16])
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.sock.sendto(hello, self.server)
+            time.sleep(0.05)
+            self.poll_network()
+            if self.client_id is not None:
+                return True
+        return False
+
+    def poll_network(self):
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(MAX_PACKET)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue
+            self.bytes_received += len(data)
+            if data[:1] == b"W":
+                _, self.client_id, self.net_id = WELCOME.unpack(data)
+            elif data[:1] == b"S":
+                self._on_snapshot(data)
+
+    def _on_snapshot(self, data):
+        decoded = decode_snapshot(data, self.states)
+        if decoded is None:
+            return
+        tick, ack_seq, hud, state, bullets = decoded
+        if tick <= self.latest_tick:
+            return
+        self.states[tick] = state
+        self.bullets[tick] = bullets
+        for old in [t for t in self.states if t < tick - HISTORY * SNAPSHOT_EVERY]:
+            del self.states[old]
+            self.bullets.pop(old, None)
+        self.latest_tick = tick
+        self.hud = hud
+        if self.render_tick == 0.0:
+            self.render_tick = tick - INTERP_DELAY
+
+        # Reconcile: start from the server's position, replay unacked inputs
+        me = state.get((KIND_PLAYER, self.net_id))
+        if me is not None:
+            self.pos = [me[0], me[1]]
+            self.pending = [(s, a) for s, a in self.pending if s > ack_seq]
+            for _, action in self.pending:
+                self._apply_move(action)
+
+    def _apply_move(self, action):
+        speed = self.loadout["player_speed"]
+        dx, dy = action.move_x * speed, action.move_y * speed
+        size = self.view.PLAYER_SIZE
+        rect = pygame.Rect(0, 0, size, size)
+        rect.center = self.pos
+        rect, _, _ = self.view.tiles.move_and_collide(rect, dx, dy)
+        self.pos = list(rect.center)
+
+    def update(self, now_ms):
+        self.poll_network()
+        if self.client_id is None:
+            return
+
+        if self.pos is not None:
+            # Camera offset of the predicted player, so mouse aim maps to WORLD
+            self.view.map_x = self.view.player.rect.centerx - int(self.pos[0])
+            self.view.map_y = self.view.player.rect.centery - int(self.pos[1])
+        action = self.input_source.poll(self.view, now_ms)
+        self.seq += 1
+        self.sock.sendto(INPUT.pack(b"I", self.client_id, self.seq, self.latest_tick,
+                                    *encode_action(action)), self.server)
+        if self.pos is not None:
+            self.pending.append((self.seq, action))
+            self._apply_move(action)
+        if action.facing is not None:
+            self.facing = action.facing
+        if action.move_x:
+            self.facing = "left" if action.move_x < 0 else "right"
+
+        # Interpolation clock runs one sim tick per frame, nudged toward
+        # (latest - delay) so it neither starves nor drifts
+        if self.latest_tick:
+            target = self.latest_tick - INTERP_DELAY
+            self.render_tick += 1 + 0.1 * (target - self.render_tick)
+
+    def interpolated(self) -> dict:
+        ticks = sorted(self.states)
+        if not ticks:
+            return {}
+        older = [t for t in ticks if t <= self.render_tick]
+        newer = [t for t in ticks if t >= self.render_tick]
+        if not older or not newer:
+            return self.states[ticks[0] if not older else ticks[-1]]
+        t0, t1 = older[-1], newer[0]
+        s0, s1 = self.states[t0], self.states[t1]
+        if t0 == t1:
+            return s1
+        alpha = (self.render_tick - t0) / (t1 - t0)
+        out = {}
+        for key, (x1, y1, a, b) in s1.items():
+            prev = s0.get(key)
+            if prev is None:
+                out[key] = (x1, y1, a, b)
+            else:
+                out[key] = (prev[0] + (x1 - prev[0]) * alpha, prev[1] + (y1 - prev[1]) * alpha, a, b)
+        return out
+
+    def bullet_blits(self, map_x, map_y) -> list:
+        """Bullets of the last snapshot at or before render_tick, moved on to it.
+
+        Bullet slots aren't stable between snapshots, so they are
+        extrapolated along their velocity instead of interpolated.
+        """
+        older = [t for t in self.bullets if t <= self.render_tick]
+        if not older:
+            return []
+        t0 = max(older)
+        pos, vel, style = self.bullets[t0]
+        if not len(style):
+            return []
+        pos = pos + vel * (self.render_tick - t0)
+        return self.view.bullets.blits_at(pos, style, self.screen.get_size(), map_x, map_y)
+
+    # -------------------- DRAW --------------------
+    def _fire_frames(self, flags):
+        if flags not in self._fire_images:
+            angle = math.radians((flags >> 2) * 360 / AIM_STEPS)
+            self._fire_images[flags] = Fireball(
+                0, 0, "left" if flags & 1 else "right", variant="blood" if flags & 2 else "normal",
+                aim=(math.cos(angle), math.sin(angle))).images
+        return self._fire_images[flags]
+
+    def _item_image(self, kind):
+        if kind not in self._item_images:
+            from drop_item import DropItem
+            self._item_images[kind] = DropItem(kind, 0, 0).image
+        return self._item_images[kind]
+
+    def draw(self, frame_count):
+        from sprite_atlas import get_atlas
+
+        view = self.view
+        if self.pos is None:
+            self.screen.fill((0, 0, 0))
+            return
+        # Camera follows the predicted player, same framing as single player
+        map_x = view.player.rect.centerx - int(self.pos[0])
+        map_y = view.player.rect.centery - int(self.pos[1])
+
+        self.screen.fill((0, 0, 0))
+        self.screen.blit(view.map_img, (map_x, map_y))
+
+        state = self.interpolated()
+        for (kind, eid), (x, y, a, b) in state.items():
+            sx, sy = int(x) + map_x, int(y) + map_y
+            if kind == KIND_ENEMY:
+                boss = bool(b & 2)
+                atlas = get_atlas("Spider", 96) if boss else get_atlas("Scarab", view.ENEMY_SIZE)
+                anim = ("idle", "walk", "death")[(b >> 3) & 3] + ("_right" if b & 4 else "_left")
+                frames = atlas.animations[anim]
+                img = frames[min(b >> 5, len(frames) - 1)]
+                self.screen.blit(img, img.get_rect(center=(sx, sy)))
+            elif kind == KIND_ITEM:
+                img = self._item_image("item1" if a else "item0")
+                self.screen.blit(img, img.get_rect(center=(sx, sy)))
+            elif kind == KIND_PLAYER and eid != self.net_id:
+                self._draw_player(sx, sy, "left" if b & 1 else "right", bool(b & 2), frame_count)
+
+        self._draw_player(view.player.rect.centerx, view.player.rect.centery, self.facing,
+                          any(a.move_x or a.move_y for _, a in self.pending[-1:]), frame_count)
+
+        if view.upper_img is not None:
+            self.screen.blit(view.upper_img, (map_x, map_y))
+
+        for (kind, eid), (x, y, a, b) in state.items():
+            if kind == KIND_FIRE:
+                frames = self._fire_frames(a)
+                img = frames[b % len(frames)]
+                self.screen.blit(img, img.get_rect(center=(int(x) + map_x, int(y) + map_y)))
+        self.screen.blits(self.bullet_blits(map_x, map_y), doreturn=False)
+
+        level, kills, game_over = self.hud
+        me = state.get((KIND_PLAYER, self.net_id))
+        if me is not None:
+            view.player.hp = me[2]
+            view.player.max_hp = self.loadout["player_hp"]
+        view.level, view.kills = level, kills
+        view.draw_health_bar()
+        view.draw_kill_count()
+        if game_over:
+            view.draw_game_over_overlay()
+
+    def _draw_player(self, sx, sy, facing, moving, frame_count):
+        from sprite_atlas import get_atlas
+
+        frames = get_atlas(self.loadout["class"], self.view.PLAYER_SIZE).animations[
+            ("walk_" if moving else "idle_") + facing]
+        img = frames[(frame_count // 10) % len(frames)]
+        self.screen.blit(img, img.get_rect(center=(sx, sy)))
+
+
+def wander_bot(game, now_ms) -> InputAction:
+    """Walks a slow square so prediction and reconciliation get exercised."""
+    phase = (now_ms // 1500) % 4
+    return InputAction(move_x=(1, 0, -1, 0)[phase], move_y=(0, 1, 0, -1)[phase])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local co-op over UDP.")
+    parser.add_argument("mode", choices=["server", "client"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--loadout", default="speed")
+    parser.add_argument("--bot", action="store_true", help="headless client driven by the batch_sim bot")
+    parser.add_argument("--seconds", type=float, default=0, help="bot client run time (0 = forever)")
+    args = parser.parse_args(argv)
+
+    if args.mode == "server":
+        print(f"Co-op server on {args.host}:{args.port}")
+        CoopServer(args.host, args.port).serve_forever()
+        return
+
+    if args.bot:
+        screen = init_headless()
+        source = BotInput(wander_bot)
+    else:
+        pygame.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("ROBO Survive - Co-op")
+        source = None
+
+    client = CoopClient((args.host, args.port), args.loadout, source, screen)
+    if not client.connect():
+        print("No server answered")
+        return
+
+    clock = pygame.time.Clock()
+    started = time.monotonic()
+    frame = 0
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        client.update(pygame.time.get_ticks())
+        if not args.bot:
+            client.draw(frame)
+            pygame.display.flip()
+        frame += 1
+        clock.tick(FPS)
+        if args.seconds and time.monotonic() - started >= args.seconds:
+            running = False
+
+    if args.bot:
+        elapsed = time.monotonic() - started
+        print(f"received {client.bytes_received} bytes in {elapsed:.1f}s "
+              f"({client.bytes_received / max(elapsed, 1e-6) / 1024:.1f} KiB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import os
 import pygame
 
+import asset_pack
+import surface_memory
+
 
 class DropItem(pygame.sprite.Sprite):
     """A collectible item stored in WORLD coordinates.
@@ -18,11 +21,15 @@ class DropItem(pygame.sprite.Sprite):
         self.kind = kind
 
         path = os.path.join("drop", f"{kind}.png")
-        self.image = pygame.image.load(path).convert_alpha()
+        self.image = asset_pack.load_image(path).convert_alpha()
         # scale to a nice pickup size
         self.image = pygame.transform.scale(self.image, (18, 18))
+        surface_memory.track(self.image, "DropItem", path)
         self.rect = self.image.get_rect(center=(int(world_x), int(world_y)))
 
-    def draw(self, screen: pygame.Surface, map_x: int, map_y: int):
+    def sprite(self, map_x: int, map_y: int):
         # WORLD -> SCREEN
-        screen.blit(self.image, (self.rect.x + map_x, self.rect.y + map_y))
+        return self.image, (self.rect.x + map_x, self.rect.y + map_y)
+
+    def draw(self, screen: pygame.Surface, map_x: int, map_y: int):
+        screen.blit(*self.sprite(map_x, map_y))
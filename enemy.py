@@ -1,25 +1,26 @@
 import pygame
-import os
 import random
 
+from sprite_atlas import get_atlas
+
 class Enemy:
-    def __init__(self, map_width, map_height, size, sprite_root):
+    # The co-op server points this at its dirty set; changed enemies add
+    # themselves so snapshots only re-encode those
+    net_dirty = None
+
+    def __init__(self, map_width, map_height, size, sprite_root, spawner=None):
         self.size = size
         self.map_width = map_width
         self.map_height = map_height
         self.sprite_root = sprite_root
+        # spawner(size) -> world top-left or None (see Game.spawn_point)
+        self.spawner = spawner
 
         self.rect = pygame.Rect(0, 0, size, size)
         
-        # Load animations
-        self.animations = {
-            "idle_left": self.load_images(os.path.join(sprite_root, "idle", "left")),
-            "idle_right": self.load_images(os.path.join(sprite_root, "idle", "right")),
-            "walk_left": self.load_images(os.path.join(sprite_root, "walk", "left")),
-            "walk_right": self.load_images(os.path.join(sprite_root, "walk", "right")),
-            "death_left": self.load_images(os.path.join(sprite_root, "death", "left")),
-            "death_right": self.load_images(os.path.join(sprite_root, "death", "right")),
-        }
+        # Shared atlas views; every Scarab reuses the same frames
+        self.atlas = get_atlas(sprite_root, size)
+        self.animations = self.atlas.animations
 
         self.current_animation = "idle_right"
         self.frame_index = 0
@@ -33,51 +34,56 @@ class Enemy:
         self.damage = 1
         self.alive = True
         self.speed = 1
+        self.lod_exempt = False  # True = always full-fidelity updates
+
+        # AI scheduling (see ai_scheduler.py): think every N ticks at a cost
+        self.think_every = 3
+        self.think_cost = 1
+
+    def _changed(self):
+        if self.net_dirty is not None:
+            self.net_dirty.add(self)
 
     def hit(self):
         self.hp -= 1
         if self.hp <= 0:
             self.alive = False
+        self._changed()
 
-    def load_images(self, folder):
-        images = []
-        i = 0
-        while True:
-            path = os.path.join(folder, f"{i}.png")
-            if not os.path.exists(path): break
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.scale(img, (self.size, self.size))
-                images.append(img)
-            except Exception: pass
-            i += 1
-        if not images:
-            img = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-            img.fill((255, 0, 255))
-            images.append(img)
-        return images
+    def place_randomly(self):
+        pos = self.spawner(self.size) if self.spawner is not None else None
+        if pos is None:
+            pos = (random.randint(0, self.map_width - self.size),
+                   random.randint(0, self.map_height - self.size))
+        self.rect.topleft = pos
 
     def respawn(self):
-        self.rect.x = random.randint(0, self.map_width - self.size)
-        self.rect.y = random.randint(0, self.map_height - self.size)
+        self.place_randomly()
         self.hp = 3
         self.alive = True
         self.current_animation = "idle_right"
         self.frame_index = 0
+        self.heading = None
+        self.target_dist = 0.0
+        self.think_pending = True
+        self._changed()
 
     def _set_animation(self, name: str):
         if name != self.current_animation:
             self.current_animation = name
             self.frame_index = 0
             self.frame_timer = 0
+            self._changed()
 
-    def update(self, player_rect, map_x=0, map_y=0):
+    def update(self, player_rect, map_x=0, map_y=0, animate=True, step_scale=1, tiles=None):
+        """Think + integrate in one go (unscheduled update)."""
+        self.think(player_rect, map_x, map_y)
+        self.integrate(animate, step_scale, tiles)
+
+    def think(self, player_rect, map_x=0, map_y=0):
+        """The expensive part: re-aim at the player. Cached until the next think."""
+        self.think_pending = False
         if not self.alive:
-            death_anim = "death_right" if "right" in self.current_animation else "death_left"
-            self._set_animation(death_anim)
-            self.animate(loop=False)
-            if self.frame_index >= len(self.animations[self.current_animation]) - 1:
-                self.kill_cleanup()
             return
 
         # --- FIX: CALCULATE REAL WORLD TARGET ---
@@ -91,25 +97,56 @@ class Enemy:
         dist = (dx * dx + dy * dy) ** 0.5
 
         if dist < 1:
+            self.heading = None
+            self.target_dist = 0.0
+            return
+        self.heading = (dx / dist, dy / dist)
+        self.target_dist = dist
+
+    def integrate(self, animate=True, step_scale=1, tiles=None):
+        """The cheap part, run every tick: follow the cached heading.
+
+        tiles: optional tile_collision.TileMap to slide along walls.
+        """
+        if not self.alive:
+            death_anim = "death_right" if "right" in self.current_animation else "death_left"
+            self._set_animation(death_anim)
+            self.animate(loop=False)
+            if self.frame_index >= len(self.animations[self.current_animation]) - 1:
+                self.kill_cleanup()
+            return
+
+        if self.heading is None or self.target_dist < 1:
             idle_anim = "idle_right" if "right" in self.current_animation else "idle_left"
             self._set_animation(idle_anim)
-            self.animate(loop=True)
+            if animate:
+                self.animate(loop=True)
             return
 
-        step_x = self.speed * dx / dist
-        step_y = self.speed * dy / dist
+        # step_scale > 1: coarse LOD update standing in for several ticks
+        hx, hy = self.heading
+        step = min(self.speed * step_scale, self.target_dist)
+        self.target_dist -= step
 
-        # Free movement (no collision)
-        self.rect.x += int(round(step_x))
-        self.rect.y += int(round(step_y))
+        mx, my = int(round(step * hx)), int(round(step * hy))
+        if tiles is not None:
+            self.rect, _, _ = tiles.move_and_collide(self.rect, mx, my)
+        else:
+            # Free movement (no collision)
+            self.rect.x += mx
+            self.rect.y += my
 
         self.rect.x = max(0, min(self.rect.x, self.map_width - self.size))
         self.rect.y = max(0, min(self.rect.y, self.map_height - self.size))
+        self._changed()
 
         # Animate based on intended direction to player (not just the slide)
-        walk_anim = "walk_right" if dx >= 0 else "walk_left"
+        walk_anim = "walk_right" if hx >= 0 else "walk_left"
         self._set_animation(walk_anim)
-        self.animate(loop=True)
+        # Off-screen enemies may skip the frame advance; death frames above
+        # always advance because respawn waits on them
+        if animate:
+            self.animate(loop=True)
 
     def kill_cleanup(self):
         self.respawn()
@@ -125,28 +162,76 @@ class Enemy:
                 self.frame_index = (self.frame_index + 1) % len(frames)
             else:
                 self.frame_index = min(self.frame_index + 1, len(frames) - 1)
+            self._changed()
 
-    def draw(self, screen, map_x, map_y):
+    def sprite(self, map_x, map_y):
+        """(frame, screen pos) to draw, or None without frames."""
         frames = self.animations.get(self.current_animation, [])
-        if not frames: return
+        if not frames: return None
         idx = min(self.frame_index, len(frames) - 1)
-        screen.blit(frames[idx], (self.rect.x + map_x, self.rect.y + map_y))
+        return frames[idx], (self.rect.x + map_x, self.rect.y + map_y)
+
+    def draw(self, screen, map_x, map_y):
+        sprite = self.sprite(map_x, map_y)
+        if sprite is not None:
+            screen.blit(*sprite)
 
 # --- BOSS CLASS ---
 class Boss(Enemy):
-    def __init__(self, map_width, map_height, sprite_root):
-        super().__init__(map_width, map_height, 96, sprite_root)
+    def __init__(self, map_width, map_height, sprite_root, spawner=None):
+        super().__init__(map_width, map_height, 96, sprite_root, spawner)
         self.max_hp = 50
+        self.lod_exempt = True
+        # Boss decisions (and future attack patterns) run every tick
+        self.think_every = 1
+        self.think_cost = 4
         self.respawn()
 
     def respawn(self):
-        self.rect.x = random.randint(0, self.map_width - self.size)
-        self.rect.y = random.randint(0, self.map_height - self.size)
+        self.place_randomly()
         self.max_hp = 50
         self.hp = self.max_hp
         self.damage = 2
         self.alive = True
         self.current_animation = "idle_right"
+        self.heading = None
+        self.target_dist = 0.0
+        self.think_pending = True
+        self.pattern_index = 0
+        self.attack_tick = -self.ATTACK_GRACE
+        self._changed()
     
     def kill_cleanup(self):
-        self.alive = False # Stay dead so LevelManager detects victory
\ No newline at end of file
+        self.alive = False # Stay dead so LevelManager detects victory
+
+    # -------------------- ATTACK PATTERNS --------------------
+    # (pattern, ticks it lasts); every pattern is followed by a short rest
+    PATTERNS = (("radial", 120), ("spiral", 180), ("aimed", 120))
+    PATTERN_REST = 60
+    ATTACK_GRACE = 90  # ticks after spawning before the first pattern
+
+    def attack(self, bullets, target, can_see=None):
+        """Advance the pattern clock one sim tick and fire into `bullets`.
+
+        target: player WORLD centre; can_see() gates aimed volleys on a
+        clear line of fire. Timing is in ticks only, so replays match.
+        """
+        self.attack_tick += 1
+        t = self.attack_tick
+        if t <= 0:
+            return
+        name, length = self.PATTERNS[self.pattern_index]
+        if t > length + self.PATTERN_REST:
+            self.pattern_index = (self.pattern_index + 1) % len(self.PATTERNS)
+            self.attack_tick = 0
+            return
+        if t > length:
+            return
+
+        x, y = self.rect.center
+        if name == "radial" and t % 30 == 1:
+            bullets.radial(x, y, 48, 3.0, offset_deg=(t // 30) * 3.75)
+        elif name == "spiral" and t % 3 == 0:
+            bullets.spiral(x, y, 4, t * 7.0, 4.0)
+        elif name == "aimed" and t % 20 == 1 and (can_see is None or can_see()):
+            bullets.aimed(x, y, target[0], target[1], 7, 40, 5.0)
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""Small synchronous publish/subscribe bus for gameplay events.
+
+    game.events.subscribe(ENEMY_KILLED, handler)
+    game.events.emit(ENEMY_KILLED, enemy=enemy, now_ms=now_ms)
+
+Handlers run immediately, in subscription order, with the keyword payload.
+"""
+
+# Event names and their payloads
+ENEMY_KILLED = "enemy_killed"        # enemy, now_ms
+ITEM_COLLECTED = "item_collected"    # kind, pos (world), by (player or guest), now_ms
+BOSS_SPAWNED = "boss_spawned"        # boss, now_ms
+BOSS_DIED = "boss_died"              # boss, now_ms
+LEVEL_STARTED = "level_started"      # level, now_ms
+PLAYER_DAMAGED = "player_damaged"    # player (or guest), amount, hp, now_ms
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers = {}
+
+    def subscribe(self, event: str, handler):
+        self._handlers.setdefault(event, []).append(handler)
+        return handler
+
+    def unsubscribe(self, event: str, handler):
+        handlers = self._handlers.get(event)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def emit(self, event: str, **payload):
+        # Copy so handlers may (un)subscribe while being called
+        for handler in tuple(self._handlers.get(event, ())):
+            handler(**payload)
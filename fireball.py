@@ -1,19 +1,25 @@
+import math
+
 import pygame
 
+import asset_pack
+import surface_memory
+
+AIM_STEPS = 32  # rotated sprite sets per variant (11.25 degrees apart)
+_frame_cache = {}  # (variant, aim step) -> [Surface]
+
+
+def _aim_step(vx, vy) -> int:
+    return round(math.degrees(math.atan2(vy, vx)) / (360 / AIM_STEPS)) % AIM_STEPS
+
+
 class Fireball(pygame.sprite.Sprite):
-    def __init__(self, x, y, direction, variant="normal"):
+    def __init__(self, x, y, direction, variant="normal", aim=None):
+        """direction: "left"/"right"; aim: optional (dx, dy) to fly along instead."""
         super().__init__()
         
         self.variant = variant
 
-        # Load base images
-        # Ensure these match your actual file paths
-        base_images = [
-            pygame.image.load("fire/0.png").convert_alpha(),
-            pygame.image.load("fire/1.png").convert_alpha(),
-            pygame.image.load("fire/2.png").convert_alpha()
-        ]
-
         # --- SETUP VARIANTS (Equivalent Exchange) ---
         if self.variant == "blood":
             # Blood Ammo: Big, Fast, Red, High Damage
@@ -30,8 +36,46 @@ class Fireball(pygame.sprite.Sprite):
             self.max_distance = 200
             tint_color = None
 
+        # Velocity vector (screen y points down)
+        if aim is not None and (aim[0] or aim[1]):
+            length = math.hypot(aim[0], aim[1])
+            self.vx = aim[0] / length * self.speed
+            self.vy = aim[1] / length * self.speed
+        else:
+            self.vx = self.speed if direction == "right" else -self.speed
+            self.vy = 0.0
+        direction = "left" if self.vx < 0 else "right"
+
+        # Frames are shared by every fireball with the same variant and aim step
+        step = self.aim_step = _aim_step(self.vx, self.vy)
+        images = _frame_cache.get((variant, step))
+        if images is None:
+            images = _frame_cache[(variant, step)] = self._build_frames(FIRE_SIZE, tint_color, direction, step)
+        self.images = images
+
+        self.frame = 0
+        self.image = self.images[self.frame]
+        # Hitbox stays FIRE_SIZE square; rotated frames are bigger and only
+        # centred on it when drawn (see sprite())
+        self.rect = pygame.Rect(0, 0, FIRE_SIZE, FIRE_SIZE)
+        self.rect.center = (x, y)
+        self.pos_x, self.pos_y = float(x), float(y)
+
+        self.direction = direction
+        self.travel = 0
+        self.anim_timer = 0
+
+    def _build_frames(self, FIRE_SIZE, tint_color, direction, step):
+        # Load base images
+        # Ensure these match your actual file paths
+        base_images = [
+            asset_pack.load_image("fire/0.png").convert_alpha(),
+            asset_pack.load_image("fire/1.png").convert_alpha(),
+            asset_pack.load_image("fire/2.png").convert_alpha()
+        ]
+
         # Process images (Scale & Tint)
-        self.images = []
+        images = []
         for img in base_images:
             scaled = pygame.transform.scale(img, (FIRE_SIZE, FIRE_SIZE))
             if tint_color:
@@ -39,28 +83,39 @@ class Fireball(pygame.sprite.Sprite):
                 tinted = scaled.copy()
                 # BLEND_RGBA_MULT multiplies the colors (Red * White = Red)
                 tinted.fill(tint_color, special_flags=pygame.BLEND_RGBA_MULT)
-                self.images.append(tinted)
+                images.append(tinted)
             else:
-                self.images.append(scaled)
+                images.append(scaled)
 
-        # Flip if facing left
+        # Flip if facing left, then tilt towards the aim (upright either way)
+        angle = step * 360 / AIM_STEPS
         if direction == "left":
-            self.images = [pygame.transform.flip(img, True, False) for img in self.images]
-
-        self.frame = 0
-        self.image = self.images[self.frame]
-        self.rect = self.image.get_rect(center=(x, y))
+            images = [pygame.transform.flip(img, True, False) for img in images]
+            angle -= 180
+        if angle % 360:
+            images = [pygame.transform.rotate(img, -angle) for img in images]
+        for i, img in enumerate(images):
+            surface_memory.track(img, "Fireball", f"fire/{i}.png {self.variant} aim {step}")
+        return images
 
-        self.direction = direction
-        self.travel = 0
-        self.anim_timer = 0
+    def sprite(self, map_x, map_y):
+        """(frame, screen pos) with the frame centred on the hitbox."""
+        return self.image, (self.rect.centerx + map_x - self.image.get_width() // 2,
+                            self.rect.centery + map_y - self.image.get_height() // 2)
 
-    def update(self):
-        # Move
-        if self.direction == "right":
-            self.rect.x += self.speed
+    def update(self, tiles=None):
+        # Move (optionally stopped by walls via tile_collision.TileMap)
+        self.pos_x += self.vx
+        self.pos_y += self.vy
+        dx = round(self.pos_x) - self.rect.centerx
+        dy = round(self.pos_y) - self.rect.centery
+        if tiles is not None:
+            self.rect, hit_x, hit_y = tiles.move_and_collide(self.rect, dx, dy)
+            if hit_x or hit_y:
+                self.kill()
+                return
         else:
-            self.rect.x -= self.speed
+            self.rect.move_ip(dx, dy)
 
         self.travel += self.speed
         if self.travel >= self.max_distance:
@@ -1,13 +1,30 @@
 import pygame
 import random
 import os
+import numpy as np
 
+import asset_pack
 from collision import collision
 from player import Player
-from enemy import Enemy, Boss
+from enemy import Enemy
 from fireball import Fireball
+from input_source import InputAction, InputSource, KeyboardMouseInput
 from drop_item import DropItem
 from level_manager import LevelManager  # --- IMPORT ---
+from event_bus import (EventBus, ENEMY_KILLED, ITEM_COLLECTED, BOSS_SPAWNED, BOSS_DIED,
+                       LEVEL_STARTED, PLAYER_DAMAGED)
+from tile_collision import TileMap
+from spawn_index import SpawnIndex
+from quality import QualityGovernor
+import surface_memory
+import alloc_tracker
+from ai_scheduler import AIScheduler
+from particles import ParticleSystem
+from minimap import Minimap
+from visibility import FieldOfView
+from line_of_sight import LineOfSight
+from spatial_grid import SpatialGrid
+from bullets import BulletSystem
 
 class Game:
     def __init__(
@@ -21,8 +38,22 @@ class Game:
         player_hp: int = 10,
         enemy_count: int = 5,
         damage_to_enemy: int = 1,
+        auto_aim: bool = False,
+        get_ticks=pygame.time.get_ticks,
+        input_source: InputSource | None = None,
     ):
         self.screen = screen
+
+        # Source clock; headless runs pass a virtual clock so they can step
+        # faster than real time. get_ticks() is the game clock: the source
+        # minus time spent paused
+        self._clock = get_ticks
+        self.paused_ms = 0
+        self._paused_at = None
+        self.start_time_ms = self.get_ticks()
+
+        # Where per-tick player actions come from (keyboard, replay, bot)
+        self.input_source = input_source if input_source is not None else KeyboardMouseInput()
         self.SCREEN_WIDTH = screen_width
         self.SCREEN_HEIGHT = screen_height
 
@@ -33,6 +64,17 @@ class Game:
         self.damage_to_enemy = int(damage_to_enemy)
 
         # --- NEW: Level Manager ---
+        # Gameplay events: missions, HUD, audio and telemetry subscribe instead
+        # of scanning state every frame. Game's handlers go first so the boss
+        # drop happens before LevelManager swaps in the next level.
+        self.events = EventBus()
+        self.boss = None  # active Boss, kept by BOSS_SPAWNED / BOSS_DIED
+        self.events.subscribe(ENEMY_KILLED, self._on_enemy_killed)
+        self.events.subscribe(ITEM_COLLECTED, self._on_item_collected)
+        self.events.subscribe(BOSS_SPAWNED, self._on_boss_spawned)
+        self.events.subscribe(BOSS_DIED, self._on_boss_died)
+        self.events.subscribe(LEVEL_STARTED, self._on_level_started)
+
         self.level = 1
         self.level_manager = LevelManager(self)
         # --------------------------
@@ -44,9 +86,19 @@ class Game:
         self.MAP_TILES_X, self.MAP_TILES_Y = 65, 42
         self.MAP_WIDTH = self.MAP_TILES_X * self.SCALED_TILE_SIZE
         self.MAP_HEIGHT = self.MAP_TILES_Y * self.SCALED_TILE_SIZE
-        self.map_img = pygame.image.load("map1.png").convert()
+        self.map_img = asset_pack.load_image("map1.png").convert()
         self.map_img = pygame.transform.scale(self.map_img, (self.MAP_WIDTH, self.MAP_HEIGHT))
+        surface_memory.track(self.map_img, "Game", "map1.png")
         self.map_x, self.map_y = 0, 0
+        self.tiles = TileMap(collision, self.SCALED_TILE_SIZE)
+        # Player always collides with walls; enemies/projectiles are opt-in
+        self.ENEMY_WALL_COLLISION = False
+        self.PROJECTILE_WALL_COLLISION = False
+
+        # Spawns: walkable, off screen, within this band of the player (world px)
+        self.SPAWN_MIN_DIST = 400
+        self.SPAWN_MAX_DIST = 1000
+        self.spawn_indexes = {}  # footprint in tiles -> SpawnIndex
 
         # Entities
         self.PLAYER_SIZE = 32
@@ -55,7 +107,8 @@ class Game:
         self.player.max_hp = self.starting_hp
         self.player.hp = self.starting_hp
         
-        self.enemy_list = [Enemy(self.MAP_WIDTH, self.MAP_HEIGHT, self.ENEMY_SIZE, "Scarab") for _ in range(self.enemy_count)]
+        self.enemy_list = [Enemy(self.MAP_WIDTH, self.MAP_HEIGHT, self.ENEMY_SIZE, "Scarab", self.spawn_point)
+                           for _ in range(self.enemy_count)]
 
         # State
         self.DAMAGE_COOLDOWN_MS = 500
@@ -74,14 +127,16 @@ class Game:
         self.number_images = {}
         for d in range(10):
             path = os.path.join("numbers", f"{d}.png")
-            if os.path.exists(path):
-                img = pygame.image.load(path).convert_alpha()
-                self.number_images[str(d)] = pygame.transform.scale(img, (18, 24))
+            if asset_pack.exists(path):
+                img = asset_pack.load_image(path).convert_alpha()
+                self.number_images[str(d)] = surface_memory.track(
+                    pygame.transform.scale(img, (18, 24)), "Game", path)
 
         self.item0_icon = None
-        if os.path.exists(os.path.join("drop", "item0.png")):
-            self.item0_icon = pygame.image.load(os.path.join("drop", "item0.png")).convert_alpha()
+        if asset_pack.exists(os.path.join("drop", "item0.png")):
+            self.item0_icon = asset_pack.load_image(os.path.join("drop", "item0.png")).convert_alpha()
             self.item0_icon = pygame.transform.scale(self.item0_icon, (18, 18))
+            surface_memory.track(self.item0_icon, "Game", "drop/item0.png")
 
         self.ui_font = pygame.font.Font(None, 28)
         self.game_over_font = pygame.font.Font(None, 80)
@@ -95,33 +150,40 @@ class Game:
 
         self.MUZZLE_Y = -4
         self.MUZZLE_X_PAD = 6
-        self._prev_mouse_down = False
         
         self.auto_fire_enabled = True
         self.auto_fire_interval_ms = 175
         self.next_auto_fire_time = 0
 
+        # Aiming: auto-target the nearest enemy in range, else the last mouse
+        # aim point, else straight along facing
+        self.AUTO_AIM = bool(auto_aim)
+        self.AUTO_AIM_RANGE = 320
+        self.aim_world = None
+        self.enemy_grid = SpatialGrid(cell_size=128)
+        self._enemy_grid_tick = None
+
         self.last_blood_shot_time = -15000
         self.BLOOD_SHOT_COOLDOWN = 15000
         self.shadow_clone = None
         self.shadow_clone_spawn_time = 0
         self.SHADOW_CLONE_LIFETIME_MS = 8000  # clone lasts 8 seconds
 
-        # Survival time
-        self.start_time_ms = pygame.time.get_ticks()
+        # Survival time (clock started at the top of __init__)
         self.survival_time_ms = 0
 
         # Upper layer (drawn above player)
         self.upper_img = None
-        if os.path.exists("upper.png"):
-            self.upper_img = pygame.image.load("upper.png").convert_alpha()
+        if asset_pack.exists("upper.png"):
+            self.upper_img = asset_pack.load_image("upper.png").convert_alpha()
             self.upper_img = pygame.transform.scale(self.upper_img, (self.MAP_WIDTH, self.MAP_HEIGHT))
+            surface_memory.track(self.upper_img, "Game", "upper.png")
 
         # SFX
         self.enemy_die_sfx = None
         try:
-            if os.path.exists("enemyDie.mp3"):
-                self.enemy_die_sfx = pygame.mixer.Sound("enemyDie.mp3")
+            if asset_pack.exists("enemyDie.mp3"):
+                self.enemy_die_sfx = asset_pack.load_sound("enemyDie.mp3")
                 self.enemy_die_sfx.set_volume(0.5)
         except Exception:
             self.enemy_die_sfx = None
@@ -131,8 +193,8 @@ class Game:
             # supports either mp3 or wav; expects a file named fireballshoot.*
             for ext in ("mp3", "wav", "ogg"):
                 p = f"fireballshoot.{ext}"
-                if os.path.exists(p):
-                    self.fireball_shoot_sfx = pygame.mixer.Sound(p)
+                if asset_pack.exists(p):
+                    self.fireball_shoot_sfx = asset_pack.load_sound(p)
                     self.fireball_shoot_sfx.set_volume(0.05)
                     break
         except Exception:
@@ -146,9 +208,47 @@ class Game:
         self.mission_font = pygame.font.SysFont("Arial", 26, bold=True)
         self.congrats_font = pygame.font.SysFont("Arial", 72, bold=True)
 
+        # --- Enemy level of detail ---
+        self.sim_tick = 0
+        self.LOD_NEAR, self.LOD_MID, self.LOD_FAR = 0, 1, 2
+        self.LOD_INTERVALS = {self.LOD_MID: 2, self.LOD_FAR: 4}
+        self.LOD_FAR_DISTANCE = 1200  # world px from the player
+
+        # --- Time-sliced enemy AI (think round-robin, integrate every tick) ---
+        self.ai_scheduler = AIScheduler()
+
+        # --- Adaptive quality (fed frame times by main.py) ---
+        self.quality = QualityGovernor()
+        self._last_sfx_ms = {}
+        self.HUD_KEY = (1, 1, 1)
+        self._hud_cache = None
+        self._hud_frame = 0
+
+        # --- Particles (presentation only, own RNG) ---
+        self.particles = ParticleSystem()
+
+        # --- Minimap (bottom-right, baked from the collision grid) ---
+        self.minimap = Minimap(collision, self.SCALED_TILE_SIZE)
+
+        # --- Fog of war (shadowcast from the player's tile) ---
+        # FOG_AGGRO: enemies only re-aim while their tile is in view
+        self.FOG_OF_WAR = True
+        self.FOG_AGGRO = False
+        self.fov = FieldOfView(self.tiles)
+
+        # --- Line of sight to the player (memoised per sim tick) ---
+        self.los = LineOfSight(self.tiles)
+
+        # --- Boss bullets (array-backed, never sprites) ---
+        self.bullets = BulletSystem(tiles=self.tiles)
+        self.next_bullet_damage_time = 0
+
     def reset(self):
         self.map_x, self.map_y = 0, 0
         self.level = 1
+        self.start_time_ms = self.get_ticks()
+        self.sim_tick = 0
+        self.boss = None
         self.level_manager.reset()
         
         self.player = Player(self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT // 2, self.PLAYER_SIZE, self.player_class)
@@ -157,20 +257,26 @@ class Game:
         self.shadow_clone = None 
         self.shadow_clone_spawn_time = 0
 
-        self.enemy_list = [Enemy(self.MAP_WIDTH, self.MAP_HEIGHT, self.PLAYER_SIZE, "Scarab") for _ in range(self.enemy_count)]
+        self.enemy_list = [Enemy(self.MAP_WIDTH, self.MAP_HEIGHT, self.PLAYER_SIZE, "Scarab", self.spawn_point)
+                           for _ in range(self.enemy_count)]
         self.kills = 0
         self.item0_count = 0
         self.next_touch_damage_time = 0
         self.is_touching_enemy = False
         self.GAME_OVER = False
-        self.PAUSED = False
+        self.set_paused(False)
         self.return_to_menu = False
         self.fire_group.empty()
         self.item_group.empty()
+        self.aim_world = None
+        self._enemy_grid_tick = None
+        self.bullets.clear()
+        self.next_bullet_damage_time = 0
+        self.particles.clear()
+        self.fov = FieldOfView(self.tiles)
         self.last_blood_shot_time = -self.BLOOD_SHOT_COOLDOWN
 
         # Survival time
-        self.start_time_ms = pygame.time.get_ticks()
         self.survival_time_ms = 0
 
         # --- Mission system ---
@@ -262,6 +368,35 @@ class Game:
         if random.random() < 0.20: self.item_group.add(DropItem("item0", world_x, world_y))
         if random.random() < 0.50: self.item_group.add(DropItem("item1", world_x, world_y))
 
+    # -------------------- EVENT HANDLERS --------------------
+    def _on_enemy_killed(self, enemy, now_ms):
+        self.particles.death_burst(*enemy.rect.center)
+        self.play_sfx(self.enemy_die_sfx, now_ms)
+        self.kills += 1
+        self.maybe_spawn_drop(enemy.rect.centerx, enemy.rect.centery)
+
+    def _on_boss_spawned(self, boss, now_ms):
+        self.boss = boss
+
+    def _on_boss_died(self, boss, now_ms):
+        self.particles.death_burst(*boss.rect.center, big=True)
+        # Guarantee: boss always drops 1x item0
+        try:
+            self.item_group.add(DropItem("item0", boss.rect.centerx, boss.rect.centery))
+        except Exception:
+            pass
+        self.bullets.clear()
+        self.boss = None
+
+    def _on_item_collected(self, kind, pos, by, now_ms):
+        self.particles.pickup_flash(*pos)
+        if kind == "item0":
+            self.item0_count += 1
+            self._check_mission_complete(now_ms)
+
+    def _on_level_started(self, level, now_ms):
+        self._check_mission_complete(now_ms)
+
     def apply_touch_damage(self, now_ms: int):
         player_world_rect = self.get_player_world_rect()
         touching = any(enemy.alive and enemy.rect.colliderect(player_world_rect) for enemy in self.enemy_list)
@@ -272,16 +407,24 @@ class Game:
             if now_ms >= self.next_touch_damage_time:
                 self.player.hp = max(0, self.player.hp - 1)
                 self.next_touch_damage_time = now_ms + self.DAMAGE_COOLDOWN_MS
+                self.events.emit(PLAYER_DAMAGED, player=self.player, amount=1, hp=self.player.hp, now_ms=now_ms)
         else:
             self.is_touching_enemy = False
 
-    def collect_items(self):
+    def apply_bullet_damage(self, now_ms: int):
+        # Every touching bullet is used up, but hits share one damage cooldown
+        if self.bullets.hit_rect(self.get_player_world_rect()) and now_ms >= self.next_bullet_damage_time:
+            self.player.hp = max(0, self.player.hp - 1)
+            self.next_bullet_damage_time = now_ms + self.DAMAGE_COOLDOWN_MS
+            self.events.emit(PLAYER_DAMAGED, player=self.player, amount=1, hp=self.player.hp, now_ms=now_ms)
+
+    def collect_items(self, now_ms: int):
         player_world_rect = self.get_player_world_rect()
         for item in list(self.item_group):
             if item.rect.colliderect(player_world_rect):
                 if item.kind == "item1": self.player.hp = min(self.player.max_hp, self.player.hp + 1)
-                elif item.kind == "item0": self.item0_count += 1
                 item.kill()
+                self.events.emit(ITEM_COLLECTED, kind=item.kind, pos=item.rect.center, by=self.player, now_ms=now_ms)
 
     def get_muzzle_world_pos(self, target_player=None):
         p = target_player if target_player else self.player
@@ -292,14 +435,44 @@ class Game:
         fy = muzzle_screen_y - self.map_y
         return fx, fy
 
-    def can_move(self, dx, dy) -> bool:
-        new_x = self.player.rect.centerx - self.map_x + dx
-        new_y = self.player.rect.centery - self.map_y + dy
-        tile_x = int(new_x // self.SCALED_TILE_SIZE)
-        tile_y = int(new_y // self.SCALED_TILE_SIZE)
-        if tile_x < 0 or tile_x >= self.MAP_TILES_X or tile_y < 0 or tile_y >= self.MAP_TILES_Y: return False
-        try: return collision[tile_y][tile_x] != 1
-        except IndexError: return False
+    def nearest_enemy(self, x, y, max_dist):
+        """Closest living enemy to WORLD (x, y) within max_dist, or None."""
+        if self._enemy_grid_tick != self.sim_tick:
+            # Rebuilt at most once per tick, and only on ticks that query it
+            self.enemy_grid.rebuild((e.rect.centerx, e.rect.centery, e) for e in self.enemy_list if e.alive)
+            self._enemy_grid_tick = self.sim_tick
+        return self.enemy_grid.nearest(x, y, max_dist)
+
+    def aim_from(self, fx, fy):
+        """Direction (dx, dy) for a shot from WORLD (fx, fy), or None to use facing."""
+        return self.aim_towards(fx, fy, self.aim_world)
+
+    def aim_towards(self, fx, fy, aim_world):
+        """aim_from() for any shooter: auto-aim first, then the WORLD point aim_world."""
+        if self.AUTO_AIM:
+            target = self.nearest_enemy(fx, fy, self.AUTO_AIM_RANGE)
+            if target is not None:
+                return target.rect.centerx - fx, target.rect.centery - fy
+        if aim_world is not None:
+            return aim_world[0] - fx, aim_world[1] - fy
+        return None
+
+    def move_player(self, dx, dy):
+        """Sweep the player's full rect; the camera follows what's left."""
+        world = self.get_player_world_rect()
+        moved, _, _ = self.tiles.move_and_collide(world, dx, dy)
+        self.map_x -= moved.x - world.x
+        self.map_y -= moved.y - world.y
+
+    def spawn_point(self, size: int):
+        """World top-left for a `size` px entity: on a walkable tile, off
+        screen, SPAWN_MIN_DIST..SPAWN_MAX_DIST from the player."""
+        footprint = -(-size // self.SCALED_TILE_SIZE)
+        index = self.spawn_indexes.get(footprint)
+        if index is None:
+            index = self.spawn_indexes[footprint] = SpawnIndex(self.tiles, footprint)
+        return index.sample(self.get_view_world_rect(), self.get_player_world_rect().center,
+                            self.SPAWN_MIN_DIST, self.SPAWN_MAX_DIST)
 
     def draw_health_bar(self):
         bar_w, bar_h, pad = 160, 16, 12
@@ -331,9 +504,6 @@ class Game:
                 digits_x += img.get_width() + 2
 
         # Survival time (top center under level)
-        now_ms = pygame.time.get_ticks()
-        if not self.GAME_OVER:
-            self.survival_time_ms = max(0, now_ms - self.start_time_ms)
         secs = self.survival_time_ms // 1000
         time_surf = self.ui_font.render(f"TIME: {secs}s", True, (200, 255, 255))
         tx = self.SCREEN_WIDTH // 2 - time_surf.get_width() // 2
@@ -351,7 +521,7 @@ class Game:
 
     def draw_ability_ui(self):
         center_x = self.SCREEN_WIDTH // 2
-        now = pygame.time.get_ticks()
+        now = self.get_ticks()
         time_since_shot = now - self.last_blood_shot_time
         remaining = self.BLOOD_SHOT_COOLDOWN - time_since_shot
         y_pos = self.SCREEN_HEIGHT - 40
@@ -383,6 +553,37 @@ class Game:
         pygame.draw.rect(self.screen, (0, 0, 0, 150), c_bg)
         self.screen.blit(c_surf, (center_x - c_surf.get_width()//2, y_pos - 40 - c_surf.get_height()//2))
 
+    def _draw_hud_widgets(self):
+        self.draw_health_bar()
+        self.draw_kill_count()
+        self.draw_item0_count()
+        self.draw_ability_ui()
+        self.draw_mission_ui()
+
+    def draw_hud(self):
+        every = self.quality.hud_every
+        if every == 1:
+            self._draw_hud_widgets()
+            return
+
+        # Reduced refresh: render into a colorkeyed layer every `every` frames
+        # and blit the cached layer in between
+        if self._hud_cache is None:
+            self._hud_cache = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT)).convert()
+            self._hud_cache.set_colorkey(self.HUD_KEY)
+            surface_memory.track(self._hud_cache, "Game", "hud cache")
+            self._hud_frame = 0
+        if self._hud_frame % every == 0:
+            self._hud_cache.fill(self.HUD_KEY)
+            screen = self.screen
+            self.screen = self._hud_cache
+            try:
+                self._draw_hud_widgets()
+            finally:
+                self.screen = screen
+        self._hud_frame += 1
+        self.screen.blit(self._hud_cache, (0, 0))
+
     def draw_game_over_overlay(self):
         overlay = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
@@ -424,50 +625,70 @@ class Game:
                 if event.key == pygame.K_RETURN: self.reset()
                 elif event.key == pygame.K_ESCAPE: self.return_to_menu = True
                 return
-            if event.key == pygame.K_ESCAPE: self.PAUSED = not self.PAUSED
+            if event.key == pygame.K_ESCAPE: self.set_paused(not self.PAUSED)
             if self.PAUSED and event.key == pygame.K_q: self.return_to_menu = True
 
-    def _mouse_click_edge(self) -> bool:
-        now_down = pygame.mouse.get_pressed()[0]
-        clicked = now_down and not self._prev_mouse_down
-        self._prev_mouse_down = now_down
-        return clicked
+    # -------------------- CLOCK --------------------
+    def get_ticks(self) -> int:
+        """Game clock in ms; stands still while paused."""
+        if self._paused_at is not None:
+            return self._paused_at - self.paused_ms
+        return self._clock() - self.paused_ms
 
-    def update(self, keys, now_ms: int, mouse_pos):
-        if self.GAME_OVER or self.PAUSED: return
+    def set_paused(self, paused: bool):
+        """Pause/resume, keeping cooldowns, the boss timer and survival time frozen."""
+        if paused == self.PAUSED:
+            return
+        self.PAUSED = paused
+        if paused:
+            self._paused_at = self._clock()
+        elif self._paused_at is not None:
+            self.paused_ms += self._clock() - self._paused_at
+            self._paused_at = None
+
+    @property
+    def idle(self) -> bool:
+        """The pause, game over and mission screens only change on input."""
+        return self.PAUSED or self.GAME_OVER or self.mission_completed
+
+    def update(self, now_ms: int, action: InputAction | None = None):
+        """Step one tick; `now_ms` is on the source clock passed to __init__."""
+        if self.idle: return
+        now_ms -= self.paused_ms
+
+        if action is None:
+            action = self.input_source.poll(self, now_ms)
+
+        self.survival_time_ms = max(0, now_ms - self.start_time_ms)
+        self.sim_tick += 1
+        self.los.begin_tick(self.sim_tick)
 
         # --- MANAGER CHECK ---
-        self.level_manager.check_boss_spawn()
-
-        # Facing
-        if self._mouse_click_edge():
-            if mouse_pos[0] < self.player.rect.centerx: self.player.facing = "left"
-            else: self.player.facing = "right"
-
-        moving = False
-        dx, dy = 0, 0
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            dx = -self.player_speed; moving = True; self.player.facing = "left"
-        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            dx = self.player_speed; moving = True; self.player.facing = "right"
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            dy = -self.player_speed; moving = True
-        elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            dy = self.player_speed; moving = True
-
-        if self.can_move(dx, 0): self.map_x -= dx
-        if self.can_move(0, dy): self.map_y -= dy
+        alloc_tracker.mark("player")
+        self.level_manager.check_boss_spawn(now_ms)
+
+        # Facing / aim
+        if action.facing is not None:
+            self.player.facing = action.facing
+        if action.aim_x is not None and action.aim_y is not None:
+            self.aim_world = (action.aim_x, action.aim_y)
+
+        dx = action.move_x * self.player_speed
+        dy = action.move_y * self.player_speed
+        moving = dx != 0 or dy != 0
+        if dx < 0: self.player.facing = "left"
+        elif dx > 0: self.player.facing = "right"
+
+        self.move_player(dx, dy)
 
         self.player.update(moving, self.player.facing)
 
         # Clone Activation
-        if keys[pygame.K_c] and self.shadow_clone is None:
+        if action.clone and self.shadow_clone is None:
             if self.player.hp > 1:
                 self.player.hp = max(1, self.player.hp // 2)
-                self.shadow_clone = Player(self.player.rect.x, self.player.rect.y, self.PLAYER_SIZE, self.player_class)
+                self.shadow_clone = Player(self.player.rect.x, self.player.rect.y, self.PLAYER_SIZE, self.player_class, alpha=150)
                 self.shadow_clone_spawn_time = now_ms
-                for anim_name, frames in self.shadow_clone.animations.items():
-                    for img in frames: img.set_alpha(150)
 
         # Timed clone vanish
         if self.shadow_clone is not None and (now_ms - self.shadow_clone_spawn_time) >= self.SHADOW_CLONE_LIFETIME_MS:
@@ -484,34 +705,33 @@ class Game:
             self.shadow_clone.facing = self.player.facing
 
         # Blood Shot
-        mouse_buttons = pygame.mouse.get_pressed()
-        if mouse_buttons[2]:
+        if action.blood_shot:
             if self.player.hp > 1 and now_ms >= self.last_blood_shot_time + self.BLOOD_SHOT_COOLDOWN:
                 self.player.hp -= 1
                 fx, fy = self.get_muzzle_world_pos()
-                blood_fire = Fireball(fx, fy, self.player.facing, variant="blood")
+                blood_fire = Fireball(fx, fy, self.player.facing, variant="blood", aim=self.aim_from(fx, fy))
                 self.fire_group.add(blood_fire)
                 self.last_blood_shot_time = now_ms
 
         # Fire
         if self.auto_fire_enabled and now_ms >= self.next_auto_fire_time:
             fx, fy = self.get_muzzle_world_pos()
-            fireball = Fireball(fx, fy, self.player.facing)
+            fireball = Fireball(fx, fy, self.player.facing, aim=self.aim_from(fx, fy))
             self.fire_group.add(fireball)
 
             # Shoot SFX (once per fire interval)
-            if self.fireball_shoot_sfx is not None:
-                try:
-                    self.fireball_shoot_sfx.play()
-                except Exception:
-                    pass
+            self.play_sfx(self.fireball_shoot_sfx, now_ms)
 
             if self.shadow_clone:
                 cx, cy = self.get_muzzle_world_pos(self.shadow_clone)
-                c_fireball = Fireball(cx, cy, self.shadow_clone.facing)
+                c_fireball = Fireball(cx, cy, self.shadow_clone.facing, aim=self.aim_from(cx, cy))
                 self.fire_group.add(c_fireball)
             self.next_auto_fire_time = now_ms + self.auto_fire_interval_ms
-        self.fire_group.update()
+        alloc_tracker.mark("projectiles")
+        self.fire_group.update(self.tiles if self.PROJECTILE_WALL_COLLISION else None)
+        for fire in self.fire_group:
+            if fire.variant == "blood":
+                self.particles.blood_trail(*fire.rect.center, fire.vx, fire.vy)
 
         # Collisions
         for fire in list(self.fire_group):
@@ -523,83 +743,180 @@ class Game:
                     for _ in range(dmg):
                         enemy.hit()
                         if not enemy.alive: break
+                    self.particles.hit_sparks(*fire.rect.center)
                     fire.kill()
                     if not enemy.alive:
-                        # Check Boss Death via Manager
-                        if isinstance(enemy, Boss):
-                            # Guarantee: boss always drops 1x item0
-                            try:
-                                self.item_group.add(DropItem("item0", enemy.rect.centerx, enemy.rect.centery))
-                            except Exception:
-                                pass
-                            self.level_manager.handle_boss_death()
+                        if enemy is self.boss:
+                            self.events.emit(BOSS_DIED, boss=enemy, now_ms=now_ms)
                         else:
-                            # Enemy died (play SFX)
-                            if self.enemy_die_sfx is not None:
-                                try:
-                                    self.enemy_die_sfx.play()
-                                except Exception:
-                                    pass
-
-                            self.kills += 1
-                            self.maybe_spawn_drop(enemy.rect.centerx, enemy.rect.centery)
+                            self.events.emit(ENEMY_KILLED, enemy=enemy, now_ms=now_ms)
                     break
 
-        for enemy in self.enemy_list:
-            enemy.update(self.player.rect, self.map_x, self.map_y)
-
+        alloc_tracker.mark("enemies")
+        if self.FOG_OF_WAR or self.FOG_AGGRO:
+            self.fov.update(*self.get_player_world_rect().center)
+        self.update_enemies()
+        boss = self.boss
+        if boss is not None and boss.alive:
+            boss.attack(self.bullets, self.get_player_world_rect().center, lambda: self.has_clear_shot(boss))
+        self.bullets.update(walls=self.PROJECTILE_WALL_COLLISION)
+        self.particles.update()
+
+        alloc_tracker.mark("contacts")
         self.apply_touch_damage(now_ms)
-        self.collect_items()
+        self.apply_bullet_damage(now_ms)
+        self.collect_items(now_ms)
 
-        # Mission check after collecting / leveling / time updates
-        self._check_mission_complete(now_ms)
+        # Item and level missions are checked by their events; only the
+        # survival mission depends on the clock
+        if self.mission_type == "survive":
+            self._check_mission_complete(now_ms)
 
         if self.player.hp <= 0:
             self.GAME_OVER = True
             # Freeze final time
             self.survival_time_ms = max(0, now_ms - self.start_time_ms)
 
-    def draw(self):
-        self.screen.fill((0, 0, 0))
-        self.screen.blit(self.map_img, (self.map_x, self.map_y))
-        
-        for enemy in self.enemy_list: enemy.draw(self.screen, self.map_x, self.map_y)
-        for item in self.item_group: item.draw(self.screen, self.map_x, self.map_y)
-        
-        self.player.draw(self.screen)
-        if self.shadow_clone: self.shadow_clone.draw(self.screen)
-        
-        # Draw upper layer AFTER entities so it appears above the player
-        if self.upper_img is not None:
-            self.screen.blit(self.upper_img, (self.map_x, self.map_y))
-        
-        for fire in self.fire_group:
-            self.screen.blit(fire.image, (fire.rect.x + self.map_x, fire.rect.y + self.map_y))
+    def play_sfx(self, sound, now_ms: int):
+        if sound is None:
+            return
+        min_gap = self.quality.sfx_min_interval_ms
+        if min_gap and now_ms - self._last_sfx_ms.get(sound, -min_gap) < min_gap:
+            return
+        self._last_sfx_ms[sound] = now_ms
+        try:
+            sound.play()
+        except Exception:
+            pass
+
+    def get_view_world_rect(self, margin: int = 0) -> pygame.Rect:
+        view = pygame.Rect(-self.map_x, -self.map_y, self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+        return view.inflate(margin * 2, margin * 2)
+
+    def enemy_lod(self, enemy, view: pygame.Rect, px: int, py: int) -> int:
+        if enemy.lod_exempt or not enemy.alive or view.colliderect(enemy.rect):
+            return self.LOD_NEAR
+        dx = enemy.rect.centerx - px
+        dy = enemy.rect.centery - py
+        if dx * dx + dy * dy > self.LOD_FAR_DISTANCE * self.LOD_FAR_DISTANCE:
+            return self.LOD_FAR
+        return self.LOD_MID
+
+    def update_enemies(self):
+        # Level of detail: full fidelity on screen; off screen no animation
+        # and steering every N ticks with N-sized steps. The schedule only
+        # depends on the tick counter and list position, so replays match.
+        view = self.get_view_world_rect(margin=self.ENEMY_SIZE)
+        px = self.player.rect.centerx - self.map_x
+        py = self.player.rect.centery - self.map_y
+        # The quality governor may only thin animation (visual), never the
+        # simulation schedule, since it reacts to real frame times
+        animate = self.sim_tick % self.quality.animate_every == 0
+        tiles = self.tiles if self.ENEMY_WALL_COLLISION else None
+        near = []
+        for i, enemy in enumerate(self.enemy_list):
+            lod = self.enemy_lod(enemy, view, px, py)
+            if lod == self.LOD_NEAR:
+                near.append((i, enemy))
+                continue
+            interval = self.LOD_INTERVALS[lod]
+            if (self.sim_tick + i) % interval == 0:
+                enemy.update(*self.enemy_target(enemy), animate=False,
+                             step_scale=interval, tiles=tiles)
+
+        # Near enemies re-aim on their round-robin slot (within the think
+        # budget) but move along their last heading every tick
+        self.ai_scheduler.run(self.sim_tick, near, self.think_enemy)
+        for _, enemy in near:
+            enemy.integrate(animate=animate, tiles=tiles)
+
+    def has_clear_shot(self, enemy) -> bool:
+        """True if no wall tile lies between `enemy` and the player."""
+        return self.los.clear(*enemy.rect.center, *self.get_player_world_rect().center)
+
+    def enemies_with_clear_shot(self, enemies=None) -> np.ndarray:
+        """Bulk has_clear_shot() over `enemies` (default enemy_list), as a bool array."""
+        enemies = self.enemy_list if enemies is None else enemies
+        xs = np.fromiter([e.rect.centerx for e in enemies], np.int64, len(enemies))
+        ys = np.fromiter([e.rect.centery for e in enemies], np.int64, len(enemies))
+        return self.los.bulk(xs, ys, *self.get_player_world_rect().center)
+
+    def enemy_target(self, enemy):
+        """(rect, map_x, map_y) that `enemy` chases; co-op picks the closest player."""
+        return self.player.rect, self.map_x, self.map_y
+
+    def think_enemy(self, enemy):
+        if self.FOG_AGGRO and not self.fov.is_visible_world(*enemy.rect.center):
+            return  # out of sight: keep walking the last heading
+        enemy.think(*self.enemy_target(enemy))
+
+    def enemy_in_view(self, enemy) -> bool:
+        return not self.FOG_OF_WAR or self.fov.is_visible_world(*enemy.rect.center)
+
+    def world_blits(self):
+        """(surface, screen pos) pairs for everything under the HUD, in paint order.
+
+        draw() hands them to Surface.blits(); render_backend.TextureBackend
+        draws the same list as textures.
+        """
+        if self.FOG_OF_WAR:
+            self.fov.update(*self.get_player_world_rect().center)
+        mx, my = self.map_x, self.map_y
+        blits = [(self.map_img, (mx, my))]
 
-        # Boss health bar (only when boss is alive)
         for enemy in self.enemy_list:
-            if isinstance(enemy, Boss) and enemy.alive:
-                bar_w = 140
-                bar_h = 12
-                x = enemy.rect.centerx + self.map_x - bar_w // 2
-                y = enemy.rect.y + self.map_y - 18
-
-                max_hp = max(1, int(getattr(enemy, "max_hp", enemy.hp)))
-                hp = max(0, int(enemy.hp))
-                fill_w = int(bar_w * (hp / max_hp))
-
-                pygame.draw.rect(self.screen, (0, 0, 0), (x - 2, y - 2, bar_w + 4, bar_h + 4))
-                pygame.draw.rect(self.screen, (140, 0, 0), (x, y, bar_w, bar_h))
-                pygame.draw.rect(self.screen, (0, 220, 0), (x, y, fill_w, bar_h))
+            if self.enemy_in_view(enemy):
+                sprite = enemy.sprite(mx, my)
+                if sprite is not None:
+                    blits.append(sprite)
+        blits.extend(item.sprite(mx, my) for item in self.item_group)
+
+        blits.append(self.player.sprite())
+        if self.shadow_clone: blits.append(self.shadow_clone.sprite())
+
+        # Upper layer goes AFTER entities so it appears above the player
+        if self.upper_img is not None and self.quality.draw_upper_layer:
+            blits.append((self.upper_img, (mx, my)))
+        if self.FOG_OF_WAR:
+            blits.extend(self.fov.blit_list(self.get_view_world_rect(), mx, my))
+
+        max_fire = self.quality.max_drawn_projectiles
+        for i, fire in enumerate(self.fire_group):
+            if max_fire is not None and i >= max_fire:
                 break
+            blits.append(fire.sprite(mx, my))
+        blits.extend(self.bullets.blit_list((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), mx, my))
+        blits.extend(self.particles.blit_list((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), mx, my))
+        return blits
 
-        self.draw_health_bar()
-        self.draw_kill_count()
-        self.draw_item0_count()
-        self.draw_ability_ui()
-        self.draw_mission_ui()
+    def draw(self):
+        self.screen.fill((0, 0, 0))
+        self.screen.blits(self.world_blits(), doreturn=False)
+        self.draw_ui()
+
+    def draw_ui(self):
+        """Minimap, boss bar, HUD and overlays on top of the world layer."""
+        self.minimap.draw(self.screen, self)
+
+        # Boss health bar (only when boss is alive)
+        boss = self.boss
+        if boss is not None and boss.alive and self.enemy_in_view(boss):
+            bar_w = 140
+            bar_h = 12
+            x = boss.rect.centerx + self.map_x - bar_w // 2
+            y = boss.rect.y + self.map_y - 18
+
+            max_hp = max(1, int(getattr(boss, "max_hp", boss.hp)))
+            hp = max(0, int(boss.hp))
+            fill_w = int(bar_w * (hp / max_hp))
+
+            pygame.draw.rect(self.screen, (0, 0, 0), (x - 2, y - 2, bar_w + 4, bar_h + 4))
+            pygame.draw.rect(self.screen, (140, 0, 0), (x, y, bar_w, bar_h))
+            pygame.draw.rect(self.screen, (0, 220, 0), (x, y, fill_w, bar_h))
+
+        self.draw_hud()
         
-        if self.level_manager.boss_spawned and any(isinstance(e, Boss) and e.alive for e in self.enemy_list):
+        if self.boss is not None and self.boss.alive:
              warn = self.boss_font.render("BOSS FIGHT!", True, (255, 0, 0))
              self.screen.blit(warn, (self.SCREEN_WIDTH//2 - warn.get_width()//2, 100))
 
@@ -0,0 +1,313 @@
+"""Gym-style environment around Game with NumPy array observations.
+
+Stepping never draws: the simulation runs on a virtual clock and the
+observation is built straight from game state.
+
+    env = RoboSurviveEnv(loadout="speed")
+    obs, info = env.reset(seed=0)
+    obs, reward, terminated, truncated, info = env.step(env.sample_action())
+
+VectorRoboSurviveEnv runs N of these in worker processes and exposes their
+observations through shared memory, stacked along a leading env axis.
+"""
+import multiprocessing
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+from batch_sim import FPS, SCREEN_HEIGHT, SCREEN_WIDTH, init_headless
+from input_source import InputAction
+
+try:
+    import gymnasium
+    from gymnasium import spaces
+except ImportError:
+    gymnasium = None
+    spaces = None
+
+
+MAX_ENEMIES = 128
+MAX_PROJECTILES = 64
+MAX_ITEMS = 64
+MAX_BULLETS = 256      # boss bullets; the closest ones to the player when there are more
+
+PLAYER_FIELDS = 8      # x, y, hp, max_hp, facing, blood_ready, clone_active, level
+ENEMY_FIELDS = 5       # x, y, hp, alive, is_boss
+PROJECTILE_FIELDS = 5  # x, y, vx, vy, is_blood
+ITEM_FIELDS = 3        # x, y, kind (0 = item0, 1 = item1)
+BULLET_FIELDS = 5      # x, y, vx, vy, style (index into bullets.STYLE_NAMES)
+
+# Action: [move_x + 1, move_y + 1, facing (0 keep, 1 left, 2 right), blood_shot, clone]
+ACTION_NVEC = (3, 3, 3, 2, 2)
+_FACINGS = (None, "left", "right")
+
+
+def observation_shapes(grid_shape):
+    """key -> (shape, dtype). Entity blocks are zero-padded rows of *_FIELDS
+    in WORLD coordinates; "bullets" holds the boss bullets."""
+    return {
+        "grid": (grid_shape, np.int8),
+        "player": ((PLAYER_FIELDS,), np.float32),
+        "enemies": ((MAX_ENEMIES, ENEMY_FIELDS), np.float32),
+        "projectiles": ((MAX_PROJECTILES, PROJECTILE_FIELDS), np.float32),
+        "items": ((MAX_ITEMS, ITEM_FIELDS), np.float32),
+        "bullets": ((MAX_BULLETS, BULLET_FIELDS), np.float32),
+    }
+
+
+def decode_action(action) -> InputAction:
+    move_x, move_y, facing, blood, clone = (int(v) for v in action)
+    return InputAction(
+        move_x=move_x - 1,
+        move_y=move_y - 1,
+        facing=_FACINGS[facing],
+        blood_shot=bool(blood),
+        clone=bool(clone),
+    )
+
+
+class RoboSurviveEnv(gymnasium.Env if gymnasium is not None else object):
+    """Single headless game. Reward: +1 per kill, +0.01 per surviving tick,
+    -1 per HP lost; episode ends on game over or mission success."""
+
+    metadata = {"render_modes": ["rgb_array"], "render_fps": FPS}
+
+    def __init__(self, loadout: str = "speed", max_steps: int = 60 * FPS * 10, render_mode=None, out=None):
+        from collision import collision
+
+        self.loadout = loadout
+        self.max_steps = max_steps
+        self.render_mode = render_mode
+        self.screen = init_headless()
+
+        self.grid = (np.asarray(collision, dtype=np.int8) == 1).astype(np.int8)
+        self.shapes = observation_shapes(self.grid.shape)
+
+        # Observation buffers; `out` lets the vector env point these at shared memory
+        self.obs = out if out is not None else {
+            key: np.zeros(shape, dtype) for key, (shape, dtype) in self.shapes.items()
+        }
+        self.obs["grid"][...] = self.grid
+
+        if spaces is not None:
+            self.action_space = spaces.MultiDiscrete(ACTION_NVEC)
+            self.observation_space = spaces.Dict({
+                key: spaces.Box(-np.inf, np.inf, shape, dtype) if key != "grid"
+                else spaces.Box(0, 1, shape, dtype)
+                for key, (shape, dtype) in self.shapes.items()
+            })
+
+        self.game = None
+        self.now_ms = 0
+        self.steps = 0
+        self._rng = random.Random()
+
+    # -------------------- GYM API --------------------
+    def reset(self, *, seed=None, options=None):
+        from game import Game
+        from menu import LOADOUTS
+
+        if seed is not None:
+            self._rng.seed(seed)
+        random.seed(self._rng.randrange(2**31))
+
+        lo = LOADOUTS[self.loadout]
+        self.now_ms = 0
+        self.steps = 0
+        self.game = Game(
+            self.screen,
+            SCREEN_WIDTH,
+            SCREEN_HEIGHT,
+            player_class=lo["class"],
+            player_speed=lo["player_speed"],
+            player_hp=lo["player_hp"],
+            enemy_count=lo["enemy_count"],
+            damage_to_enemy=lo["damage_to_enemy"],
+            get_ticks=self._get_ticks,
+        )
+        self.game.enemy_die_sfx = None
+        self.game.fireball_shoot_sfx = None
+        self._write_obs()
+        return self.obs, self._info()
+
+    def step(self, action):
+        game = self.game
+        kills, hp = game.kills, game.player.hp
+
+        self.steps += 1
+        self.now_ms = self.steps * 1000 // FPS
+        game.update(self.now_ms, decode_action(action))
+
+        reward = (game.kills - kills) + 0.01 - max(0, hp - game.player.hp)
+        terminated = game.GAME_OVER or game.mission_completed
+        truncated = not terminated and self.steps >= self.max_steps
+        self._write_obs()
+        return self.obs, float(reward), terminated, truncated, self._info()
+
+    def render(self):
+        self.game.draw()
+        return np.transpose(pygame.surfarray.array3d(self.screen), (1, 0, 2))
+
+    def sample_action(self):
+        return np.array([self._rng.randrange(n) for n in ACTION_NVEC], dtype=np.int64)
+
+    def close(self):
+        self.game = None
+
+    # -------------------- INTERNALS --------------------
+    def _get_ticks(self) -> int:
+        return self.now_ms
+
+    def _info(self) -> dict:
+        g = self.game
+        return {
+            "kills": g.kills,
+            "level": g.level,
+            "survival_ms": g.survival_time_ms,
+            "mission_type": g.mission_type,
+            "mission_completed": g.mission_completed,
+        }
+
+    def _write_obs(self):
+        g = self.game
+        player = self.obs["player"]
+        player[0] = g.player.rect.centerx - g.map_x
+        player[1] = g.player.rect.centery - g.map_y
+        player[2] = g.player.hp
+        player[3] = g.player.max_hp
+        player[4] = -1.0 if g.player.facing == "left" else 1.0
+        player[5] = float(self.now_ms >= g.last_blood_shot_time + g.BLOOD_SHOT_COOLDOWN)
+        player[6] = float(g.shadow_clone is not None)
+        player[7] = g.level
+
+        enemies = self.obs["enemies"]
+        enemies.fill(0)
+        for i, enemy in enumerate(g.enemy_list[:MAX_ENEMIES]):
+            enemies[i] = (enemy.rect.centerx, enemy.rect.centery, enemy.hp,
+                          float(enemy.alive), float(enemy is g.boss))
+
+        projectiles = self.obs["projectiles"]
+        projectiles.fill(0)
+        for i, fire in enumerate(g.fire_group):
+            if i >= MAX_PROJECTILES:
+                break
+            projectiles[i] = (fire.rect.centerx, fire.rect.centery, fire.vx, fire.vy,
+                              float(fire.variant == "blood"))
+
+        items = self.obs["items"]
+        items.fill(0)
+        for i, item in enumerate(g.item_group):
+            if i >= MAX_ITEMS:
+                break
+            items[i] = (item.rect.centerx, item.rect.centery, 0.0 if item.kind == "item0" else 1.0)
+
+        bullets = self.obs["bullets"]
+        bullets.fill(0)
+        pool = g.bullets
+        live = np.flatnonzero(pool.life > 0)
+        if len(live) > MAX_BULLETS:
+            d = ((pool.pos[live] - (player[0], player[1])) ** 2).sum(axis=1)
+            live = live[np.argpartition(d, MAX_BULLETS)[:MAX_BULLETS]]
+        n = len(live)
+        bullets[:n, 0:2] = pool.pos[live]
+        bullets[:n, 2:4] = pool.vel[live]
+        bullets[:n, 4] = pool.style[live]
+
+
+# -------------------- VECTOR ENV --------------------
+def _worker(index, conn, shm_names, shapes, env_kwargs):
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, name in shm_names.items()}
+    out = {
+        key: np.ndarray(shape, dtype, buffer=blocks[key].buf)[index]
+        for key, (shape, dtype) in shapes.items()
+    }
+    env = RoboSurviveEnv(out=out, **env_kwargs)
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "reset":
+                _, info = env.reset(seed=arg)
+                conn.send(info)
+            elif cmd == "step":
+                _, reward, terminated, truncated, info = env.step(arg)
+                if terminated or truncated:
+                    # Gym vector convention: auto-reset, keep the final info and
+                    # a copy of the final observation (reset overwrites shared memory)
+                    final_obs = {key: value.copy() for key, value in out.items()}
+                    info = dict(info, final_info=True, final_observation=final_obs)
+                    env.reset()
+                conn.send((reward, terminated, truncated, info))
+            elif cmd == "close":
+                break
+    finally:
+        env.close()
+        for block in blocks.values():
+            block.close()
+        conn.close()
+
+
+class VectorRoboSurviveEnv:
+    """N environments in worker processes; observations live in shared
+    memory, so stepping only ships actions and scalars over the pipes."""
+
+    def __init__(self, num_envs: int, **env_kwargs):
+        from collision import collision
+
+        self.num_envs = num_envs
+        grid_shape = (len(collision), len(collision[0]))
+        self.shapes = {
+            key: ((num_envs,) + tuple(shape), dtype)
+            for key, (shape, dtype) in observation_shapes(grid_shape).items()
+        }
+
+        self._blocks = {}
+        self.obs = {}
+        for key, (shape, dtype) in self.shapes.items():
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            block = shared_memory.SharedMemory(create=True, size=max(1, size))
+            self._blocks[key] = block
+            self.obs[key] = np.ndarray(shape, dtype, buffer=block.buf)
+
+        shm_names = {key: block.name for key, block in self._blocks.items()}
+        self._conns = []
+        self._procs = []
+        for i in range(num_envs):
+            parent, child = multiprocessing.Pipe()
+            proc = multiprocessing.Process(
+                target=_worker, args=(i, child, shm_names, self.shapes, env_kwargs), daemon=True
+            )
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def reset(self, seed=None):
+        for i, conn in enumerate(self._conns):
+            conn.send(("reset", None if seed is None else seed + i))
+        infos = [conn.recv() for conn in self._conns]
+        return self.obs, infos
+
+    def step(self, actions):
+        for conn, action in zip(self._conns, actions):
+            conn.send(("step", action))
+        results = [conn.recv() for conn in self._conns]
+        rewards = np.array([r[0] for r in results], dtype=np.float32)
+        terminated = np.array([r[1] for r in results], dtype=bool)
+        truncated = np.array([r[2] for r in results], dtype=bool)
+        infos = [r[3] for r in results]
+        return self.obs, rewards, terminated, truncated, infos
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
@@ -0,0 +1,133 @@
+import json
+from dataclasses import asdict, dataclass, fields
+
+import pygame
+
+
+@dataclass
+class InputAction:
+    """Everything Game.update needs from the player for one tick."""
+
+    move_x: int = 0          # -1 left, 0, 1 right
+    move_y: int = 0          # -1 up, 0, 1 down
+    facing: str | None = None  # "left"/"right" to turn without moving (a click turns)
+    blood_shot: bool = False
+    clone: bool = False
+    aim_x: int | None = None  # WORLD point shots fly towards (mouse aim)
+    aim_y: int | None = None
+
+
+class InputSource:
+    """Produces one InputAction per simulation tick."""
+
+    def poll(self, game, now_ms: int) -> InputAction:
+        raise NotImplementedError
+
+
+class KeyboardMouseInput(InputSource):
+    """Live SDL keyboard/mouse state (the default for normal play)."""
+
+    def __init__(self):
+        self._prev_mouse_down = False
+
+    def poll(self, game, now_ms: int) -> InputAction:
+        keys = pygame.key.get_pressed()
+        buttons = pygame.mouse.get_pressed()
+        action = InputAction()
+
+        # Shots are automatic; a click only turns the player. One-tap guard
+        # so a held button only counts once
+        clicked = buttons[0] and not self._prev_mouse_down
+        self._prev_mouse_down = buttons[0]
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        action.aim_x = mouse_x - game.map_x
+        action.aim_y = mouse_y - game.map_y
+        if clicked:
+            action.facing = "left" if mouse_x < game.player.rect.centerx else "right"
+
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            action.move_x = -1
+        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            action.move_x = 1
+        if keys[pygame.K_UP] or keys[pygame.K_w]:
+            action.move_y = -1
+        elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            action.move_y = 1
+
+        action.blood_shot = bool(buttons[2])
+        action.clone = bool(keys[pygame.K_c])
+        return action
+
+
+class BotInput(InputSource):
+    """Programmatic input: policy(game, now_ms) -> InputAction."""
+
+    def __init__(self, policy):
+        self.policy = policy
+
+    def poll(self, game, now_ms: int) -> InputAction:
+        return self.policy(game, now_ms)
+
+
+# -------------------- REPLAYS --------------------
+# JSONL: a header line {"seed", "start_ms", "loadout"} then one line per tick
+# {"t": now_ms, "a": InputAction fields}. With the same seed and clock the
+# simulation replays tick for tick.
+class ReplayRecorder(InputSource):
+    """Wraps another source and appends every action it produces to a file."""
+
+    def __init__(self, source: InputSource, path: str, *, seed: int, start_ms: int, loadout=None):
+        self.source = source
+        self._file = open(path, "w")
+        header = {"seed": seed, "start_ms": start_ms, "loadout": loadout}
+        self._file.write(json.dumps(header) + "\n")
+
+    def poll(self, game, now_ms: int) -> InputAction:
+        action = self.source.poll(game, now_ms)
+        self._file.write(json.dumps({"t": now_ms, "a": asdict(action)}, separators=(",", ":")) + "\n")
+        return action
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ReplayInput(InputSource):
+    """Plays back a file written by ReplayRecorder.
+
+    get_ticks() is the recorded clock; pass it to Game so cooldowns and the
+    boss timer see exactly the recorded times.
+    """
+
+    def __init__(self, path: str):
+        with open(path) as f:
+            header = json.loads(f.readline())
+            self.frames = [json.loads(line) for line in f if line.strip()]
+        self.seed = header["seed"]
+        self.start_ms = header["start_ms"]
+        self.loadout = header.get("loadout")
+        self.index = 0
+        self.now_ms = self.start_ms
+        # Older replays may carry fields InputAction no longer has (e.g. "fire")
+        self._fields = {f.name for f in fields(InputAction)}
+
+    @property
+    def finished(self) -> bool:
+        return self.index >= len(self.frames)
+
+    def get_ticks(self) -> int:
+        return self.now_ms
+
+    def advance(self) -> int:
+        """Move the clock to the next recorded tick and return it."""
+        if not self.finished:
+            self.now_ms = self.frames[self.index]["t"]
+        return self.now_ms
+
+    def poll(self, game, now_ms: int) -> InputAction:
+        if self.finished:
+            return InputAction()
+        recorded = self.frames[self.index]["a"]
+        action = InputAction(**{k: v for k, v in recorded.items() if k in self._fields})
+        self.index += 1
+        return action
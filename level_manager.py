@@ -1,60 +1,71 @@
 import pygame
 import random
 from enemy import Enemy, Boss
+from event_bus import BOSS_DIED, BOSS_SPAWNED, LEVEL_STARTED
 
 class LevelManager:
     def __init__(self, game):
         self.game = game
         self.boss_spawned = False
 
-        # Hidden per-level boss timer
-        self.level_started_ms = pygame.time.get_ticks()
+        # Hidden per-level boss timer (starts with the game clock)
+        self.level_started_ms = self.game.start_time_ms
         self.boss_spawn_delay_ms = 30_000  # 30 seconds
 
+        # Difficulty ramp: extra enemies added each level
+        self.enemy_ramp = 3
+
+        self.game.events.subscribe(BOSS_DIED, self.handle_boss_death)
+
     def reset(self):
         self.boss_spawned = False
-        self.level_started_ms = pygame.time.get_ticks()
+        self.level_started_ms = self.game.get_ticks()
+
+    def check_boss_spawn(self, now_ms: int):
+        """Spawn boss 1 minute after the level starts (timer hidden from player).
 
-    def check_boss_spawn(self):
-        """Spawn boss 1 minute after the level starts (timer hidden from player)."""
+        now_ms is the tick's time, not a fresh clock read, so a replay spawns
+        on the same tick as the recording.
+        """
         if self.boss_spawned:
             return
 
-        now_ms = pygame.time.get_ticks()
         if now_ms - self.level_started_ms >= self.boss_spawn_delay_ms:
-            self.spawn_boss()
+            self.spawn_boss(now_ms)
 
-    def spawn_boss(self):
+    def spawn_boss(self, now_ms: int | None = None):
         if self.boss_spawned:
             return
+        if now_ms is None:
+            now_ms = self.game.get_ticks()
 
-        boss = Boss(self.game.MAP_WIDTH, self.game.MAP_HEIGHT, "Spider")
+        boss = Boss(self.game.MAP_WIDTH, self.game.MAP_HEIGHT, "Spider", self.game.spawn_point)
         self.game.enemy_list.append(boss)
 
         self.boss_spawned = True
-        print("!!! BOSS SPAWNED !!!")
+        self.game.events.emit(BOSS_SPAWNED, boss=boss, now_ms=now_ms)
 
-    def handle_boss_death(self):
-        """Called when the boss is killed."""
-        self.start_next_level()
+    def handle_boss_death(self, boss, now_ms):
+        """BOSS_DIED handler."""
+        self.start_next_level(now_ms)
 
-    def start_next_level(self):
+    def start_next_level(self, now_ms: int):
         """Starts the next level only after boss defeat; starts a new hidden boss timer."""
         self.game.level += 1
         self.boss_spawned = False
 
         # New hidden timer for the NEXT boss
-        self.level_started_ms = pygame.time.get_ticks()
+        self.level_started_ms = now_ms
 
         # Difficulty ramp: more enemies each level
-        self.game.enemy_count += 3
+        self.game.enemy_count += self.enemy_ramp
 
         # Keep player HP and kills (per your previous request)
 
         # Spawn new batch of enemies
         self.game.enemy_list = [
-            Enemy(self.game.MAP_WIDTH, self.game.MAP_HEIGHT, self.game.ENEMY_SIZE, "Scarab")
+            Enemy(self.game.MAP_WIDTH, self.game.MAP_HEIGHT, self.game.ENEMY_SIZE, "Scarab", self.game.spawn_point)
             for _ in range(self.game.enemy_count)
         ]
 
-        print(f"--- LEVEL {self.game.level} STARTED ---")
\ No newline at end of file
+        self.game.events.emit(LEVEL_STARTED, level=self.game.level, now_ms=self.level_started_ms)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class LineOfSight:
+    """Tile line-of-sight queries with a per-tick memo.
+
+    A ray is the Bresenham line between two tile centres; it is clear when
+    none of the tiles strictly between the endpoints is solid (everything
+    outside the map counts as solid). Answers are memoised by (source tile,
+    target tile) until begin_tick() moves to another tick, so entities that
+    share a tile cost one ray.
+
+    bulk() answers many sources against one target in a single vectorised
+    pass over the grid instead of one Python ray walk per entity.
+    """
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+        self.cols = tiles.cols
+        self.rows = tiles.rows
+        self.solid = np.array(tiles.solid_cells, bool).reshape(self.rows, self.cols)
+
+        self._tick = None
+        # target tile -> int8 per source tile: -1 unknown, 0 blocked, 1 clear
+        self._memo = {}
+        self.hits = 0
+        self.rays = 0
+
+    def begin_tick(self, tick: int):
+        """Drop memoised rays once the world may have moved."""
+        if tick != self._tick:
+            self._tick = tick
+            self._memo.clear()
+
+    def _tile(self, x, y):
+        ts = self.tiles.tile_size
+        return int(x // ts), int(y // ts)
+
+    def _memo_for(self, tx, ty):
+        memo = self._memo.get((tx, ty))
+        if memo is None:
+            memo = self._memo[(tx, ty)] = np.full(self.rows * self.cols, -1, np.int8)
+        return memo
+
+    # -------------------- SINGLE QUERIES --------------------
+    def clear_tiles(self, sx: int, sy: int, tx: int, ty: int) -> bool:
+        if not (0 <= sx < self.cols and 0 <= sy < self.rows):
+            self.rays += 1
+            return self._cast(sx, sy, tx, ty)  # off-map sources are not memoised
+        memo = self._memo_for(tx, ty)
+        index = sy * self.cols + sx
+        if memo[index] >= 0:
+            self.hits += 1
+            return bool(memo[index])
+        self.rays += 1
+        result = self._cast(sx, sy, tx, ty)
+        memo[index] = result
+        return result
+
+    def clear(self, x0, y0, x1, y1) -> bool:
+        """LOS between two WORLD points."""
+        return self.clear_tiles(*self._tile(x0, y0), *self._tile(x1, y1))
+
+    def _cast(self, sx, sy, tx, ty) -> bool:
+        dx, dy = tx - sx, ty - sy
+        n = max(abs(dx), abs(dy))
+        is_solid = self.tiles.is_solid
+        # Round half up along the major axis; bulk() uses the same formula
+        for k in range(1, n):
+            if is_solid(sx + (2 * k * dx + n) // (2 * n), sy + (2 * k * dy + n) // (2 * n)):
+                return False
+        return True
+
+    # -------------------- BULK --------------------
+    def bulk(self, xs, ys, target_x, target_y) -> np.ndarray:
+        """LOS from each WORLD point (xs[i], ys[i]) to the target, as a bool array."""
+        ts = self.tiles.tile_size
+        sx = np.floor_divide(np.asarray(xs), ts).astype(np.int64)
+        sy = np.floor_divide(np.asarray(ys), ts).astype(np.int64)
+        tx, ty = self._tile(target_x, target_y)
+        if len(sx) == 0:
+            return np.zeros(0, bool)
+
+        inside = (sx >= 0) & (sx < self.cols) & (sy >= 0) & (sy < self.rows)
+        index = np.where(inside, sy * self.cols + sx, 0)
+        memo = self._memo_for(tx, ty)
+        known = memo[index]
+        result = np.where(inside, known, -1)
+
+        # Cast each unknown source tile once, then fill the memo
+        todo = np.flatnonzero(result < 0)
+        self.hits += len(sx) - len(todo)
+        if len(todo):
+            keys, first, inverse = np.unique(np.where(inside[todo], index[todo], -1 - todo),
+                                             return_index=True, return_inverse=True)
+            rays = todo[first]
+            cast = self._cast_many(sx[rays], sy[rays], tx, ty)
+            self.rays += len(rays)
+            result[todo] = cast[inverse.ravel()]
+            on_map = keys >= 0
+            memo[keys[on_map]] = cast[on_map]
+        return result.astype(bool)
+
+    def _cast_many(self, sx, sy, tx, ty) -> np.ndarray:
+        dx = (tx - sx)[:, None]
+        dy = (ty - sy)[:, None]
+        n = np.maximum(np.abs(dx), np.abs(dy))
+        longest = int(n.max())
+        if longest < 2:
+            return np.ones(len(sx), bool)
+        k = np.arange(1, longest)[None, :]
+        div = 2 * np.maximum(n, 1)
+        x = sx[:, None] + (2 * k * dx + n) // div
+        y = sy[:, None] + (2 * k * dy + n) // div
+        inside = (x >= 0) & (x < self.cols) & (y >= 0) & (y < self.rows)
+        blocked = ~inside | self.solid[np.clip(y, 0, self.rows - 1), np.clip(x, 0, self.cols - 1)]
+        blocked &= k < n  # rays shorter than the longest are padded
+        return ~blocked.any(axis=1)
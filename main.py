@@ -1,8 +1,42 @@
+import argparse
+import random
 import pygame
 import sys
 
+import alloc_tracker
+import asset_pack
+import render_backend
+import surface_memory
+from telemetry import SessionTelemetry, TelemetryWriter
 from menu import Menu
 from game import Game
+from pipeline import SimPipeline, draw_snapshot
+from input_source import KeyboardMouseInput, ReplayInput, ReplayRecorder
+
+# -------------------- ARGS --------------------
+parser = argparse.ArgumentParser(description="ROBO Survive")
+parser.add_argument("--record", metavar="PATH", help="record the next game's inputs to PATH")
+parser.add_argument("--replay", metavar="PATH", help="play back a recorded game")
+parser.add_argument("--mem-report", metavar="PATH",
+                    help="write a surface memory report to PATH on exit ('-' for stdout)")
+parser.add_argument("--alloc-report", metavar="PATH",
+                    help="track per-frame allocations and GC pauses; write a report to PATH on exit "
+                         "('-' for stdout; slows the game down)")
+parser.add_argument("--telemetry", metavar="PATH", default="telemetry.jsonl",
+                    help="append session/level metrics to PATH (query with telemetry.py)")
+parser.add_argument("--no-telemetry", action="store_true", help="don't record telemetry")
+parser.add_argument("--auto-aim", action="store_true", help="shots target the nearest enemy in range")
+parser.add_argument("--renderer", choices=render_backend.BACKENDS, default="software",
+                    help="draw with software blits or SDL2 textures (falls back to software)")
+parser.add_argument("--render-driver", metavar="NAME",
+                    help="SDL render driver for --renderer texture, e.g. software or opengl")
+parser.add_argument("--pipeline", action="store_true",
+                    help="run the simulation on its own thread; this loop only draws snapshots")
+args = parser.parse_args()
+
+if args.alloc_report:
+    # Before any font/surface exists so the Surface counters see them all
+    alloc_tracker.enable()
 
 
 pygame.init()
@@ -10,10 +44,12 @@ pygame.mixer.init()
 
 # -------------------- SCREEN --------------------
 SCREEN_WIDTH, SCREEN_HEIGHT = 1040, 672
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("ROBO Survive")
+backend = render_backend.create(args.renderer, (SCREEN_WIDTH, SCREEN_HEIGHT), "ROBO Survive",
+                                driver=args.render_driver)
+screen = backend.screen
 clock = pygame.time.Clock()
 FPS = 60
+IDLE_WAIT_MS = 250  # static screens still redraw a few times a second
 
 # -------------------- STATES --------------------
 # "MENU" or "PLAYING"
@@ -23,7 +59,7 @@ menu = Menu(screen, SCREEN_WIDTH, SCREEN_HEIGHT)
 
 def _start_bg_music():
     try:
-        pygame.mixer.music.load("music2.mp3")
+        asset_pack.load_music("music2.mp3")
         pygame.mixer.music.set_volume(0.7)
         pygame.mixer.music.play(-1)
     except Exception:
@@ -33,25 +69,121 @@ def _start_bg_music():
 # Start music initially (menu toggle can later stop it)
 _start_bg_music()
 
+def _new_game(loadout, **kwargs) -> Game:
+    return Game(
+        screen,
+        SCREEN_WIDTH,
+        SCREEN_HEIGHT,
+        player_class=loadout["class"],
+        player_speed=loadout["player_speed"],
+        player_hp=loadout["player_hp"],
+        enemy_count=loadout["enemy_count"],
+        damage_to_enemy=loadout["damage_to_enemy"],
+        **kwargs,
+    )
+
 game: Game | None = None
+replay: ReplayInput | None = None
+recorder: ReplayRecorder | None = None
+
+# Written by a background thread; the loop only enqueues records
+telemetry = None if args.no_telemetry else TelemetryWriter(args.telemetry)
+session: SessionTelemetry | None = None
+
+def _start_session(loadout):
+    global session
+    if telemetry is not None:
+        session = SessionTelemetry(game, telemetry, loadout)
+
+# --pipeline: the sim thread owns the game while it runs
+pipe: SimPipeline | None = None
+draw_ms = 0  # main loop's last frame work time (compositing the snapshot)
+
+def _on_sim_tick(sim_game, work_ms):
+    # Sim thread: feed quality/telemetry without racing the game state. The
+    # slower of the two threads bounds the frame rate, so a draw-bound frame
+    # lowers the tier too.
+    frame_ms = max(work_ms, draw_ms)
+    sim_game.quality.record(frame_ms)
+    if session is not None:
+        session.frame(frame_ms)
+
+def _start_pipeline():
+    global pipe
+    if args.pipeline:
+        clock = replay.advance if replay is not None else pygame.time.get_ticks
+        pipe = SimPipeline(game, clock=clock, tick_rate=FPS, on_tick=_on_sim_tick)
+        pipe.start()
+
+def _stop_pipeline():
+    global pipe
+    if pipe is not None:
+        pipe.stop()
+        pipe = None
+
+# -------------------- IDLE --------------------
+def _is_idle() -> bool:
+    """Nothing on screen moves until the next input event."""
+    if app_state == "MENU":
+        return menu.idle
+    if game is None:
+        return False
+    if pipe is None:
+        return game.idle
+    # The sim thread owns the game: trust a snapshot that has seen all input
+    frame = pipe.latest()
+    return frame is not None and frame.idle and frame.inputs == pipe.posted
+
+def _poll_events(idle: bool) -> list:
+    if not idle:
+        return pygame.event.get()
+    # Block until input instead of redrawing an unchanged screen at FPS
+    event = pygame.event.wait(IDLE_WAIT_MS)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+if args.replay:
+    # Same seed + recorded clock + recorded inputs = same game
+    replay = ReplayInput(args.replay)
+    random.seed(replay.seed)
+    # The header loadout also carries the auto_aim setting; telemetry matches
+    # the bare loadout against menu.LOADOUTS
+    loadout = dict(replay.loadout)
+    auto_aim = loadout.pop("auto_aim", False)
+    game = _new_game(loadout, auto_aim=auto_aim, get_ticks=replay.get_ticks, input_source=replay)
+    _start_session(loadout)
+    _start_pipeline()
+    app_state = "PLAYING"
 
 running = True
 while running:
-    keys = pygame.key.get_pressed()
-    now_ms = pygame.time.get_ticks()
-    mouse_pos = pygame.mouse.get_pos()
+    alloc_tracker.begin_frame()
+    idle = _is_idle()
+
+    with alloc_tracker.phase("events"):
+        for event in _poll_events(idle):
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):  # WINDOWCLOSE: texture backend window
+                running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                surface_memory.overlay_enabled = not surface_memory.overlay_enabled
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+            if pipe is not None:
+                if event.type == pygame.WINDOWMINIMIZED:
+                    pipe.pause()
+                elif event.type == pygame.WINDOWRESTORED:
+                    pipe.resume()
 
-        if app_state == "MENU":
-            menu.handle_event(event)
-        elif app_state == "PLAYING" and game is not None:
-            game.handle_event(event)
+            if app_state == "MENU":
+                menu.handle_event(event)
+            elif pipe is not None:
+                pipe.post_event(event)
+            elif app_state == "PLAYING" and game is not None:
+                game.handle_event(event)
 
     if app_state == "MENU":
-        action = menu.update_and_draw()
+        with alloc_tracker.phase("menu"):
+            action = menu.update_and_draw()
 
         # Apply music toggle live
         try:
@@ -67,21 +199,34 @@ while running:
             action_name, settings = action
             if action_name == "START_GAME":
                 loadout = settings["loadout"]
-                game = Game(
-                    screen,
-                    SCREEN_WIDTH,
-                    SCREEN_HEIGHT,
-                    player_class=loadout["class"],
-                    player_speed=loadout["player_speed"],
-                    player_hp=loadout["player_hp"],
-                    enemy_count=loadout["enemy_count"],
-                    damage_to_enemy=loadout["damage_to_enemy"],
-                )
+                if args.record and recorder is None:
+                    seed = random.randrange(2**31)
+                    random.seed(seed)
+                    game = _new_game(loadout, auto_aim=args.auto_aim)
+                    recorder = ReplayRecorder(KeyboardMouseInput(), args.record, seed=seed,
+                                              start_ms=game.start_time_ms,
+                                              loadout=dict(loadout, auto_aim=args.auto_aim))
+                    game.input_source = recorder
+                else:
+                    game = _new_game(loadout, auto_aim=args.auto_aim)
+                _start_session(loadout)
+                _start_pipeline()
                 app_state = "PLAYING"
 
     elif app_state == "PLAYING" and game is not None:
-        game.update(keys, now_ms, mouse_pos)
-        game.draw()
+        if pipe is not None:
+            with alloc_tracker.phase("draw"):
+                frame = pipe.latest()
+                if frame is not None:
+                    draw_snapshot(screen, frame)
+        else:
+            if not game.idle:
+                # Read after the events; a replay doesn't skip frames while paused
+                now_ms = replay.advance() if replay is not None else pygame.time.get_ticks()
+                with alloc_tracker.phase("update"):
+                    game.update(now_ms)
+            with alloc_tracker.phase("draw"):
+                backend.draw_game(game)
 
         # keep applying music toggle in-game too
         try:
@@ -94,8 +239,15 @@ while running:
             pass
 
         if game.return_to_menu:
+            _stop_pipeline()
+            if session is not None:
+                session.finish("quit")
+                session = None
             # Clear current game
             game = None
+            replay = None
+            if recorder is not None:
+                recorder.close()
             # Reset app state to main menu
             app_state = "MENU"
             # Reset menu to its default view and selection
@@ -107,8 +259,35 @@ while running:
             except Exception:
                 pass
 
-    pygame.display.flip()
+    if surface_memory.overlay_enabled:
+        surface_memory.draw_overlay(screen)
+
+    with alloc_tracker.phase("present"):
+        backend.present()
+    alloc_tracker.end_frame()
     clock.tick(FPS)
 
+    # Work time of this frame (without the tick sleep) drives adaptive quality
+    # and telemetry frame times; an idle frame's time is mostly the event wait
+    if app_state == "PLAYING" and game is not None and pipe is None:
+        if not idle:
+            game.quality.record(clock.get_rawtime())
+            if session is not None:
+                session.frame(clock.get_rawtime())
+    elif pipe is not None:
+        # Picked up by _on_sim_tick on the next simulation tick
+        draw_ms = 0 if idle else clock.get_rawtime()
+
+_stop_pipeline()
+if recorder is not None:
+    recorder.close()
+if session is not None:
+    session.finish("quit")
+if telemetry is not None:
+    telemetry.close()
+if args.mem_report:
+    surface_memory.dump_report(args.mem_report)
+if args.alloc_report:
+    alloc_tracker.dump_report(args.alloc_report)
 pygame.quit()
 sys.exit()
\ No newline at end of file
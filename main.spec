@@ -1,11 +1,16 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
+# Build the pack first with `python asset_pack.py`; asset_pack.py reads it
+# from the bundle at runtime and falls back to loose files when missing.
+asset_datas = [('assets.pack', '.')] if os.path.exists('assets.pack') else []
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=asset_datas,
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
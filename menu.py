@@ -1,6 +1,43 @@
 import pygame
 import sys
-import os
+
+import asset_pack
+import surface_memory
+from sprite_atlas import get_atlas
+
+
+# Loadout rules (also used by batch_sim.py):
+# 1) Speed:     Assault_Class, speed=5, hp=12, enemy=5, dmg_to_enemy=1
+# 2) Guard:     MachineGunner_Class, speed=3, hp=15, enemy=7, dmg_to_enemy=1
+# 3) HighDamage Sniper_Class, speed=4, hp=10, enemy=6, dmg_to_enemy=2
+LOADOUTS = {
+    "speed": {
+        "class": "Assault_Class",
+        "player_speed": 5,
+        "player_hp": 12,
+        "enemy_count": 5,
+        "damage_to_enemy": 1,
+    },
+    "guard": {
+        "class": "MachineGunner_Class",
+        "player_speed": 3,
+        "player_hp": 15,
+        "enemy_count": 7,
+        "damage_to_enemy": 1,
+    },
+    "damage": {
+        "class": "Sniper_Class",
+        "player_speed": 4,
+        "player_hp": 10,
+        "enemy_count": 6,
+        "damage_to_enemy": 2,
+    },
+}
+
+def _loadout_stats(key: str) -> str:
+    lo = LOADOUTS[key]
+    return (f"SPD {lo['player_speed']} | HP {lo['player_hp']} | "
+            f"ENEMIES {lo['enemy_count']} | DMG {lo['damage_to_enemy']}")
 
 
 class Menu:
@@ -22,39 +59,44 @@ class Menu:
         self.selected_loadout = "speed"  # speed|guard|damage
 
         # Assets
-        self.menu_bg = pygame.image.load("menu_background.png").convert()
+        self.menu_bg = asset_pack.load_image("menu_background.png").convert()
         self.menu_bg = pygame.transform.scale(self.menu_bg, (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        surface_memory.track(self.menu_bg, "Menu", "menu_background.png")
 
         self.menu_buttons = {
-            "start": [pygame.image.load("menu/start/1.png").convert_alpha(),
-                      pygame.image.load("menu/start/2.png").convert_alpha()],
-            "option": [pygame.image.load("menu/option/1.png").convert_alpha(),
-                       pygame.image.load("menu/option/2.png").convert_alpha()],
-            "controls": [pygame.image.load("menu/controls/1.png").convert_alpha(),
-                         pygame.image.load("menu/controls/2.png").convert_alpha()],
-            "exit": [pygame.image.load("menu/exit/1.png").convert_alpha(),
-                     pygame.image.load("menu/exit/2.png").convert_alpha()],
-            "music_on": [pygame.image.load("menu/option/music/on/1.png").convert_alpha(),
-                         pygame.image.load("menu/option/music/on/2.png").convert_alpha()],
-            "music_off": [pygame.image.load("menu/option/music/off/1.png").convert_alpha(),
-                          pygame.image.load("menu/option/music/off/2.png").convert_alpha()],
-            "sfx_on": [pygame.image.load("menu/option/sfx/on/1.png").convert_alpha(),
-                       pygame.image.load("menu/option/sfx/on/2.png").convert_alpha()],
-            "sfx_off": [pygame.image.load("menu/option/sfx/off/1.png").convert_alpha(),
-                        pygame.image.load("menu/option/sfx/off/2.png").convert_alpha()],
-            "speed": [pygame.image.load("menu/start/speed/1.png").convert_alpha(),
-                      pygame.image.load("menu/start/speed/2.png").convert_alpha()],
-            "guard": [pygame.image.load("menu/start/guard/1.png").convert_alpha(),
-                      pygame.image.load("menu/start/guard/2.png").convert_alpha()],
-            "damage": [pygame.image.load("menu/option/1.png").convert_alpha(),
-                       pygame.image.load("menu/option/2.png").convert_alpha()],
+            "start": [asset_pack.load_image("menu/start/1.png").convert_alpha(),
+                      asset_pack.load_image("menu/start/2.png").convert_alpha()],
+            "option": [asset_pack.load_image("menu/option/1.png").convert_alpha(),
+                       asset_pack.load_image("menu/option/2.png").convert_alpha()],
+            "controls": [asset_pack.load_image("menu/controls/1.png").convert_alpha(),
+                         asset_pack.load_image("menu/controls/2.png").convert_alpha()],
+            "exit": [asset_pack.load_image("menu/exit/1.png").convert_alpha(),
+                     asset_pack.load_image("menu/exit/2.png").convert_alpha()],
+            "music_on": [asset_pack.load_image("menu/option/music/on/1.png").convert_alpha(),
+                         asset_pack.load_image("menu/option/music/on/2.png").convert_alpha()],
+            "music_off": [asset_pack.load_image("menu/option/music/off/1.png").convert_alpha(),
+                          asset_pack.load_image("menu/option/music/off/2.png").convert_alpha()],
+            "sfx_on": [asset_pack.load_image("menu/option/sfx/on/1.png").convert_alpha(),
+                       asset_pack.load_image("menu/option/sfx/on/2.png").convert_alpha()],
+            "sfx_off": [asset_pack.load_image("menu/option/sfx/off/1.png").convert_alpha(),
+                        asset_pack.load_image("menu/option/sfx/off/2.png").convert_alpha()],
+            "speed": [asset_pack.load_image("menu/start/speed/1.png").convert_alpha(),
+                      asset_pack.load_image("menu/start/speed/2.png").convert_alpha()],
+            "guard": [asset_pack.load_image("menu/start/guard/1.png").convert_alpha(),
+                      asset_pack.load_image("menu/start/guard/2.png").convert_alpha()],
+            "damage": [asset_pack.load_image("menu/option/1.png").convert_alpha(),
+                       asset_pack.load_image("menu/option/2.png").convert_alpha()],
         }
+        for name, images in self.menu_buttons.items():
+            for i, img in enumerate(images):
+                surface_memory.track(img, "Menu", f"button {name}/{i + 1}")
 
         # --- LOAD CHARACTER AVATARS FOR MENU ---
+        # 3x size = 96x96 since base is 32x32; views into the shared atlas
         self.avatars = {
-            "speed": self.load_frames(os.path.join("Assault_Class", "idle", "right")),
-            "guard": self.load_frames(os.path.join("MachineGunner_Class", "Idle", "right")),
-            "damage": self.load_frames(os.path.join("Sniper_Class", "Idle", "right"))
+            "speed": get_atlas("Assault_Class", 96).animations["idle_right"],
+            "guard": get_atlas("MachineGunner_Class", 96).animations["idle_right"],
+            "damage": get_atlas("Sniper_Class", 96).animations["idle_right"],
         }
         
         # Animation State
@@ -70,24 +112,6 @@ class Menu:
         # One-tap guard so click doesn't trigger multiple times
         self._prev_mouse_down = False
 
-    def load_frames(self, path):
-        """Helper to load animation frames from a folder."""
-        frames = []
-        i = 0
-        while True:
-            full_path = os.path.join(path, f"{i}.png")
-            if not os.path.exists(full_path):
-                break
-            try:
-                img = pygame.image.load(full_path).convert_alpha()
-                # Scale up to look good in the menu (3x size = 96x96 since base is 32x32)
-                img = pygame.transform.scale(img, (96, 96))
-                frames.append(img)
-            except Exception as e:
-                print(f"Error loading {full_path}: {e}")
-            i += 1
-        return frames
-
     def _consume_click(self) -> bool:
         """Return True only on mouse down edge."""
         now_down = pygame.mouse.get_pressed()[0]
@@ -245,7 +269,7 @@ class Menu:
         if text_button("SPEEDY", y1):
             self.selected_loadout = "speed"
             return "START_GAME"
-        s1 = stats_font.render("SPD 5 | HP 12 | ENEMIES 5 | DMG 1", True, (255, 255, 255))
+        s1 = stats_font.render(_loadout_stats("speed"), True, (255, 255, 255))
         self.screen.blit(s1, (text_x, y1 + 55))
 
         # --- Option 2: THE ROCK (MachineGunner) ---
@@ -253,7 +277,7 @@ class Menu:
         if text_button("THE ROCK", y2):
             self.selected_loadout = "guard"
             return "START_GAME"
-        s2 = stats_font.render("SPD 3 | HP 15 | ENEMIES 7 | DMG 1", True, (255, 255, 255))
+        s2 = stats_font.render(_loadout_stats("guard"), True, (255, 255, 255))
         self.screen.blit(s2, (text_x, y2 + 55))
 
         # --- Option 3: ONE SHOT (Sniper) ---
@@ -261,7 +285,7 @@ class Menu:
         if text_button("ONE SHOT", y3):
             self.selected_loadout = "damage"
             return "START_GAME"
-        s3 = stats_font.render("SPD 4 | HP 10 | ENEMIES 6 | DMG 2", True, (255, 255, 255))
+        s3 = stats_font.render(_loadout_stats("damage"), True, (255, 255, 255))
         self.screen.blit(s3, (text_x, y3 + 55))
 
         hint_text = self.menu_hint_font.render("Press any key to go back", True, (200, 200, 200))
@@ -269,6 +293,11 @@ class Menu:
 
         return None
 
+    @property
+    def idle(self) -> bool:
+        """Only the mode select animates; the other screens change on input."""
+        return self.game_state in ("MENU", "CONTROLS", "OPTIONS")
+
     def handle_event(self, event: pygame.event.Event):
         if event.type != pygame.KEYDOWN:
             return None
@@ -299,35 +328,7 @@ class Menu:
         if self.game_state == "START_SUB":
             action = self._draw_start_menu()
             if action == "START_GAME":
-                # Loadout rules:
-                # 1) Speed:     Assault_Class, speed=5, hp=12, enemy=5, dmg_to_enemy=1
-                # 2) Guard:     MachineGunner_Class, speed=3, hp=15, enemy=7, dmg_to_enemy=1
-                # 3) HighDamage Sniper_Class, speed=4, hp=10, enemy=6, dmg_to_enemy=2
-                
-                if self.selected_loadout == "speed":
-                    loadout = {
-                        "class": "Assault_Class", 
-                        "player_speed": 5, 
-                        "player_hp": 12, 
-                        "enemy_count": 5, 
-                        "damage_to_enemy": 1
-                    }
-                elif self.selected_loadout == "guard":
-                    loadout = {
-                        "class": "MachineGunner_Class", 
-                        "player_speed": 3, 
-                        "player_hp": 15, 
-                        "enemy_count": 7, 
-                        "damage_to_enemy": 1
-                    }
-                else:
-                    loadout = {
-                        "class": "Sniper_Class", 
-                        "player_speed": 4, 
-                        "player_hp": 10, 
-                        "enemy_count": 6, 
-                        "damage_to_enemy": 2
-                    }
+                loadout = dict(LOADOUTS[self.selected_loadout])
 
                 settings = {
                     "music_enabled": self.music_enabled,
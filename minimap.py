@@ -0,0 +1,123 @@
+"""Minimap with a baked wall layer and bulk-written entity dots.
+
+The wall/floor layer is baked once from the collision grid. Each refresh
+restores only the pixels under last refresh's dots from the baked copy, then
+writes the new dots with NumPy fancy indexing through surfarray.pixels2d,
+so the cost scales with the number of dots, not the minimap area.
+"""
+import numpy as np
+import pygame
+
+import surface_memory
+
+WALL_COLOR = (70, 60, 50)
+FLOOR_COLOR = (25, 30, 25)
+BORDER_COLOR = (200, 200, 200)
+VIEW_COLOR = (255, 255, 255)
+
+ENEMY_COLOR = (230, 40, 40)
+BOSS_COLOR = (255, 0, 255)
+ITEM0_COLOR = (255, 215, 0)
+ITEM1_COLOR = (60, 220, 90)
+PLAYER_COLOR = (255, 255, 255)
+CLONE_COLOR = (80, 200, 255)
+
+
+def _centers(rects):
+    """Centers of pygame Rects as two float arrays (x, y)."""
+    n = len(rects)
+    return (np.fromiter([r.centerx for r in rects], np.float32, n),
+            np.fromiter([r.centery for r in rects], np.float32, n))
+
+
+def _square(size):
+    """(dx, dy) offsets of a size x size dot."""
+    r = np.arange(size) - size // 2
+    dx, dy = np.meshgrid(r, r, indexing="ij")
+    return dx.ravel(), dy.ravel()
+
+
+class Minimap:
+    def __init__(self, grid, tile_size: int, scale: int = 3, refresh_every: int = 4):
+        """scale: minimap pixels per tile; refresh_every: rewrite dots every N draws."""
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.scale = scale
+        self.world_to_map = scale / tile_size
+        self.refresh_every = refresh_every
+        self.size = (self.cols * scale, self.rows * scale)
+
+        self.surface = pygame.Surface(self.size, 0, 32)
+        walls = np.asarray(grid, dtype=np.int8).T == 1  # (cols, rows) like surfarray
+        walls = np.repeat(np.repeat(walls, scale, axis=0), scale, axis=1)
+        wall = self.surface.map_rgb(WALL_COLOR)
+        floor = self.surface.map_rgb(FLOOR_COLOR)
+        self.base = np.where(walls, wall, floor).astype(np.uint32)
+        pygame.surfarray.blit_array(self.surface, self.base)
+        surface_memory.track(self.surface, "Minimap", "minimap")
+
+        self._colors = {c: self.surface.map_rgb(c) for c in (
+            ENEMY_COLOR, BOSS_COLOR, ITEM0_COLOR, ITEM1_COLOR, PLAYER_COLOR, CLONE_COLOR)}
+        self._dot2 = _square(2)
+        self._dot4 = _square(4)
+        self._dirty = (np.empty(0, np.intp), np.empty(0, np.intp))
+        self._frame = 0
+
+    def _dots(self, wx, wy, offsets):
+        """World x/y arrays -> minimap pixel indices covered by their dots."""
+        mx = (wx * self.world_to_map).astype(np.intp)
+        my = (wy * self.world_to_map).astype(np.intp)
+        xs = (mx[:, None] + offsets[0][None, :]).ravel()
+        ys = (my[:, None] + offsets[1][None, :]).ravel()
+        np.clip(xs, 0, self.size[0] - 1, out=xs)
+        np.clip(ys, 0, self.size[1] - 1, out=ys)
+        return xs, ys
+
+    def refresh(self, game):
+        boss = game.boss
+        enemies = [e.rect for e in game.enemy_list if e.alive and e is not boss and game.enemy_in_view(e)]
+        items0 = [i.rect for i in game.item_group if i.kind == "item0"]
+        items1 = [i.rect for i in game.item_group if i.kind != "item0"]
+        layers = [
+            (enemies, self._dot2, ENEMY_COLOR),
+            (items1, self._dot2, ITEM1_COLOR),
+            (items0, self._dot2, ITEM0_COLOR),
+        ]
+        if game.shadow_clone is not None:
+            layers.append(([game.shadow_clone.rect.move(-game.map_x, -game.map_y)], self._dot2, CLONE_COLOR))
+        if boss is not None and boss.alive and game.enemy_in_view(boss):
+            layers.append(([boss.rect], self._dot4, BOSS_COLOR))
+        layers.append(([game.get_player_world_rect()], self._dot4, PLAYER_COLOR))
+
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        try:
+            # Dirty region: put back the floor/walls under the old dots only
+            old_x, old_y = self._dirty
+            pixels[old_x, old_y] = self.base[old_x, old_y]
+
+            all_x, all_y = [], []
+            for rects, offsets, color in layers:
+                xs, ys = self._dots(*_centers(rects), offsets)
+                pixels[xs, ys] = self._colors[color]
+                all_x.append(xs)
+                all_y.append(ys)
+            self._dirty = (np.concatenate(all_x), np.concatenate(all_y))
+        finally:
+            del pixels  # unlock the surface
+
+    def draw(self, screen: pygame.Surface, game, pad: int = 12):
+        if self._frame % self.refresh_every == 0:
+            self.refresh(game)
+        self._frame += 1
+
+        w, h = self.size
+        x = screen.get_width() - w - pad
+        y = screen.get_height() - h - pad
+        pygame.draw.rect(screen, BORDER_COLOR, (x - 2, y - 2, w + 4, h + 4), 2)
+        screen.blit(self.surface, (x, y))
+
+        # Camera rectangle
+        view = game.get_view_world_rect()
+        k = self.world_to_map
+        pygame.draw.rect(screen, VIEW_COLOR,
+                         (x + int(view.x * k), y + int(view.y * k), int(view.w * k), int(view.h * k)), 1)
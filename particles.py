@@ -0,0 +1,142 @@
+"""Pooled, array-backed particles for hit/death/pickup effects.
+
+All particles live in preallocated NumPy arrays with a hard cap; emitting
+past the cap drops the extra particles. Integration and fade are vectorized,
+and drawing is one Surface.blits() call over a small cached set of faded
+sprites (one per style and fade step).
+
+Particles are presentation only and use their own RNG, so they never touch
+the seeded `random` stream that replays depend on.
+"""
+import numpy as np
+import pygame
+
+import surface_memory
+
+FADE_STEPS = 8
+
+# style -> (color, radius, speed range, life range in ticks, drag, gravity)
+STYLES = {
+    "spark": ((255, 230, 120), 2, (1.5, 4.0), (8, 16), 0.85, 0.0),
+    "burst": ((255, 140, 40), 3, (1.0, 5.0), (14, 28), 0.90, 0.05),
+    "blood": ((220, 30, 30), 2, (0.2, 0.8), (10, 20), 0.92, 0.0),
+    "flash": ((180, 255, 180), 3, (2.0, 3.0), (10, 14), 0.80, 0.0),
+}
+STYLE_NAMES = list(STYLES)
+
+
+class ParticleSystem:
+    def __init__(self, capacity: int = 2048, seed: int = 0):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)      # ticks left; <= 0 is free
+        self.max_life = np.ones(capacity, np.float32)
+        self.style = np.zeros(capacity, np.uint8)
+        self.dropped = 0
+
+        self._rng = np.random.default_rng(seed)
+        self._drag = np.array([STYLES[s][4] for s in STYLE_NAMES], np.float32)
+        self._gravity = np.array([STYLES[s][5] for s in STYLE_NAMES], np.float32)
+        self._radius = np.array([STYLES[s][1] for s in STYLE_NAMES], np.int32)
+        self._sprites = None  # [style][fade step] -> Surface, built on first draw
+
+    @property
+    def live_count(self) -> int:
+        return int(np.count_nonzero(self.life > 0))
+
+    def clear(self):
+        self.life[:] = 0
+
+    def emit(self, style: str, x, y, count: int, base_vel=(0.0, 0.0)):
+        """Spawn `count` particles of `style` at WORLD (x, y)."""
+        free = np.flatnonzero(self.life <= 0)[:count]
+        self.dropped += count - len(free)
+        n = len(free)
+        if n == 0:
+            return
+        _, _, (s_lo, s_hi), (l_lo, l_hi), _, _ = STYLES[style]
+        angle = self._rng.uniform(0.0, 2.0 * np.pi, n)
+        speed = self._rng.uniform(s_lo, s_hi, n)
+        life = self._rng.uniform(l_lo, l_hi, n)
+
+        self.pos[free, 0] = x
+        self.pos[free, 1] = y
+        self.vel[free, 0] = np.cos(angle) * speed + base_vel[0]
+        self.vel[free, 1] = np.sin(angle) * speed + base_vel[1]
+        self.life[free] = life
+        self.max_life[free] = life
+        self.style[free] = STYLE_NAMES.index(style)
+
+    # -------------------- EFFECTS --------------------
+    def hit_sparks(self, x, y):
+        self.emit("spark", x, y, 6)
+
+    def death_burst(self, x, y, big: bool = False):
+        self.emit("burst", x, y, 60 if big else 20)
+        self.emit("spark", x, y, 20 if big else 8)
+
+    def blood_trail(self, x, y, vx, vy):
+        # Drift slightly backwards from the shot's velocity
+        speed = max(1e-6, (vx * vx + vy * vy) ** 0.5)
+        self.emit("blood", x, y, 2, base_vel=(-vx / speed, -vy / speed))
+
+    def pickup_flash(self, x, y):
+        self.emit("flash", x, y, 12)
+
+    # -------------------- SIMULATION --------------------
+    def update(self):
+        live = self.life > 0
+        if not live.any():
+            return
+        idx = np.flatnonzero(live)
+        style = self.style[idx]
+        vel = self.vel[idx]
+        vel *= self._drag[style][:, None]
+        vel[:, 1] += self._gravity[style]
+        self.vel[idx] = vel
+        self.pos[idx] += vel
+        self.life[idx] -= 1
+
+    # -------------------- DRAWING --------------------
+    def _build_sprites(self):
+        self._sprites = []
+        for name in STYLE_NAMES:
+            color, radius = STYLES[name][0], STYLES[name][1]
+            steps = []
+            for step in range(FADE_STEPS):
+                alpha = int(255 * (step + 1) / FADE_STEPS)
+                surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(surf, color + (alpha,), (radius, radius), radius)
+                steps.append(surface_memory.track(surf, "Particles", f"{name}/{step}"))
+            self._sprites.append(steps)
+
+    def blit_list(self, size, map_x: int, map_y: int):
+        """(sprite, screen pos) for every live particle on a `size` screen."""
+        live = self.life > 0
+        if not live.any():
+            return []
+        if self._sprites is None:
+            self._build_sprites()
+
+        idx = np.flatnonzero(live)
+        x = self.pos[idx, 0] + map_x
+        y = self.pos[idx, 1] + map_y
+        w, h = size
+        on_screen = (x > -8) & (x < w + 8) & (y > -8) & (y < h + 8)
+        if not on_screen.any():
+            return []
+        idx, x, y = idx[on_screen], x[on_screen], y[on_screen]
+
+        fade = np.minimum((self.life[idx] / self.max_life[idx] * FADE_STEPS).astype(np.int32),
+                          FADE_STEPS - 1)
+        radius = self._radius[self.style[idx]]
+        xs = (x.astype(np.int32) - radius).tolist()
+        ys = (y.astype(np.int32) - radius).tolist()
+        sprites = self._sprites
+        return [(sprites[s][f], (px, py)) for s, f, px, py in zip(self.style[idx].tolist(), fade.tolist(), xs, ys)]
+
+    def draw(self, screen: pygame.Surface, map_x: int, map_y: int):
+        blits = self.blit_list(screen.get_size(), map_x, map_y)
+        if blits:
+            screen.blits(blits, doreturn=False)
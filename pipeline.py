@@ -0,0 +1,237 @@
+"""Pipelined play: Game.update on a simulation thread, drawing on the main thread.
+
+    pipe = SimPipeline(game, clock=pygame.time.get_ticks)
+    pipe.start()
+    # every frame, on the main thread:
+    pipe.post_event(event)               # instead of game.handle_event(event)
+    frame = pipe.latest()                # newest WorldSnapshot (or None yet)
+    draw_snapshot(screen, frame)
+    ...
+    pipe.pause(); pipe.resume()          # park the simulation (game is safe to touch)
+    frame.idle and frame.inputs == pipe.posted   # static screen, all input applied
+    pipe.stop()                          # join; re-raises a simulation error
+
+The simulation thread owns the Game: it applies forwarded events, steps it
+at a fixed rate and publishes an immutable WorldSnapshot per tick: the world
+layer as a tuple of (surface, pos) blits (shared, never-mutated frames, so
+positions plus frame identity), a pre-drawn UI layer and the HUD values.
+Snapshots are double buffered: the renderer holds the front one while the
+simulation publishes the back one, and a newer back snapshot replaces an
+unconsumed one. A third UI layer means the simulation never waits on the
+renderer to draw the next UI.
+
+While the game is idle (paused, game over, mission complete) the simulation
+blocks on the event queue instead of ticking, re-publishing at most every
+`idle_timeout` seconds, and wakes as soon as an event is posted.
+
+The main thread only composites and flips (SDL wants the window there).
+Under the GIL the overlap comes from pygame releasing it during blits; on
+free-threaded builds both sides run in parallel.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+import pygame
+
+import surface_memory
+
+
+@dataclass(frozen=True)
+class WorldSnapshot:
+    tick: int
+    now_ms: int
+    world: tuple           # ((surface, (x, y)), ...) in paint order
+    ui: pygame.Surface     # HUD/minimap/overlays, transparent elsewhere
+    hp: int
+    max_hp: int
+    kills: int
+    level: int
+    survival_ms: int
+    paused: bool
+    game_over: bool
+    mission_completed: bool
+    return_to_menu: bool
+    idle: bool
+    inputs: int            # events applied so far; compare with SimPipeline.posted
+
+
+def draw_snapshot(screen: pygame.Surface, frame: WorldSnapshot):
+    screen.fill((0, 0, 0))
+    screen.blits(frame.world, doreturn=False)
+    screen.blit(frame.ui, (0, 0))
+
+
+class SimPipeline:
+    def __init__(self, game, clock=pygame.time.get_ticks, tick_rate: int = 60, on_tick=None,
+                 idle_timeout: float = 0.25):
+        """clock() -> now_ms for each tick; on_tick(game, work_ms) runs on the sim thread."""
+        self.game = game
+        self.clock = clock
+        self.tick_rate = tick_rate
+        self.on_tick = on_tick
+        self.idle_timeout = idle_timeout
+
+        size = (game.SCREEN_WIDTH, game.SCREEN_HEIGHT)
+        self._layers = []
+        for i in range(3):
+            layer = pygame.Surface(size, pygame.SRCALPHA)
+            self._layers.append(surface_memory.track(layer, "SimPipeline", f"ui layer {i}"))
+
+        self._cond = threading.Condition()
+        self._front = None      # held by the renderer
+        self._back = None       # published, not yet taken
+        self._events = queue.SimpleQueue()   # None just wakes an idle simulation
+        self._pause_requested = False
+        self._paused = False
+        self._game_paused = False  # pause() paused the game, resume() unpauses it
+        self._stopping = False
+        self._thread = None
+        self.error = None
+        self.ticks = 0
+        self.posted = 0
+        self._applied = 0
+        self.dropped = 0        # snapshots replaced before the renderer took them
+
+    # -------------------- MAIN THREAD --------------------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sim", daemon=True)
+        self._thread.start()
+
+    def post_event(self, event: pygame.event.Event):
+        self.posted += 1
+        self._events.put(event)
+
+    def latest(self):
+        """Newest snapshot; the previous front one is released to the simulation."""
+        with self._cond:
+            if self._back is not None:
+                self._front, self._back = self._back, None
+            return self._front
+
+    def pause(self, timeout: float = 1.0) -> bool:
+        """Ask the simulation to park between ticks; True once it has.
+
+        A parked game is also paused (its clock frozen) so the time spent
+        parked doesn't count towards survival, the boss timer or cooldowns.
+        """
+        with self._cond:
+            self._pause_requested = True
+            self._cond.notify_all()
+            self._events.put(None)
+            parked = self._cond.wait_for(lambda: self._paused or not self.running, timeout)
+            if parked and self._paused and not self.game.PAUSED:
+                self.game.set_paused(True)
+                self._game_paused = True
+            return parked
+
+    def resume(self):
+        """Undo pause(); a game the player had paused stays paused."""
+        with self._cond:
+            if self._game_paused:
+                self.game.set_paused(False)
+                self._game_paused = False
+            self._pause_requested = False
+            self._cond.notify_all()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout: float = 2.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._events.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.error is not None:
+            raise RuntimeError("simulation thread failed") from self.error
+
+    # -------------------- SIMULATION THREAD --------------------
+    def _free_layer(self):
+        with self._cond:
+            busy = {id(s.ui) for s in (self._front, self._back) if s is not None}
+        return next(layer for layer in self._layers if id(layer) not in busy)
+
+    def _snapshot(self, now_ms) -> WorldSnapshot:
+        game = self.game
+        world = tuple(game.world_blits())
+
+        layer = self._free_layer()
+        layer.fill((0, 0, 0, 0))
+        screen = game.screen
+        game.screen = layer
+        try:
+            game.draw_ui()
+        finally:
+            game.screen = screen
+
+        return WorldSnapshot(
+            tick=self.ticks, now_ms=now_ms, world=world, ui=layer,
+            hp=game.player.hp, max_hp=game.player.max_hp, kills=game.kills, level=game.level,
+            survival_ms=game.survival_time_ms, paused=game.PAUSED, game_over=game.GAME_OVER,
+            mission_completed=game.mission_completed, return_to_menu=game.return_to_menu,
+            idle=game.idle, inputs=self._applied,
+        )
+
+    def _apply(self, event):
+        if event is not None:
+            self.game.handle_event(event)
+            self._applied += 1
+
+    def _wait_for_input(self):
+        """Idle screen: block until an event arrives (or the timeout) instead of ticking."""
+        try:
+            self._apply(self._events.get(timeout=self.idle_timeout))
+        except queue.Empty:
+            pass
+
+    def _wait_if_paused(self) -> bool:
+        """Park while a pause is requested. False once stopping."""
+        with self._cond:
+            while self._pause_requested and not self._stopping:
+                self._paused = True
+                self._cond.notify_all()
+                self._cond.wait()
+            self._paused = False
+            return not self._stopping
+
+    def _run(self):
+        period = 1.0 / self.tick_rate
+        next_tick = time.perf_counter()
+        try:
+            while self._wait_if_paused():
+                start = time.perf_counter()
+                while True:
+                    try:
+                        self._apply(self._events.get_nowait())
+                    except queue.Empty:
+                        break
+                now_ms = self.clock()
+                self.game.update(now_ms)
+                frame = self._snapshot(now_ms)
+                self.ticks += 1
+                with self._cond:
+                    if self._back is not None:
+                        self.dropped += 1
+                    self._back = frame
+                if self.on_tick is not None:
+                    self.on_tick(self.game, (time.perf_counter() - start) * 1000)
+
+                if frame.idle and self._events.empty():
+                    self._wait_for_input()
+                    next_tick = time.perf_counter()
+                    continue
+                next_tick += period
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()  # fell behind: don't try to catch up
+        except BaseException as e:
+            self.error = e
+        finally:
+            with self._cond:
+                self._cond.notify_all()
@@ -0,0 +1,83 @@
+from collections import deque
+
+
+class QualityGovernor:
+    """Steps through quality tiers to keep frame time inside the budget.
+
+    Every tier is presentation-only so replays stay deterministic.
+
+    Tiers are cumulative (tier 3 also has everything from tiers 1-2):
+        1: redraw the HUD every other frame
+        2: drop the decorative upper layer
+        3: thin out sound effects
+        4: cap the number of projectiles drawn
+        5: on-screen enemies animate every other tick
+
+    Off-screen enemies never animate (Game's LOD tiers), so tier 5 is a
+    visible cut to on-screen animation; it comes last, after the cheaper
+    tiers have not been enough.
+
+    Hysteresis: degrade as soon as the slow frames (90th percentile) exceed
+    the budget, but only recover after a longer stretch where the average
+    sits well under it, and never change twice within `cooldown` frames.
+    """
+
+    MAX_TIER = 5
+
+    def __init__(self, target_fps=60, window=30, degrade_ratio=1.0, recover_ratio=0.7, cooldown=90):
+        self.budget_ms = 1000.0 / target_fps
+        self.window = window
+        self.degrade_ratio = degrade_ratio
+        self.recover_ratio = recover_ratio
+        self.cooldown = cooldown
+
+        self.enabled = True
+        self.tier = 0
+        self.samples = deque(maxlen=window)
+        self.frame = 0
+        self.last_change_frame = 0
+
+    def record(self, frame_ms: float):
+        """Feed the work time of the last frame (excluding the vsync/tick sleep)."""
+        self.frame += 1
+        self.samples.append(frame_ms)
+        if not self.enabled or len(self.samples) < self.window:
+            return
+        since_change = self.frame - self.last_change_frame
+        if since_change < self.cooldown:
+            return
+
+        ordered = sorted(self.samples)
+        p90 = ordered[int(len(ordered) * 0.9) - 1]
+        avg = sum(ordered) / len(ordered)
+
+        if p90 > self.budget_ms * self.degrade_ratio and self.tier < self.MAX_TIER:
+            self._set_tier(self.tier + 1)
+        elif avg < self.budget_ms * self.recover_ratio and self.tier > 0 and since_change >= 3 * self.cooldown:
+            self._set_tier(self.tier - 1)
+
+    def _set_tier(self, tier: int):
+        self.tier = tier
+        self.last_change_frame = self.frame
+        self.samples.clear()
+
+    # -------------------- TIER SETTINGS --------------------
+    @property
+    def hud_every(self) -> int:
+        return 2 if self.tier >= 1 else 1
+
+    @property
+    def draw_upper_layer(self) -> bool:
+        return self.tier < 2
+
+    @property
+    def sfx_min_interval_ms(self) -> int:
+        return 250 if self.tier >= 3 else 0
+
+    @property
+    def max_drawn_projectiles(self):
+        return 48 if self.tier >= 4 else None
+
+    @property
+    def animate_every(self) -> int:
+        return 2 if self.tier >= 5 else 1
@@ -0,0 +1,133 @@
+"""Render backends: software Surface blits or SDL2 Renderer/Texture.
+
+    backend = render_backend.create("texture", (w, h), "ROBO Survive")
+    screen = backend.screen          # Menu/Game draw their 2D UI onto this
+    backend.draw_game(game)          # instead of game.draw()
+    backend.present()                # instead of pygame.display.flip()
+
+The software backend is the original path: draw everything onto the
+display surface and flip. The texture backend draws Game.world_blits() (map,
+sprites, upper layer, fog, projectiles, particles) as textures on an SDL
+Renderer. Static surfaces are uploaded once: atlas frames are subsurface
+views, so a whole sprite atlas becomes one texture drawn with source rects.
+The HUD, minimap and overlays still draw onto `screen`, which is a
+transparent layer uploaded once per frame and drawn on top.
+
+It also works with SDL's "software" render driver, so both paths can be
+compared on machines without a GPU (render_bench.py --backend texture).
+If pygame._sdl2 or the renderer is unavailable, create() falls back to
+the software backend.
+"""
+import weakref
+
+import pygame
+
+BACKENDS = ("software", "texture")
+
+
+class SoftwareBackend:
+    name = "software"
+
+    def __init__(self, size, title=None, screen=None):
+        if screen is None:
+            screen = pygame.display.set_mode(size)
+            if title:
+                pygame.display.set_caption(title)
+        self.screen = screen
+
+    def draw_game(self, game):
+        game.draw()
+
+    def present(self):
+        pygame.display.flip()
+
+    def read_pixels(self) -> pygame.Surface:
+        return self.screen
+
+
+class TextureBackend:
+    name = "texture"
+
+    def __init__(self, size, title=None, driver=None):
+        from pygame._sdl2 import video
+
+        # SDL won't put a Renderer on the set_mode() window, but convert() and
+        # convert_alpha() need a display mode: keep a hidden 1x1 one for that
+        # and render into a window of our own
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        index = -1
+        if driver is not None:
+            names = [info.name for info in video.get_drivers()]
+            index = names.index(driver)  # ValueError -> caller falls back
+        self._video = video
+        self.window = video.Window(title or "pygame", size)
+        self.renderer = video.Renderer(self.window, index=index)
+        self.driver = driver
+
+        # UI layer: Menu/Game 2D drawing, uploaded once per frame
+        self.screen = pygame.Surface(size, pygame.SRCALPHA)
+        self._ui = video.Texture(self.renderer, size, streaming=True)
+        self._ui.blend_mode = 1  # SDL_BLENDMODE_BLEND
+        self._textures = weakref.WeakKeyDictionary()  # Surface -> Texture
+        self._world_drawn = False
+
+    def _texture(self, surface):
+        """Texture for a static top-level surface, uploaded on first use."""
+        texture = self._textures.get(surface)
+        if texture is None:
+            per_pixel = surface.get_flags() & pygame.SRCALPHA
+            alpha = surface.get_alpha()
+            if per_pixel or surface.get_colorkey() is not None or (alpha is not None and alpha < 255):
+                # Blend from an ARGB texture; blending an RGB texture falls
+                # off SDL's fast path (~20x slower with the software driver)
+                texture = self._video.Texture.from_surface(
+                    self.renderer, surface if per_pixel else surface.convert_alpha())
+                texture.blend_mode = 1  # SDL_BLENDMODE_BLEND
+            else:
+                texture = self._video.Texture.from_surface(self.renderer, surface)
+                texture.blend_mode = 0  # opaque: plain copy
+            self._textures[surface] = texture
+        return texture
+
+    def draw_game(self, game):
+        renderer = self.renderer
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
+        for surface, (x, y) in game.world_blits():
+            root = surface.get_abs_parent()
+            texture = self._texture(root)
+            alpha = root.get_alpha()
+            texture.alpha = 255 if alpha is None else alpha
+            w, h = surface.get_size()
+            if root is surface:
+                texture.draw(dstrect=(x, y, w, h))
+            else:
+                texture.draw(srcrect=(*surface.get_abs_offset(), w, h), dstrect=(x, y, w, h))
+        self._world_drawn = True
+
+        self.screen.fill((0, 0, 0, 0))
+        game.draw_ui()
+
+    def present(self):
+        if not self._world_drawn:
+            # Menu frame: the UI layer is the whole picture
+            self.renderer.draw_color = (0, 0, 0, 255)
+            self.renderer.clear()
+        self._ui.update(self.screen)
+        self._ui.draw()
+        self.renderer.present()
+        self._world_drawn = False
+
+    def read_pixels(self) -> pygame.Surface:
+        """Last presented frame (for tests/benchmarks)."""
+        return self.renderer.to_surface()
+
+
+def create(name="software", size=(1040, 672), title=None, driver=None):
+    """Backend `name`; falls back to software if the texture path can't start."""
+    if name == "texture":
+        try:
+            return TextureBackend(size, title, driver)
+        except Exception as e:  # no pygame._sdl2, no such driver, no renderer
+            print(f"texture renderer unavailable ({e}); using software")
+    return SoftwareBackend(size, title)
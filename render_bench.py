@@ -0,0 +1,303 @@
+"""Headless render benchmark with golden frame hashes and time budgets.
+
+Renders canonical scenes (Game.draw, HUD, overlays, Menu states) under the
+SDL dummy driver, times each, and hashes the first frame:
+
+    python render_bench.py                    # check against the baseline
+    python render_bench.py --update           # record hashes + budgets
+    python render_bench.py --scenes boss_fight menu_main --repeat 200
+    python render_bench.py --backend texture --render-driver software
+
+A hash mismatch means an edit changed pixels; a scene slower than its
+budget * tolerance is a regression. Either makes the run exit non-zero, as
+does a scene with no recorded hash or budget (until --update records it).
+Hashes depend on the fonts available and budgets on the machine, so record
+the baseline on the machine that runs the check. Each backend keeps its own
+entries (texture ones are stored as "<scene>@texture"), and timings include
+presenting the frame so both backends are compared end to end.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import pygame
+
+import render_backend
+from batch_sim import SCREEN_HEIGHT, SCREEN_WIDTH, init_headless
+from input_source import BotInput, InputAction
+
+GOLDEN_PATH = "render_golden.json"
+BUDGET_PATH = "render_budget.json"
+NOW_MS = 42_000  # fixed clock so timers/HUD text render the same every run
+
+
+def _idle(game, now_ms):
+    return InputAction()
+
+
+def _make_game(screen, enemies=0, seed=1, fog=False):
+    from game import Game
+
+    random.seed(seed)
+    game = Game(screen, SCREEN_WIDTH, SCREEN_HEIGHT, get_ticks=lambda: NOW_MS,
+                input_source=BotInput(_idle))
+    game.mission_type = "collect_item0"
+    game.survival_time_ms = NOW_MS - game.start_time_ms
+    game.enemy_list = []
+    # Fog hides most enemies and adds the darkness mask; only fog_of_war
+    # measures it so the sprite scenes keep drawing every enemy.
+    game.FOG_OF_WAR = fog
+    _scatter_enemies(game, enemies)
+    return game
+
+
+def _scatter_enemies(game, count):
+    from enemy import Enemy
+
+    view = game.get_view_world_rect()
+    for i in range(count):
+        enemy = Enemy(game.MAP_WIDTH, game.MAP_HEIGHT, game.ENEMY_SIZE, "Scarab")
+        # Most on screen so the draw cost is real; some off screen
+        area = view if i % 4 else pygame.Rect(0, 0, game.MAP_WIDTH, game.MAP_HEIGHT)
+        enemy.rect.x = random.randint(area.left, area.right - enemy.size)
+        enemy.rect.y = random.randint(area.top, area.bottom - enemy.size)
+        enemy.current_animation = random.choice(("walk_left", "walk_right", "idle_right"))
+        game.enemy_list.append(enemy)
+
+
+# -------------------- SCENES --------------------
+# Each scene builder returns a Game (drawn through the backend) or a draw()
+# callable; state must not drift between calls so every repeat renders the
+# same frame.
+def scene_empty_map(screen):
+    game = _make_game(screen)
+    return game
+
+
+def scene_enemies_500(screen):
+    game = _make_game(screen, enemies=500)
+    return game
+
+
+def scene_fog_of_war(screen):
+    game = _make_game(screen, enemies=500, fog=True)
+    return game
+
+
+def scene_projectiles(screen):
+    from fireball import Fireball
+
+    game = _make_game(screen, enemies=20)
+    px, py = game.get_player_world_rect().center
+    for i in range(64):
+        variant = "blood" if i % 8 == 0 else "normal"
+        game.fire_group.add(Fireball(px + (i % 16) * 24 - 192, py + (i // 16) * 30 - 45,
+                                     "left" if i % 2 else "right", variant))
+    return game
+
+
+def scene_particles_cap(screen):
+    game = _make_game(screen, enemies=50)
+    px, py = game.get_player_world_rect().center
+    i = 0
+    while game.particles.live_count < game.particles.capacity:
+        game.particles.death_burst(px + (i % 20) * 40 - 400, py + (i // 20) * 40 - 200, big=True)
+        i += 1
+    for _ in range(6):
+        game.particles.update()
+    return game
+
+
+def scene_boss_fight(screen):
+    game = _make_game(screen, enemies=30)
+    game.level_manager.spawn_boss()
+    boss = game.boss
+    px, py = game.get_player_world_rect().center
+    boss.rect.center = (px + 220, py - 60)
+    boss.hp = boss.max_hp * 3 // 5
+    return game
+
+
+def scene_bullet_hell(screen):
+    game = _make_game(screen, enemies=30)
+    game.level_manager.spawn_boss()
+    boss = game.boss
+    px, py = game.get_player_world_rect().center
+    boss.rect.center = (px + 260, py - 40)
+    # Fill the pool with every pattern, then let it spread out
+    for t in range(400):
+        if t % 3 == 0:
+            game.bullets.spiral(*boss.rect.center, 12, t * 7.0, 3.0)
+        if t % 20 == 0:
+            game.bullets.radial(*boss.rect.center, 48, 2.5, offset_deg=t)
+        game.bullets.update()
+    return game
+
+
+def scene_hud_cached(screen):
+    game = _make_game(screen, enemies=50)
+    game.quality.tier = 1  # HUD redrawn every other frame into the cache
+    return game
+
+
+def scene_pause_overlay(screen):
+    game = _make_game(screen, enemies=50)
+    game.PAUSED = True
+    return game
+
+
+def scene_game_over_overlay(screen):
+    game = _make_game(screen, enemies=50)
+    game.player.hp = 0
+    game.GAME_OVER = True
+    return game
+
+
+def scene_mission_complete_overlay(screen):
+    game = _make_game(screen, enemies=50)
+    game.item0_count = 10
+    game.mission_completed = True
+    game.mission_complete_time_ms = NOW_MS
+    return game
+
+
+def _menu_scene(state):
+    def build(screen):
+        from menu import Menu
+
+        menu = Menu(screen, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        def draw():
+            menu.game_state = state
+            menu.avatar_frame_index = 0
+            menu.avatar_timer = 0
+            menu.update_and_draw()
+        return draw
+    return build
+
+
+SCENES = {
+    "empty_map": scene_empty_map,
+    "enemies_500": scene_enemies_500,
+    "fog_of_war": scene_fog_of_war,
+    "projectiles": scene_projectiles,
+    "particles_cap": scene_particles_cap,
+    "boss_fight": scene_boss_fight,
+    "bullet_hell": scene_bullet_hell,
+    "hud_cached": scene_hud_cached,
+    "pause_overlay": scene_pause_overlay,
+    "game_over_overlay": scene_game_over_overlay,
+    "mission_complete_overlay": scene_mission_complete_overlay,
+    "menu_main": _menu_scene("MENU"),
+    "menu_start": _menu_scene("START_SUB"),
+    "menu_options": _menu_scene("OPTIONS"),
+    "menu_controls": _menu_scene("CONTROLS"),
+}
+
+
+def frame_hash(screen) -> str:
+    return hashlib.sha1(pygame.image.tobytes(screen, "RGB")).hexdigest()
+
+
+def run_scene(backend, name, repeat, warmup=5):
+    """Returns (hash of the first frame, median ms, p90 ms)."""
+    scene = SCENES[name](backend.screen)
+    if callable(scene):
+        def draw():
+            scene()
+            backend.present()
+    else:
+        def draw():
+            backend.draw_game(scene)
+            backend.present()
+    draw()
+    digest = frame_hash(backend.read_pixels())
+    for _ in range(warmup):
+        draw()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        draw()
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return digest, statistics.median(times), times[int(len(times) * 0.9) - 1]
+
+
+def _load(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render benchmark with golden hashes and budgets.")
+    parser.add_argument("--scenes", nargs="+", default=list(SCENES), choices=list(SCENES))
+    parser.add_argument("--repeat", type=int, default=120, help="timed draws per scene")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="fail when median ms > budget * tolerance")
+    parser.add_argument("--golden", default=GOLDEN_PATH)
+    parser.add_argument("--budget", default=BUDGET_PATH)
+    parser.add_argument("--update", action="store_true", help="record hashes and budgets for these scenes")
+    parser.add_argument("--no-timing", action="store_true", help="only check pixels")
+    parser.add_argument("--backend", choices=render_backend.BACKENDS, default="software")
+    parser.add_argument("--render-driver", metavar="NAME", help="SDL render driver for --backend texture")
+    args = parser.parse_args(argv)
+
+    screen = init_headless()
+    backend = render_backend.create(args.backend, screen.get_size(), driver=args.render_driver) \
+        if args.backend != "software" else render_backend.SoftwareBackend(screen.get_size(), screen=screen)
+    suffix = "" if backend.name == "software" else f"@{backend.name}"
+    golden = _load(args.golden)
+    budget = _load(args.budget)
+
+    failures = 0
+    print(f"{'scene':<34} {'median':>8} {'p90':>8} {'budget':>8}  pixels")
+    for scene in args.scenes:
+        digest, median, p90 = run_scene(backend, scene, args.repeat)
+        name = scene + suffix
+        if args.update:
+            golden[name] = digest
+            budget[name] = round(median, 3)
+
+        expected = golden.get(name)
+        pixels = "MISSING" if expected is None else "ok" if expected == digest else "CHANGED"
+        limit = budget.get(name)
+        timing = ""
+        if not args.no_timing:
+            if limit is None:
+                timing = "  NO BUDGET"
+                failures += 1
+            elif median > limit * args.tolerance:
+                timing = f"  SLOWER (+{(median / limit - 1) * 100:.0f}%)"
+                failures += 1
+        if pixels != "ok":
+            failures += 1
+        limit_s = f"{limit:8.3f}" if limit is not None else f"{'-':>8}"
+        print(f"{name:<34} {median:8.3f} {p90:8.3f} {limit_s}  {pixels}{timing}")
+
+    if args.update:
+        _save(args.golden, golden)
+        _save(args.budget, budget)
+        print(f"updated {args.golden} and {args.budget}")
+        return 0
+
+    if failures:
+        print(f"{failures} failure(s); record missing entries with --update")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import math
+
+
+class SpatialGrid:
+    """Uniform grid over points for nearest-neighbour queries.
+
+    rebuild() buckets (x, y, item) entries by cell in one pass. nearest()
+    walks square rings of cells outwards from the query point and stops as
+    soon as the next ring cannot hold anything closer, so a query only looks
+    at the few cells around it instead of every entry. Ties go to the entry
+    added first, which keeps results deterministic.
+    """
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> [(order, x, y, item)]
+        self.count = 0
+
+    def rebuild(self, entries):
+        cs = self.cell_size
+        cells = {}
+        order = 0
+        for x, y, item in entries:
+            cells.setdefault((int(x // cs), int(y // cs)), []).append((order, x, y, item))
+            order += 1
+        self.cells = cells
+        self.count = order
+
+    def nearest(self, x, y, max_dist: float = math.inf):
+        """Closest item within `max_dist` of (x, y), or None."""
+        if not self.cells:
+            return None
+        cs = self.cell_size
+        qx, qy = int(x // cs), int(y // cs)
+        best = None
+        best_key = (max_dist * max_dist, math.inf)
+        if max_dist == math.inf:
+            max_ring = max(max(abs(cx - qx), abs(cy - qy)) for cx, cy in self.cells)
+        else:
+            max_ring = int(max_dist // cs) + 1
+
+        ring = 0
+        while True:
+            for cell in self._ring(qx, qy, ring):
+                for order, ex, ey, item in self.cells.get(cell, ()):
+                    key = ((ex - x) ** 2 + (ey - y) ** 2, order)
+                    if key < best_key:
+                        best_key, best = key, item
+            # Anything in ring + 1 is at least ring * cell_size away
+            reach = ring * cs
+            if best is not None and best_key[0] <= reach * reach:
+                return best
+            ring += 1
+            if ring > max_ring:
+                return best
+
+    @staticmethod
+    def _ring(qx, qy, ring):
+        if ring == 0:
+            yield (qx, qy)
+            return
+        for cx in range(qx - ring, qx + ring + 1):
+            yield (cx, qy - ring)
+            yield (cx, qy + ring)
+        for cy in range(qy - ring + 1, qy + ring):
+            yield (qx - ring, cy)
+            yield (qx + ring, cy)
@@ -0,0 +1,101 @@
+import bisect
+import random
+
+import pygame
+
+
+class SpawnIndex:
+    """Walkable spawn tiles from the collision grid, bucketed by region.
+
+    A tile qualifies when an entity `footprint` tiles wide fits there without
+    touching a wall. sample() returns a spot off screen within a distance
+    band around the player, with no rejection loop: tiles are pre-bucketed
+    into `region_tiles`-sized squares, and only regions straddling the view
+    or band edges are filtered tile by tile. The eligible set is rebuilt
+    lazily when the player or camera crosses into another tile.
+    """
+
+    def __init__(self, tiles, footprint: int = 1, region_tiles: int = 8):
+        self.tiles = tiles
+        self.footprint = footprint
+        self.region_tiles = region_tiles
+        ts = tiles.tile_size
+
+        self.regions = {}  # (rx, ry) -> [tile index]
+        self.all_tiles = []
+        for ty in range(tiles.rows - footprint + 1):
+            for tx in range(tiles.cols - footprint + 1):
+                rect = pygame.Rect(tx * ts, ty * ts, footprint * ts, footprint * ts)
+                if tiles.rect_blocked(rect):
+                    continue
+                index = ty * tiles.cols + tx
+                self.regions.setdefault((tx // region_tiles, ty // region_tiles), []).append(index)
+                self.all_tiles.append(index)
+
+        self._key = None
+        self._buckets = []
+        self._prefix = []
+
+    def tile_rect(self, index: int) -> pygame.Rect:
+        ts = self.tiles.tile_size
+        ty, tx = divmod(index, self.tiles.cols)
+        return pygame.Rect(tx * ts, ty * ts, self.footprint * ts, self.footprint * ts)
+
+    def refresh(self, view: pygame.Rect, center, min_dist: int, max_dist: int):
+        ts = self.tiles.tile_size
+        key = (view.x // ts, view.y // ts, center[0] // ts, center[1] // ts, min_dist, max_dist)
+        if key == self._key:
+            return
+        self._key = key
+
+        # The key is tile-quantized, so pad by a tile to stay valid until it changes
+        view = view.inflate(ts * 2, ts * 2)
+        min_dist, max_dist = min_dist + ts, max(min_dist + ts, max_dist - ts)
+        cx, cy = center
+        min_sq, max_sq = min_dist * min_dist, max_dist * max_dist
+        span = self.region_tiles * ts
+        reach = self.footprint * ts
+
+        buckets = []
+        for (rx, ry), indexes in self.regions.items():
+            # Region bounds, grown by the footprint so every tile rect fits inside
+            region = pygame.Rect(rx * span, ry * span, span + reach, span + reach)
+            near_x = max(region.left - cx, 0, cx - region.right)
+            near_y = max(region.top - cy, 0, cy - region.bottom)
+            far_x = max(abs(region.left - cx), abs(region.right - cx))
+            far_y = max(abs(region.top - cy), abs(region.bottom - cy))
+            if near_x * near_x + near_y * near_y > max_sq or far_x * far_x + far_y * far_y < min_sq:
+                continue
+            if not view.colliderect(region) and far_x * far_x + far_y * far_y <= max_sq \
+                    and near_x * near_x + near_y * near_y >= min_sq:
+                buckets.append(indexes)
+                continue
+            # Straddles the view or a band edge: filter its tiles
+            kept = []
+            for index in indexes:
+                rect = self.tile_rect(index)
+                dx, dy = rect.centerx - cx, rect.centery - cy
+                if min_sq <= dx * dx + dy * dy <= max_sq and not view.colliderect(rect):
+                    kept.append(index)
+            if kept:
+                buckets.append(kept)
+
+        self._buckets = buckets
+        self._prefix = []
+        total = 0
+        for bucket in buckets:
+            total += len(bucket)
+            self._prefix.append(total)
+
+    def sample(self, view: pygame.Rect, center, min_dist: int, max_dist: int):
+        """Top-left WORLD pixel of a random eligible tile, or None if none."""
+        self.refresh(view, center, min_dist, max_dist)
+        if not self._prefix:
+            if not self.all_tiles:
+                return None
+            # Band is empty (tiny map / huge view): any walkable tile will do
+            return self.tile_rect(random.choice(self.all_tiles)).topleft
+        pick = random.randrange(self._prefix[-1])
+        b = bisect.bisect_right(self._prefix, pick)
+        start = self._prefix[b - 1] if b else 0
+        return self.tile_rect(self._buckets[b][pick - start]).topleft
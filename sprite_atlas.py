@@ -0,0 +1,105 @@
+import os
+import pygame
+
+import asset_pack
+import surface_memory
+
+
+# Animation name -> (folder candidates, side). The first folder that exists
+# wins, which covers the "idle" vs "Idle" casing across character packs.
+ANIMATION_FOLDERS = {
+    "idle_left": (("idle", "Idle"), "left"),
+    "idle_right": (("idle", "Idle"), "right"),
+    "walk_left": (("walk",), "left"),
+    "walk_right": (("walk",), "right"),
+    "death_left": (("death",), "left"),
+    "death_right": (("death",), "right"),
+}
+
+MISSING_COLOR = (255, 0, 255, 255)
+
+
+class SpriteAtlas:
+    """All animation frames of one character, packed into a single surface.
+
+    One row per animation, one column per frame. `animations` maps names to
+    lists of subsurface views into `surface` (no per-frame pixel copies) and
+    `frame_table` maps names to the matching source rects.
+    """
+
+    def __init__(self, sprite_root: str, size: int, alpha: int = 255):
+        self.sprite_root = sprite_root
+        self.size = size
+
+        sources = {name: self._load_frames(sprite_root, folders, side)
+                   for name, (folders, side) in ANIMATION_FOLDERS.items()}
+
+        columns = max(1, max(len(frames) for frames in sources.values()))
+        self.surface = pygame.Surface((columns * size, len(sources) * size), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+
+        self.frame_table = {}
+        self.animations = {}
+        for row, (name, frames) in enumerate(sources.items()):
+            rects = []
+            for col, img in enumerate(frames):
+                rect = pygame.Rect(col * size, row * size, size, size)
+                if img is None:
+                    self.surface.fill(MISSING_COLOR, rect)  # missing sprite fallback
+                else:
+                    self.surface.blit(pygame.transform.scale(img, (size, size)), rect)
+                rects.append(rect)
+            self.frame_table[name] = rects
+
+        if alpha < 255:
+            # Bake translucency into the pixels so it survives subsurface views
+            self.surface.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+
+        owner = f"SpriteAtlas {sprite_root}@{size}"
+        surface_memory.track(self.surface, owner, sprite_root)
+        for name, rects in self.frame_table.items():
+            self.animations[name] = [surface_memory.track(self.surface.subsurface(rect), owner, name)
+                                     for rect in rects]
+
+    @staticmethod
+    def _load_frames(sprite_root, folders, side):
+        folder = None
+        for candidate in folders:
+            path = os.path.join(sprite_root, candidate, side)
+            if asset_pack.exists(path):
+                folder = path
+                break
+
+        frames = []
+        if folder is not None:
+            i = 0
+            while True:
+                path = os.path.join(folder, f"{i}.png")
+                if not asset_pack.exists(path):
+                    break
+                try:
+                    frames.append(asset_pack.load_image(path).convert_alpha())
+                except Exception as e:
+                    print(f"Error loading {path}: {e}")
+                i += 1
+
+        if not frames:
+            frames.append(None)
+        return frames
+
+
+_atlas_cache = {}
+
+
+def get_atlas(sprite_root: str, size: int, alpha: int = 255) -> SpriteAtlas:
+    """Shared atlas per (character, size, alpha); built on first use."""
+    key = (sprite_root, size, alpha)
+    atlas = _atlas_cache.get(key)
+    if atlas is None:
+        atlas = SpriteAtlas(sprite_root, size, alpha)
+        _atlas_cache[key] = atlas
+    return atlas
+
+
+def clear_cache():
+    _atlas_cache.clear()
@@ -0,0 +1,159 @@
+"""Bookkeeping for Surfaces created through the asset paths.
+
+Wrap a surface when it is created:
+
+    self.image = surface_memory.track(img, "DropItem", path)
+
+Entries are dropped automatically when the surface is garbage collected, so
+totals are live. Subsurface views share their parent's pixels and count as
+0 bytes. report() also groups surfaces with identical pixel data, which
+are candidates for sharing.
+"""
+import hashlib
+import itertools
+import weakref
+
+import pygame
+
+
+class _Entry:
+    __slots__ = ("id", "owner", "name", "size", "nbytes", "is_view", "ref")
+
+    def __init__(self, entry_id, surface, owner, name):
+        self.id = entry_id
+        self.owner = owner
+        self.name = name
+        self.size = surface.get_size()
+        self.is_view = surface.get_parent() is not None
+        self.nbytes = 0 if self.is_view else surface.get_pitch() * surface.get_height()
+        self.ref = weakref.ref(surface)
+
+
+_entries = {}
+_ids = itertools.count()
+_peak_bytes = 0
+_live_bytes = 0
+
+overlay_enabled = False
+
+
+def _forget(entry_id):
+    global _live_bytes
+    entry = _entries.pop(entry_id, None)
+    if entry is not None:
+        _live_bytes -= entry.nbytes
+
+
+def track(surface: pygame.Surface, owner: str, name: str = "") -> pygame.Surface:
+    """Register `surface` under `owner` and return it unchanged."""
+    global _live_bytes, _peak_bytes
+    entry = _Entry(next(_ids), surface, owner, name)
+    _entries[entry.id] = entry
+    weakref.finalize(surface, _forget, entry.id)
+    _live_bytes += entry.nbytes
+    _peak_bytes = max(_peak_bytes, _live_bytes)
+    return surface
+
+
+def live_bytes() -> int:
+    return _live_bytes
+
+
+def peak_bytes() -> int:
+    return _peak_bytes
+
+
+def totals_by_owner() -> dict:
+    """owner -> (surface count, bytes), largest first."""
+    totals = {}
+    for entry in _entries.values():
+        count, nbytes = totals.get(entry.owner, (0, 0))
+        totals[entry.owner] = (count + 1, nbytes + entry.nbytes)
+    return dict(sorted(totals.items(), key=lambda kv: kv[1][1], reverse=True))
+
+
+def find_duplicates() -> list:
+    """Groups of live (non-view) surfaces holding identical pixels.
+
+    Returns [(bytes wasted, [entries])], most wasteful first.
+    """
+    groups = {}
+    for entry in list(_entries.values()):
+        surface = entry.ref()
+        if surface is None or entry.is_view:
+            continue
+        digest = hashlib.blake2b(pygame.image.tobytes(surface, "RGBA"), digest_size=16).digest()
+        groups.setdefault((entry.size, digest), []).append(entry)
+
+    dupes = []
+    for entries in groups.values():
+        if len(entries) > 1:
+            wasted = sum(e.nbytes for e in entries) - entries[0].nbytes
+            dupes.append((wasted, entries))
+    dupes.sort(key=lambda d: d[0], reverse=True)
+    return dupes
+
+
+def _mb(nbytes: int) -> str:
+    return f"{nbytes / (1024 * 1024):.2f} MB"
+
+
+def report() -> str:
+    lines = [
+        "----- SURFACE MEMORY -----",
+        f"live {_mb(_live_bytes)} in {len(_entries)} surfaces (peak {_mb(_peak_bytes)})",
+        "",
+        "by owner:",
+    ]
+    for owner, (count, nbytes) in totals_by_owner().items():
+        lines.append(f"  {owner:<36} {count:>5}  {_mb(nbytes):>10}")
+
+    dupes = find_duplicates()
+    lines.append("")
+    if not dupes:
+        lines.append("no duplicated pixel data")
+    else:
+        wasted = sum(d[0] for d in dupes)
+        lines.append(f"duplicated pixel data: {_mb(wasted)} could be shared")
+        for nbytes, entries in dupes:
+            w, h = entries[0].size
+            owners = sorted({e.owner for e in entries})
+            names = sorted({e.name for e in entries if e.name})
+            label = ", ".join(names[:3]) + (" ..." if len(names) > 3 else "")
+            lines.append(f"  {len(entries):>4}x {w}x{h} {_mb(nbytes):>10}  {'/'.join(owners)}  {label}")
+    return "\n".join(lines)
+
+
+def dump_report(path: str = "-"):
+    """Write report() to `path` ("-" for stdout)."""
+    text = report()
+    if path == "-":
+        print(text)
+        return
+    with open(path, "w") as f:
+        f.write(text + "\n")
+
+
+# -------------------- DEBUG OVERLAY --------------------
+_font = None
+
+
+def draw_overlay(screen: pygame.Surface, top_owners: int = 6):
+    """Live totals in the top-right corner (toggle with F3 in main.py)."""
+    global _font
+    if _font is None:
+        _font = pygame.font.Font(None, 20)
+
+    rows = [f"surfaces {_mb(_live_bytes)} / peak {_mb(_peak_bytes)}"]
+    for owner, (count, nbytes) in itertools.islice(totals_by_owner().items(), top_owners):
+        rows.append(f"{owner} x{count}  {_mb(nbytes)}")
+
+    rendered = [_font.render(row, True, (255, 255, 0)) for row in rows]
+    width = max(s.get_width() for s in rendered) + 12
+    height = sum(s.get_height() for s in rendered) + 8
+    x = screen.get_width() - width - 8
+    pygame.draw.rect(screen, (0, 0, 0), (x, 8, width, height))
+    y = 12
+    for s in rendered:
+        screen.blit(s, (x + 6, y))
+        y += s.get_height()
@@ -0,0 +1,301 @@
+"""Session / level telemetry written off the main thread.
+
+Records are small dicts pushed onto a bounded queue; a daemon thread appends
+them as JSON lines and rotates the file when it grows past `max_bytes`. If
+the queue is full the record is dropped (and counted) rather than blocking
+the frame.
+
+    python telemetry.py telemetry.jsonl --by loadout
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+from event_bus import BOSS_SPAWNED, ENEMY_KILLED, LEVEL_STARTED, PLAYER_DAMAGED
+
+_STOP = object()
+
+
+class TelemetryWriter:
+    def __init__(self, path: str = "telemetry.jsonl", max_bytes: int = 1_000_000,
+                 backups: int = 3, queue_size: int = 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def record(self, kind: str, **fields):
+        """Queue one record; never blocks."""
+        fields["kind"] = kind
+        fields["ts"] = round(time.time(), 3)
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0):
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    # -------------------- WRITER THREAD --------------------
+    def _run(self):
+        f = open(self.path, "a", encoding="utf-8")
+        size = f.tell()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                line = json.dumps(item, separators=(",", ":")) + "\n"
+                if size and size + len(line) > self.max_bytes:
+                    f.close()
+                    self._rotate()
+                    f = open(self.path, "a", encoding="utf-8")
+                    size = 0
+                f.write(line)
+                size += len(line)
+                if self._queue.empty():
+                    f.flush()
+        finally:
+            f.close()
+
+    def _rotate(self):
+        # telemetry.jsonl -> .1 -> .2 ... oldest falls off the end
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+def percentiles(samples, points=(50, 90, 99)) -> dict:
+    if not samples:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {f"p{p}": round(ordered[min(last, len(ordered) * p // 100)], 2) for p in points}
+
+
+class SessionTelemetry:
+    """Collects metrics for one Game via its event bus.
+
+    Call frame(frame_ms) once per rendered frame while the game is on screen
+    and finish(outcome) when leaving it. A game over / mission success ends
+    the session automatically; restarting from the game over screen starts
+    a new one.
+    """
+
+    def __init__(self, game, writer: TelemetryWriter, loadout=None):
+        from menu import LOADOUTS
+
+        self.game = game
+        self.writer = writer
+        self.loadout = next((name for name, lo in LOADOUTS.items() if lo == loadout), None)
+        self.session_no = 0
+
+        game.events.subscribe(ENEMY_KILLED, self._on_enemy_killed)
+        game.events.subscribe(PLAYER_DAMAGED, self._on_player_damaged)
+        game.events.subscribe(BOSS_SPAWNED, self._on_boss_spawned)
+        game.events.subscribe(LEVEL_STARTED, self._on_level_started)
+        self._start()
+
+    def _start(self):
+        self.session_no += 1
+        self.finished = False
+        self.session_frames = []
+        self.session_peaks = {"enemies": 0, "projectiles": 0, "items": 0}
+        self._start_level(self.game.level, self.game.start_time_ms)
+
+    def _start_level(self, level, now_ms):
+        self.level = level
+        self.level_started_ms = now_ms
+        self.level_kills = 0
+        self.level_damage = 0
+        self.boss_spawn_ms = None
+        self.level_frames = []
+        self.level_peaks = {"enemies": 0, "projectiles": 0, "items": 0}
+
+    def _end_level(self, now_ms, boss_killed: bool):
+        self.writer.record(
+            "level",
+            session=self.session_no,
+            level=self.level,
+            loadout=self.loadout,
+            duration_ms=now_ms - self.level_started_ms,
+            kills=self.level_kills,
+            damage_taken=self.level_damage,
+            boss_spawn_ms=self.boss_spawn_ms,
+            boss_killed=boss_killed,
+            frame_ms=percentiles(self.level_frames),
+            peaks=self.level_peaks,
+        )
+
+    # -------------------- EVENTS --------------------
+    def _on_enemy_killed(self, enemy, now_ms):
+        self.level_kills += 1
+
+    def _on_player_damaged(self, player, amount, hp, now_ms):
+        if player is self.game.player:
+            self.level_damage += amount
+
+    def _on_boss_spawned(self, boss, now_ms):
+        self.boss_spawn_ms = now_ms - self.level_started_ms
+        self.writer.record("boss_spawned", session=self.session_no, level=self.level,
+                           at_ms=self.boss_spawn_ms)
+
+    def _on_level_started(self, level, now_ms):
+        # Levels only advance on a boss kill
+        self._end_level(now_ms, boss_killed=True)
+        self._start_level(level, now_ms)
+
+    # -------------------- PER FRAME --------------------
+    def frame(self, frame_ms: float):
+        g = self.game
+        if self.finished:
+            if not g.GAME_OVER and not g.mission_completed:
+                self._start()  # Game.reset() from the game over screen
+            return
+        if g.GAME_OVER:
+            self.finish("game_over")
+            return
+        if g.mission_completed:
+            self.finish("mission")
+            return
+        if g.PAUSED:
+            return
+
+        self.level_frames.append(frame_ms)
+        self.session_frames.append(frame_ms)
+        for key, count in (("enemies", len(g.enemy_list)), ("projectiles", len(g.fire_group)),
+                           ("items", len(g.item_group))):
+            if count > self.level_peaks[key]:
+                self.level_peaks[key] = count
+                self.session_peaks[key] = max(self.session_peaks[key], count)
+
+    def finish(self, outcome: str):
+        if self.finished:
+            return
+        self.finished = True
+        g = self.game
+        now_ms = g.start_time_ms + g.survival_time_ms
+        self._end_level(now_ms, boss_killed=False)
+        self.writer.record(
+            "session",
+            session=self.session_no,
+            loadout=self.loadout,
+            player_class=g.player_class,
+            outcome=outcome,
+            kills=g.kills,
+            level=g.level,
+            survival_ms=g.survival_time_ms,
+            mission_type=g.mission_type,
+            mission_completed=g.mission_completed,
+            frame_ms=percentiles(self.session_frames),
+            peaks=self.session_peaks,
+            dropped_records=self.writer.dropped,
+        )
+
+
+# -------------------- QUERY TOOL --------------------
+def read_records(paths):
+    """Yield records from log files, including rotated backups, oldest first."""
+    for path in paths:
+        rotated = []
+        i = 1
+        while os.path.exists(f"{path}.{i}"):
+            rotated.append(f"{path}.{i}")
+            i += 1
+        files = rotated[::-1]
+        if os.path.exists(path):
+            files.append(path)
+        for p in files:
+            with open(p, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        pass  # torn last line after a crash
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def summarize(records, by: str = "loadout"):
+    groups = {}
+    for r in records:
+        if r.get("kind") == "session":
+            groups.setdefault(r.get(by), []).append(r)
+
+    summary = []
+    for key, items in sorted(groups.items(), key=lambda kv: str(kv[0])):
+        n = len(items)
+        summary.append({
+            by: key,
+            "sessions": n,
+            "mean_kills": _mean([r["kills"] for r in items]),
+            "mean_level": _mean([r["level"] for r in items]),
+            "max_level": max(r["level"] for r in items),
+            "mean_survival_s": _mean([r["survival_ms"] / 1000 for r in items]),
+            "mission_success_rate": round(sum(r["mission_completed"] for r in items) / n, 3),
+            "death_rate": round(sum(r["outcome"] == "game_over" for r in items) / n, 3),
+            "mean_p90_frame_ms": _mean([r["frame_ms"]["p90"] for r in items]),
+            "worst_p99_frame_ms": max((r["frame_ms"]["p99"] or 0) for r in items),
+            "peak_enemies": max(r["peaks"]["enemies"] for r in items),
+            "peak_projectiles": max(r["peaks"]["projectiles"] for r in items),
+        })
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate telemetry logs.")
+    parser.add_argument("paths", nargs="*", default=["telemetry.jsonl"])
+    parser.add_argument("--by", default="loadout",
+                        help="session field to group by (loadout, player_class, mission_type, outcome)")
+    parser.add_argument("--levels", action="store_true", help="per-level breakdown instead of sessions")
+    args = parser.parse_args(argv)
+
+    records = list(read_records(args.paths))
+    if args.levels:
+        groups = {}
+        for r in records:
+            if r.get("kind") == "level":
+                groups.setdefault((r.get("loadout"), r["level"]), []).append(r)
+        rows = [{
+            "loadout": loadout, "level": level, "runs": len(items),
+            "mean_duration_s": _mean([r["duration_ms"] / 1000 for r in items]),
+            "mean_kills": _mean([r["kills"] for r in items]),
+            "mean_damage_taken": _mean([r["damage_taken"] for r in items]),
+            "boss_kill_rate": round(sum(r["boss_killed"] for r in items) / len(items), 3),
+        } for (loadout, level), items in sorted(groups.items(), key=lambda kv: (str(kv[0][0]), kv[0][1]))]
+    else:
+        rows = summarize(records, args.by)
+
+    if not rows:
+        print("no records")
+        return
+    fields = list(rows[0])
+    print("\t".join(fields))
+    for row in rows:
+        print("\t".join(str(row[f]) for f in fields))
+
+
+if __name__ == "__main__":
+    main()
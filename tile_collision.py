@@ -0,0 +1,91 @@
+import pygame
+
+
+class TileMap:
+    """Solid/empty tile grid with swept rect movement.
+
+    `grid` is a list of rows (like collision.collision); cells equal to
+    `solid_value` block movement, and everything outside the map is solid.
+    All rects are in WORLD pixels.
+    """
+
+    def __init__(self, grid, tile_size: int, solid_value: int = 1):
+        self.tile_size = tile_size
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        # Flat row-major bools: one index per lookup
+        self.solid_cells = [cell == solid_value for row in grid for cell in row]
+
+    def is_solid(self, tx: int, ty: int) -> bool:
+        if tx < 0 or ty < 0 or tx >= self.cols or ty >= self.rows:
+            return True
+        return self.solid_cells[ty * self.cols + tx]
+
+    def is_solid_point(self, x, y) -> bool:
+        ts = self.tile_size
+        return self.is_solid(int(x // ts), int(y // ts))
+
+    def rect_blocked(self, rect: pygame.Rect) -> bool:
+        """True if `rect` overlaps any solid tile."""
+        ts = self.tile_size
+        for ty in range(rect.top // ts, (rect.bottom - 1) // ts + 1):
+            for tx in range(rect.left // ts, (rect.right - 1) // ts + 1):
+                if self.is_solid(tx, ty):
+                    return True
+        return False
+
+    def _column_blocked(self, tx: int, rect: pygame.Rect) -> bool:
+        ts = self.tile_size
+        return any(self.is_solid(tx, ty) for ty in range(rect.top // ts, (rect.bottom - 1) // ts + 1))
+
+    def _row_blocked(self, ty: int, rect: pygame.Rect) -> bool:
+        ts = self.tile_size
+        return any(self.is_solid(tx, ty) for tx in range(rect.left // ts, (rect.right - 1) // ts + 1))
+
+    def move_and_collide(self, rect: pygame.Rect, dx: int, dy: int):
+        """Move `rect` by (dx, dy), stopping flush against solid tiles.
+
+        Resolves X then Y, so a blocked axis slides along the other one.
+        Only the tiles the leading edge sweeps over are checked (no
+        tunnelling at any speed). Tiles the rect already overlaps never
+        block, so an entity spawned inside a wall can still walk out.
+
+        Returns (new_rect, hit_x, hit_y); `rect` itself is not modified.
+        """
+        ts = self.tile_size
+        moved = rect.copy()
+        hit_x = hit_y = False
+
+        if dx > 0:
+            first, last = (moved.right - 1) // ts + 1, (moved.right + dx - 1) // ts
+            for tx in range(first, last + 1):
+                if self._column_blocked(tx, moved):
+                    dx = tx * ts - moved.right
+                    hit_x = True
+                    break
+        elif dx < 0:
+            first, last = moved.left // ts - 1, (moved.left + dx) // ts
+            for tx in range(first, last - 1, -1):
+                if self._column_blocked(tx, moved):
+                    dx = (tx + 1) * ts - moved.left
+                    hit_x = True
+                    break
+        moved.x += dx
+
+        if dy > 0:
+            first, last = (moved.bottom - 1) // ts + 1, (moved.bottom + dy - 1) // ts
+            for ty in range(first, last + 1):
+                if self._row_blocked(ty, moved):
+                    dy = ty * ts - moved.bottom
+                    hit_y = True
+                    break
+        elif dy < 0:
+            first, last = moved.top // ts - 1, (moved.top + dy) // ts
+            for ty in range(first, last - 1, -1):
+                if self._row_blocked(ty, moved):
+                    dy = (ty + 1) * ts - moved.top
+                    hit_y = True
+                    break
+        moved.y += dy
+
+        return moved, hit_x, hit_y